@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+"""Compare the JSON codecs installed on the bodies the VNC API client
+encodes and decodes.
+
+    python tools/json_codec_benchmark.py [--objects 1000] [--repeat 5]
+
+The vnc_api package of the tree the script belongs to is benchmarked,
+its generated modules (vnc_api/gen) must have been built.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from vnc_api.json_codec import available_codecs
+from vnc_api.gen.resource_client import NetworkIpam, VirtualNetwork
+from vnc_api.gen.resource_xsd import (
+    IdPermsType, IpamSubnetType, SubnetType, VirtualNetworkType,
+    VnSubnetsType)
+from vnc_api.utils import _obj_serializer_all
+
+
+def _virtual_network(index):
+    vn = VirtualNetwork(
+        'vn-%d' % index,
+        virtual_network_properties=VirtualNetworkType(forwarding_mode='l3'),
+        id_perms=IdPermsType(enable=True,
+                             description='benchmark network %d' % index))
+    vn.uuid = '6ec6f6a4-0000-4000-8000-%012d' % index
+    for ipam in range(4):
+        subnets = [IpamSubnetType(subnet=SubnetType('10.%d.%d.0' % (ipam, i),
+                                                    24),
+                                  default_gateway='10.%d.%d.1' % (ipam, i))
+                   for i in range(4)]
+        vn.add_network_ipam(NetworkIpam('ipam-%d' % ipam),
+                            VnSubnetsType(subnets))
+    return vn
+# end _virtual_network
+
+
+def _payloads(objects):
+    """Return (name, python object, JSON bytes) of an object create body
+    and of a detailed list response.
+    """
+    vn = _virtual_network(0)
+    create = {'virtual-network': vn}
+    listing = {'virtual-networks': [{'virtual-network': _virtual_network(i)}
+                                    for i in range(objects)]}
+    payloads = []
+    reference = available_codecs()[0]
+    for name, obj in (('create', create), ('list', listing)):
+        data = reference.dumps(obj, default=_obj_serializer_all)
+        payloads.append((name, obj, data))
+    return payloads
+# end _payloads
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000,
+                        help='number of objects of the list response')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of timed runs, the best one is kept')
+    args = parser.parse_args(args)
+
+    payloads = _payloads(args.objects)
+    print('%-12s %-8s %10s %12s %12s' % ('codec', 'payload', 'bytes',
+                                         'dumps (ms)', 'loads (ms)'))
+    for codec in available_codecs():
+        for name, obj, data in payloads:
+            number = max(1, 2000 / max(1, len(data) / 1000))
+            dumps = min(timeit.repeat(
+                lambda: codec.dumps(obj, default=_obj_serializer_all),
+                repeat=args.repeat, number=number)) / number
+            loads = min(timeit.repeat(lambda: codec.loads(data),
+                                      repeat=args.repeat,
+                                      number=number)) / number
+            print('%-12s %-8s %10d %12.3f %12.3f' % (
+                codec.name, name, len(data), dumps * 1000, loads * 1000))
+    return 0
+# end main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
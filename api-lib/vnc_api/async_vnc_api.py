@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+import functools
+import time
+
+import gevent
+import gevent.pool
+
+from vnc_api import VncApi
+
+
+def _resolve_operation(vnc_lib, operation):
+    method, args, kwargs = (tuple(operation) + ((), {}))[:3]
+    if not callable(method):
+        method = getattr(vnc_lib, method)
+    return method, args or (), kwargs or {}
+# end _resolve_operation
+
+
+def _in_request_context(vnc_lib, func):
+    """Return func run within the request contexts (headers and deadline)
+    of the caller. Greenlets don't inherit the contexts of the one spawning
+    them.
+    """
+    headers = vnc_lib._context_headers()
+    deadlines = getattr(vnc_lib._request_context_local, 'deadlines', [])
+    deadline = min(deadlines) if deadlines else None
+    if not headers and deadline is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timeout = None if deadline is None else deadline - time.time()
+        with vnc_lib.request_context(headers=headers, timeout=timeout):
+            return func(*args, **kwargs)
+    return wrapper
+# end _in_request_context
+
+
+def bulk_execute(vnc_lib, operations, pool=None, pool_size=None):
+    """Run a list of VncApi operations concurrently on a greenlet pool.
+
+    Each operation is a (method, args[, kwargs]) tuple where method is
+    either the name of a VncApi method (ie. 'virtual_network_read') or a
+    callable. Returns a list with, for each operation and in the same
+    order, its result or the exception it raised. Operations run within
+    the request contexts of the caller.
+    """
+    operations = [_resolve_operation(vnc_lib, op) for op in operations]
+    if pool is None:
+        pool = gevent.pool.Pool(pool_size or vnc_lib._max_pools)
+
+    results = [None] * len(operations)
+
+    def _run(index, method, args, kwargs):
+        try:
+            results[index] = method(*args, **kwargs)
+        except Exception as e:
+            results[index] = e
+    _run = _in_request_context(vnc_lib, _run)
+
+    greenlets = [pool.spawn(_run, index, method, args, kwargs)
+                 for index, (method, args, kwargs) in enumerate(operations)]
+    gevent.joinall(greenlets)
+    return results
+# end bulk_execute
+
+
+class AsyncVncApi(object):
+    """gevent based asynchronous counterpart of VncApi.
+
+    Every public method of the underlying VncApi client (including the
+    per-type <type>_create/_read/_update/_delete/s_list operations) is
+    exposed with the same signature but, instead of blocking, is spawned on
+    a bounded greenlet pool and returns a gevent Greenlet. The result is
+    retrieved with get(), which re-raises the exception of a failed call:
+
+        async_lib = AsyncVncApi(api_server_host='10.84.10.10')
+        reads = [async_lib.virtual_network_read(id=uuid) for uuid in uuids]
+        gevent.joinall(reads)
+        vns = [g.get() for g in reads]
+
+    The pool width bounds the number of requests in flight and defaults to
+    the size of the API server connection pool so that connections are
+    reused rather than opened and discarded. Calls only overlap if the
+    socket module is cooperative, i.e. gevent.monkey.patch_all() has been
+    called by the application.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pool_size = kwargs.pop('pool_size', None)
+        vnc_lib = kwargs.pop('vnc_lib', None)
+        self._vnc_lib = vnc_lib or VncApi(*args, **kwargs)
+        self._pool = gevent.pool.Pool(pool_size or self._vnc_lib._max_pools)
+    # end __init__
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        attr = getattr(self._vnc_lib, name)
+        if not callable(attr):
+            return attr
+
+        async_method = functools.partial(self.spawn, attr)
+        async_method.__doc__ = attr.__doc__
+        # memoize the wrapper, next lookups won't reach __getattr__
+        setattr(self, name, async_method)
+        return async_method
+    # end __getattr__
+
+    @property
+    def vnc_lib(self):
+        return self._vnc_lib
+    # end vnc_lib
+
+    def spawn(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the pool, wait for a free slot if
+        the pool is full and return the corresponding Greenlet. func runs
+        within the request contexts of the caller.
+        """
+        return self._pool.spawn(_in_request_context(self._vnc_lib, func),
+                                *args, **kwargs)
+    # end spawn
+
+    def map(self, operations):
+        """Run operations on the pool and wait for all of them, see
+        bulk_execute.
+        """
+        return bulk_execute(self._vnc_lib, operations, pool=self._pool)
+    # end map
+
+    def join(self, timeout=None):
+        """Wait until all spawned calls are done."""
+        return self._pool.join(timeout=timeout)
+    # end join
+# end class AsyncVncApi
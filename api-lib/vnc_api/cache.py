@@ -0,0 +1,326 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Client side caches of VNC API server content
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Thread safe size bounded LRU cache with entries expiring after a
+    time to live (in seconds). A None max_size or ttl disables that bound.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+    # end __init__
+
+    def __len__(self):
+        return len(self._entries)
+    # end __len__
+
+    def _evicted(self, key, value):
+        """Hook called with the lock held on each entry leaving the cache."""
+        pass
+    # end _evicted
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires_at, value = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at is not None and expires_at <= time.time():
+                self._evicted(key, value)
+                self.misses += 1
+                return default
+            # most recently used entries are kept at the end
+            self._entries[key] = (expires_at, value)
+            self.hits += 1
+            return value
+    # end get
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._evicted(key, self._entries.pop(key)[1])
+            self._entries[key] = (expires_at, value)
+            while (self.max_size is not None and
+                   len(self._entries) > self.max_size):
+                old_key, (_, old_value) = self._entries.popitem(last=False)
+                self._evicted(old_key, old_value)
+                self.evictions += 1
+    # end set
+
+    def delete(self, key):
+        with self._lock:
+            try:
+                self._evicted(key, self._entries.pop(key)[1])
+            except KeyError:
+                pass
+    # end delete
+
+    def clear(self):
+        with self._lock:
+            for key, (_, value) in self._entries.items():
+                self._evicted(key, value)
+            self._entries.clear()
+    # end clear
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+    # end stats
+# end class LRUCache
+
+
+class ObjectCache(LRUCache):
+    """Cache of resource dicts read from the API server.
+
+    Entries are indexed by (resource type, uuid, variant) where variant
+    describes the requested field set, so one object can be cached in
+    several shapes, which are all dropped when the object is invalidated.
+    Stored dicts are deep copied in and out so callers are free to modify
+    what they get.
+
+    Reads racing with writes must not cache the state of an object before
+    a write: readers take the cache generation before sending their
+    request and their result is not cached if objects were invalidated
+    since, writers invalidate the objects once written.
+
+    :param max_size: maximum number of cached entries
+    :param ttl: default time to live of an entry, in seconds
+    :param type_ttls: dict of per resource type time to live overriding the
+        default one, ie. {'project': 600, 'virtual-machine-interface': 5}
+    """
+
+    def __init__(self, max_size=1000, ttl=60, type_ttls=None):
+        super(ObjectCache, self).__init__(max_size, ttl)
+        self.type_ttls = dict((t.replace('_', '-'), v)
+                              for t, v in (type_ttls or {}).items())
+        self._uuid_keys = {}
+        # number of invalidations
+        self.generation = 0
+    # end __init__
+
+    def _evicted(self, key, value):
+        uuid_keys = self._uuid_keys.get(key[1])
+        if uuid_keys is not None:
+            uuid_keys.discard(key)
+            if not uuid_keys:
+                del self._uuid_keys[key[1]]
+    # end _evicted
+
+    def get_obj_dict(self, res_type, uuid, variant):
+        obj_dict = self.get((res_type, uuid, variant))
+        if obj_dict is None:
+            return None
+        return copy.deepcopy(obj_dict)
+    # end get_obj_dict
+
+    def set_obj_dict(self, res_type, uuid, variant, obj_dict,
+                     generation=None):
+        """Cache an object dict, unless objects were invalidated since
+        generation if given.
+        """
+        key = (res_type, uuid, variant)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.set(key, copy.deepcopy(obj_dict),
+                     ttl=self.type_ttls.get(res_type))
+            self._uuid_keys.setdefault(uuid, set()).add(key)
+    # end set_obj_dict
+
+    def invalidate(self, *uuids):
+        """Drop all cached shapes of the objects."""
+        with self._lock:
+            self.generation += 1
+            for uuid in uuids:
+                for key in list(self._uuid_keys.get(uuid, [])):
+                    self.delete(key)
+    # end invalidate
+
+    def invalidate_all(self):
+        """Drop all cached objects."""
+        with self._lock:
+            self.generation += 1
+            self.clear()
+    # end invalidate_all
+
+    def obj_dicts(self, uuid):
+        """Return the (variant, obj_dict) of the cached shapes of an
+        object, expired ones included. The dicts are not copied.
+        """
+        with self._lock:
+            return [(key[2], self._entries[key][1])
+                    for key in self._uuid_keys.get(uuid, [])]
+    # end obj_dicts
+# end class ObjectCache
+
+
+class NameCache(LRUCache):
+    """Bidirectional cache of fq_name <-> uuid resolutions.
+
+    Both directions of a resolution are cached together. Names and uuids
+    unknown by the API server are cached as negative entries, with their
+    own (usually shorter) time to live.
+
+    :param max_size: maximum number of cached entries
+    :param ttl: time to live of a resolution, in seconds
+    :param negative_ttl: time to live of a negative entry, in seconds
+    """
+    _NEGATIVE = object()
+
+    def __init__(self, max_size=10000, ttl=300, negative_ttl=5):
+        super(NameCache, self).__init__(max_size, ttl)
+        self.negative_ttl = negative_ttl
+    # end __init__
+
+    @staticmethod
+    def _fq_name_key(res_type, fq_name):
+        return ('fq_name', res_type.replace('_', '-'), tuple(fq_name))
+    # end _fq_name_key
+
+    def _lookup(self, key):
+        value = self.get(key)
+        if value is None:
+            return False, None
+        if value is self._NEGATIVE:
+            return True, None
+        return True, value
+    # end _lookup
+
+    def lookup_uuid(self, res_type, fq_name):
+        """Return (found, uuid), uuid being None for a negative entry."""
+        return self._lookup(self._fq_name_key(res_type, fq_name))
+    # end lookup_uuid
+
+    def lookup_fq_name_type(self, uuid):
+        """Return (found, (fq_name, type)), None for a negative entry."""
+        found, value = self._lookup(('uuid', uuid))
+        if value is not None:
+            value = (list(value[0]), value[1])
+        return found, value
+    # end lookup_fq_name_type
+
+    def set_name(self, res_type, fq_name, uuid):
+        res_type = res_type.replace('_', '-')
+        with self._lock:
+            self.set(self._fq_name_key(res_type, fq_name), uuid)
+            self.set(('uuid', uuid), (tuple(fq_name), res_type))
+    # end set_name
+
+    def set_unknown_fq_name(self, res_type, fq_name):
+        self.set(self._fq_name_key(res_type, fq_name), self._NEGATIVE,
+                 ttl=self.negative_ttl)
+    # end set_unknown_fq_name
+
+    def set_unknown_uuid(self, uuid):
+        self.set(('uuid', uuid), self._NEGATIVE, ttl=self.negative_ttl)
+    # end set_unknown_uuid
+
+    def invalidate_fq_name(self, res_type, fq_name):
+        self.delete(self._fq_name_key(res_type, fq_name))
+    # end invalidate_fq_name
+
+    def invalidate_uuid(self, uuid):
+        """Drop both directions of the resolution of uuid."""
+        with self._lock:
+            entry = self._entries.get(('uuid', uuid))
+            if entry is not None and entry[1] is not self._NEGATIVE:
+                fq_name, res_type = entry[1]
+                self.delete(self._fq_name_key(res_type, fq_name))
+            self.delete(('uuid', uuid))
+    # end invalidate_uuid
+# end class NameCache
+
+
+class DiscoveryCache(object):
+    """On-disk cache of what a client discovers at startup (ie. the parsed
+    API server homepage and the keystone API version), shared by the
+    processes running on a node so that they start without these requests.
+
+    Entries are returned whatever their age, along with a flag telling
+    they are older than ttl and should be revalidated. The file is written
+    aside and renamed, and is ignored if it was written by another VERSION
+    of the format.
+
+    :param cache_file: path of the cache file
+    :param ttl: age in seconds after which an entry should be revalidated
+    """
+    VERSION = 1
+    # readable by the clients run by other users
+    FILE_MODE = 0o644
+
+    def __init__(self, cache_file, ttl=300):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._lock = threading.Lock()
+    # end __init__
+
+    def _read(self):
+        try:
+            with open(self.cache_file) as cache_file:
+                content = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return {}
+        if (not isinstance(content, dict) or
+                content.get('version') != self.VERSION):
+            return {}
+        return content.get('entries') or {}
+    # end _read
+
+    def get(self, key):
+        """Return (value, stale), value being None if key is not cached."""
+        entry = self._read().get(key)
+        if not entry:
+            return None, True
+        stale = time.time() - entry.get('stored_at', 0) > self.ttl
+        return entry.get('value'), stale
+    # end get
+
+    def set(self, key, value):
+        with self._lock:
+            entries = self._read()
+            entries[key] = {'stored_at': time.time(), 'value': value}
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+                with os.fdopen(fd, 'w') as tmp_file:
+                    os.fchmod(fd, self.FILE_MODE)
+                    json.dump({'version': self.VERSION, 'entries': entries},
+                              tmp_file)
+                os.rename(tmp_path, self.cache_file)
+            except (IOError, OSError, TypeError, ValueError) as e:
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+                logger = logging.getLogger(__name__)
+                logger.warn("Unable to write discovery cache %s: %s",
+                            self.cache_file, str(e))
+    # end set
+# end class DiscoveryCache
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# JSON codecs of the VNC API client
+import json
+
+
+class JsonCodec(object):
+    """Codec based on the standard library json module.
+
+    A codec serializes objects to JSON bytes with dumps(obj, default=None),
+    default being called with the objects it can not serialize natively
+    and returning a serializable version of them, and deserializes JSON
+    bytes with loads(data). Request bodies and response contents are handed
+    over as bytes, codecs should not decode nor encode them to unicode.
+    """
+    name = 'json'
+
+    def __init__(self):
+        self._module = self._import()
+    # end __init__
+
+    def _import(self):
+        return json
+    # end _import
+
+    def dumps(self, obj, default=None):
+        return self._module.dumps(obj, default=default)
+    # end dumps
+
+    def loads(self, data):
+        return self._module.loads(data)
+    # end loads
+# end class JsonCodec
+
+
+class SimplejsonCodec(JsonCodec):
+    """Codec based on simplejson and its C speedups."""
+    name = 'simplejson'
+
+    def _import(self):
+        import simplejson
+        return simplejson
+    # end _import
+# end class SimplejsonCodec
+
+
+class UjsonCodec(JsonCodec):
+    """Codec based on ujson. ujson releases before 2.0 have no default
+    hook, objects needing one are serialized with the json module.
+    """
+    name = 'ujson'
+
+    def _import(self):
+        import ujson
+        return ujson
+    # end _import
+
+    def dumps(self, obj, default=None):
+        if default is None:
+            return self._module.dumps(obj)
+        try:
+            return self._module.dumps(obj, default=default)
+        except TypeError:
+            return json.dumps(obj, default=default)
+    # end dumps
+# end class UjsonCodec
+
+
+CODECS = dict((codec.name, codec)
+              for codec in (JsonCodec, SimplejsonCodec, UjsonCodec))
+
+
+def get_codec(name=None):
+    """Return an instance of the named codec or, by default, of the
+    simplejson codec if simplejson is installed and of the json one if not.
+    """
+    if name is None:
+        try:
+            return SimplejsonCodec()
+        except ImportError:
+            return JsonCodec()
+    if name not in CODECS:
+        raise ValueError("Unknown JSON codec '%s'" % name)
+    try:
+        return CODECS[name]()
+    except ImportError:
+        raise ValueError("JSON codec '%s' is not installed" % name)
+# end get_codec
+
+
+def available_codecs():
+    """Return the instances of the codecs installed."""
+    codecs = []
+    for name in sorted(CODECS):
+        try:
+            codecs.append(CODECS[name]())
+        except ImportError:
+            continue
+    return codecs
+# end available_codecs
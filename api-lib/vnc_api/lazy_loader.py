@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Lazy loading of the generated types
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module whose attributes are imported on first access.
+
+    :param name: name of the module
+    :param lazy_attrs: {attribute name: name of the module defining it}
+    :param module: optional module wrapped: its attributes are read and
+        set through the lazy module, the attributes loaded on first access
+        are also set as globals of the wrapped module
+    :param on_load: optional callable(name, value) called once an attribute
+        is loaded
+    """
+
+    def __init__(self, name, lazy_attrs, module=None, on_load=None):
+        super(LazyModule, self).__init__(name, getattr(module, '__doc__',
+                                                       None))
+        self.__dict__['_lazy_attrs'] = lazy_attrs
+        self.__dict__['_module'] = module
+        self.__dict__['_on_load'] = on_load
+        if module is not None:
+            self.__dict__['__file__'] = getattr(module, '__file__', None)
+    # end __init__
+
+    def __getattr__(self, name):
+        module = self.__dict__['_module']
+        if module is not None and name in module.__dict__:
+            return module.__dict__[name]
+        if name == '__all__':
+            return self._public_names()
+        try:
+            module_name = self.__dict__['_lazy_attrs'][name]
+        except KeyError:
+            raise AttributeError("'module' object %s has no attribute '%s'"
+                                 % (self.__name__, name))
+        value = getattr(importlib.import_module(module_name), name)
+        setattr(self, name, value)
+        if self.__dict__['_on_load'] is not None:
+            self.__dict__['_on_load'](name, value)
+        return value
+    # end __getattr__
+
+    def __setattr__(self, name, value):
+        module = self.__dict__['_module']
+        if module is not None:
+            setattr(module, name, value)
+        else:
+            self.__dict__[name] = value
+    # end __setattr__
+
+    def __delattr__(self, name):
+        module = self.__dict__['_module']
+        if module is not None:
+            delattr(module, name)
+        else:
+            del self.__dict__[name]
+    # end __delattr__
+
+    def _public_names(self):
+        # "from <module> import *" loads all the lazy attributes
+        names = set(self.__dict__['_lazy_attrs'])
+        module = self.__dict__['_module']
+        if module is not None:
+            names.update(getattr(module, '__all__', None) or
+                         [name for name in module.__dict__
+                          if not name.startswith('_')])
+        return sorted(names)
+    # end _public_names
+# end class LazyModule
+
+
+def lazy_module(name, lazy_attrs, module=None, on_load=None):
+    """Install a LazyModule as the module name, to be called at the end of
+    the module it replaces.
+    """
+    lazy = LazyModule(name, lazy_attrs, module, on_load)
+    sys.modules[name] = lazy
+    return lazy
+# end lazy_module
+
+
+def lazy_import(module_name):
+    """Return a proxy of the module module_name, imported on the first
+    access to one of its attributes.
+    """
+    return _ModuleProxy(module_name)
+# end lazy_import
+
+
+class _ModuleProxy(object):
+    def __init__(self, module_name):
+        self._module_name = module_name
+    # end __init__
+
+    def __getattr__(self, name):
+        module = importlib.import_module(self._module_name)
+        return getattr(module, name)
+    # end __getattr__
+# end class _ModuleProxy
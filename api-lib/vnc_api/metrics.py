@@ -0,0 +1,237 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Client side metrics of the VNC API client
+import bisect
+import threading
+from collections import OrderedDict
+
+
+class Histogram(object):
+    """Distribution of observed values, durations in seconds by default, in
+    buckets of upper bounds buckets (values above the last bound are
+    counted in a last +Inf bucket).
+    """
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                       5.0, 10.0, 30.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    # end __init__
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    # end observe
+
+    def to_dict(self):
+        """Return the count and sum of the values observed, and the
+        cumulative count of each bucket as Prometheus histograms.
+        """
+        buckets = OrderedDict()
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'count': self.count, 'sum': self.sum, 'buckets': buckets}
+    # end to_dict
+# end class Histogram
+
+
+class MetricsRegistry(object):
+    """Thread safe registry of counters, gauges and histograms. A metric
+    holds a value per set of label values given as keyword arguments.
+
+    Collectors added with add_collector(collector) are called with the
+    registry before the metrics are exported, to set the metrics of state
+    kept elsewhere (connection pools, hedged reads counters, ...) without
+    updating them on the request path.
+
+    :param prefix: prefix of the exported metric names
+    """
+    COUNTER = 'counter'
+    GAUGE = 'gauge'
+    HISTOGRAM = 'histogram'
+    enabled = True
+
+    def __init__(self, prefix='vnc_api'):
+        self.prefix = prefix
+        # {name: (type, {sorted label items: value})}
+        self._metrics = OrderedDict()
+        self._collectors = []
+        self._lock = threading.Lock()
+    # end __init__
+
+    def _values(self, name, metric_type):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = (metric_type, OrderedDict())
+        elif metric[0] != metric_type:
+            raise ValueError("Metric %s is a %s" % (name, metric[0]))
+        return metric[1]
+    # end _values
+
+    def inc(self, name, value=1, **labels):
+        """Increment the counter name."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._values(name, self.COUNTER)
+            values[key] = values.get(key, 0) + value
+    # end inc
+
+    def set(self, name, value, metric_type=GAUGE, **labels):
+        """Set the gauge name, or a counter kept elsewhere."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values(name, metric_type)[key] = value
+    # end set
+
+    def observe(self, name, value, buckets=None, **labels):
+        """Add a value to the histogram name."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._values(name, self.HISTOGRAM)
+            histogram = values.get(key)
+            if histogram is None:
+                histogram = values[key] = Histogram(
+                    buckets or Histogram.DEFAULT_BUCKETS)
+            histogram.observe(value)
+    # end observe
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+    # end add_collector
+
+    def _collect(self):
+        for collector in self._collectors:
+            collector(self)
+        with self._lock:
+            return [(name, metric_type, [
+                        (key, value.to_dict() if isinstance(value, Histogram)
+                         else value)
+                        for key, value in values.items()])
+                    for name, (metric_type, values) in self._metrics.items()]
+    # end _collect
+
+    def to_dict(self):
+        """Return {metric name: {'type': type, 'values': [values]}}, the
+        values of counters and gauges as {'labels': labels, 'value': value}
+        and the ones of histograms as {'labels': labels, 'count': count,
+        'sum': sum, 'buckets': {upper bound: cumulative count}}.
+        """
+        metrics = OrderedDict()
+        for name, metric_type, values in self._collect():
+            metric_values = []
+            for key, value in values:
+                if metric_type == self.HISTOGRAM:
+                    metric_value = dict(value, labels=dict(key))
+                else:
+                    metric_value = {'labels': dict(key), 'value': value}
+                metric_values.append(metric_value)
+            metrics[name] = {'type': metric_type, 'values': metric_values}
+        return metrics
+    # end to_dict
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, metric_type, values in self._collect():
+            name = '%s_%s' % (self.prefix, name)
+            lines.append('# TYPE %s %s' % (name, metric_type))
+            for key, value in values:
+                if metric_type != self.HISTOGRAM:
+                    lines.append('%s%s %s' % (name, _prometheus_labels(key),
+                                              _prometheus_value(value)))
+                    continue
+                for bound, count in value['buckets'].items():
+                    lines.append('%s_bucket%s %d' % (
+                        name, _prometheus_labels(
+                            key + (('le', _prometheus_value(bound)),)),
+                        count))
+                lines.append('%s_sum%s %s' % (name, _prometheus_labels(key),
+                                              _prometheus_value(value['sum'])))
+                lines.append('%s_count%s %d' % (name, _prometheus_labels(key),
+                                                value['count']))
+        return '\n'.join(lines) + '\n'
+    # end to_prometheus
+
+    def to_statsd(self):
+        """Return the metrics as statsd gauges, one per line. Label names
+        and values are appended to the metric names, histograms are
+        exported as their count and sum.
+        """
+        lines = []
+        for name, metric_type, values in self._collect():
+            for key, value in values:
+                path = '.'.join([self.prefix, name] + [
+                    _statsd_name(part) for item in key for part in item])
+                if metric_type == self.HISTOGRAM:
+                    lines.append('%s.count:%d|g' % (path, value['count']))
+                    lines.append('%s.sum:%s|g' % (path, value['sum']))
+                else:
+                    lines.append('%s:%s|g' % (path, value))
+        return '\n'.join(lines) + '\n'
+    # end to_statsd
+# end class MetricsRegistry
+
+
+class NoopMetricsRegistry(object):
+    """Registry of disabled metrics, ignoring the values recorded and
+    exporting no metric.
+    """
+    enabled = False
+
+    def inc(self, name, value=1, **labels):
+        pass
+    # end inc
+
+    def set(self, name, value, metric_type=MetricsRegistry.GAUGE, **labels):
+        pass
+    # end set
+
+    def observe(self, name, value, buckets=None, **labels):
+        pass
+    # end observe
+
+    def add_collector(self, collector):
+        pass
+    # end add_collector
+
+    def to_dict(self):
+        return OrderedDict()
+    # end to_dict
+
+    def to_prometheus(self):
+        return ''
+    # end to_prometheus
+
+    def to_statsd(self):
+        return ''
+    # end to_statsd
+# end class NoopMetricsRegistry
+
+
+def _prometheus_labels(key):
+    if not key:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (label, str(value).replace('\\', '\\\\')
+                     .replace('"', '\\"').replace('\n', '\\n'))
+        for label, value in key)
+# end _prometheus_labels
+
+
+def _prometheus_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+# end _prometheus_value
+
+
+def _statsd_name(value):
+    return str(value).replace('.', '_').replace(':', '_').replace('|', '_')
+# end _statsd_name
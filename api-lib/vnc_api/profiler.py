@@ -0,0 +1,304 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Profiling of the VNC API client entry points
+import atexit
+import cProfile
+import functools
+import logging
+import os
+import pstats
+import signal
+import StringIO
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class Profiler(object):
+    """Aggregate the number of calls, errors and durations of the wrapped
+    entry points. Entry points called from another one are accounted on
+    their own, subclasses only profile the outermost one of a thread.
+
+    :param report_file: file the report is appended to by dump(), standard
+        error by default
+    """
+    name = 'timing'
+    # Functions listed in the report of each entry point
+    REPORT_FUNCTIONS = 15
+
+    def __init__(self, report_file=None):
+        self.report_file = report_file
+        # {entry point: [calls, errors, total duration, max duration]}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    # end __init__
+
+    def wrap(self, name, func):
+        """Return func profiled as the entry point name."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(name, func, *args, **kwargs)
+        return wrapper
+    # end wrap
+
+    def call(self, name, func, *args, **kwargs):
+        outermost = getattr(self._local, 'entry_point', None) is None
+        if outermost:
+            self._local.entry_point = name
+            self._start(name)
+        failed = True
+        started_at = time.time()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            duration = time.time() - started_at
+            if outermost:
+                self._stop(name)
+                self._local.entry_point = None
+            with self._lock:
+                stats = self._stats.setdefault(name, [0, 0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += failed
+                stats[2] += duration
+                stats[3] = max(stats[3], duration)
+    # end call
+
+    def _start(self, name):
+        pass
+    # end _start
+
+    def _stop(self, name):
+        pass
+    # end _stop
+
+    def _entry_point_report(self, name):
+        return ''
+    # end _entry_point_report
+
+    def stats(self):
+        """Return {entry point: {'calls', 'errors', 'total', 'max'}},
+        durations in seconds.
+        """
+        with self._lock:
+            return dict((name, dict(zip(('calls', 'errors', 'total', 'max'),
+                                        stats)))
+                        for name, stats in self._stats.items())
+    # end stats
+
+    def report(self):
+        """Return the profile of the entry points as text, by decreasing
+        total duration.
+        """
+        stats = sorted(self.stats().items(),
+                       key=lambda item: item[1]['total'], reverse=True)
+        lines = ['VNC API profile (%s) of process %d at %s' % (
+                     self.name, os.getpid(), time.ctime()),
+                 '%-40s %8s %8s %10s %10s %10s' % (
+                     'entry point', 'calls', 'errors', 'total s', 'mean ms',
+                     'max ms')]
+        for name, entry_stats in stats:
+            lines.append('%-40s %8d %8d %10.3f %10.3f %10.3f' % (
+                name, entry_stats['calls'], entry_stats['errors'],
+                entry_stats['total'],
+                entry_stats['total'] * 1000 / entry_stats['calls'],
+                entry_stats['max'] * 1000))
+        for name, _ in stats:
+            entry_point_report = self._entry_point_report(name)
+            if entry_point_report:
+                lines.extend(['', '== %s' % name, entry_point_report])
+        return '\n'.join(lines) + '\n'
+    # end report
+
+    def dump(self, *args):
+        """Write the report, also called with the signal handler
+        arguments.
+        """
+        if not self._stats:
+            return
+        try:
+            if self.report_file:
+                with open(self.report_file, 'a') as report_file:
+                    report_file.write(self.report() + '\n')
+            else:
+                sys.stderr.write(self.report())
+        except Exception as e:
+            logging.getLogger(__name__).warn(
+                'Failed to write the VNC API profile: %s', e)
+    # end dump
+
+    def install(self, signal_name=None):
+        """Dump the report on exit and, if given, on the signal named
+        signal_name (SIGUSR2 for example).
+        """
+        atexit.register(self.dump)
+        if not signal_name:
+            return
+        signum = getattr(signal, signal_name, None)
+        if not isinstance(signum, int):
+            raise ValueError("Unknown signal '%s'" % signal_name)
+        previous_handler = signal.getsignal(signum)
+
+        def handler(signum, frame):
+            # the interrupted thread may hold the lock of the stats, the
+            # report is written from another one
+            thread = threading.Thread(target=self.dump)
+            thread.daemon = True
+            thread.start()
+            if callable(previous_handler):
+                previous_handler(signum, frame)
+        try:
+            signal.signal(signum, handler)
+        except ValueError:
+            # not in the main thread
+            logging.getLogger(__name__).warn(
+                'VNC API profile not dumped on %s, the client is not '
+                'created in the main thread', signal_name)
+    # end install
+# end class Profiler
+
+
+class SamplingProfiler(Profiler):
+    """Sample every interval seconds the stack of the threads running an
+    entry point from a background thread, and count the functions seen
+    running (self) or on the stack (cumulative) per entry point. The
+    sampling thread runs while entry points are running.
+    """
+    name = 'sample'
+    DEFAULT_INTERVAL = 0.005
+
+    def __init__(self, report_file=None, interval=DEFAULT_INTERVAL):
+        super(SamplingProfiler, self).__init__(report_file)
+        self.interval = interval
+        # {thread id: (entry point, frame of its call)}
+        self._active = {}
+        # {entry point: [samples, Counter self, Counter cumulative]}
+        self._samples = {}
+        self._sampler = None
+    # end __init__
+
+    def _start(self, name):
+        self._active[threading.current_thread().ident] = (
+            name, sys._getframe(1))
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample)
+                self._sampler.daemon = True
+                self._sampler.start()
+    # end _start
+
+    def _stop(self, name):
+        self._active.pop(threading.current_thread().ident, None)
+    # end _stop
+
+    def _sample(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+            frames = sys._current_frames()
+            for thread_id, (name, entry_frame) in self._active.items():
+                frame = frames.get(thread_id)
+                functions = []
+                while frame is not None and frame is not entry_frame:
+                    code = frame.f_code
+                    functions.append('%s:%d(%s)' % (
+                        code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                if not functions:
+                    continue
+                with self._lock:
+                    samples = self._samples.setdefault(
+                        name, [0, Counter(), Counter()])
+                    samples[0] += 1
+                    samples[1][functions[0]] += 1
+                    samples[2].update(set(functions))
+    # end _sample
+
+    def _entry_point_report(self, name):
+        with self._lock:
+            if name not in self._samples:
+                return ''
+            count, self_samples, cumulative_samples = self._samples[name]
+            lines = ['%d samples every %sms' % (count, self.interval * 1000),
+                     '%8s %8s  function' % ('self %', 'cumul %')]
+            for function, samples in cumulative_samples.most_common(
+                    self.REPORT_FUNCTIONS):
+                lines.append('%8.1f %8.1f  %s' % (
+                    100.0 * self_samples[function] / count,
+                    100.0 * samples / count, function))
+        return '\n'.join(lines)
+    # end _entry_point_report
+# end class SamplingProfiler
+
+
+class CProfileProfiler(Profiler):
+    """Profile every function call of the entry points with cProfile,
+    exhaustive but slowing them down.
+    """
+    name = 'cprofile'
+
+    def __init__(self, report_file=None):
+        super(CProfileProfiler, self).__init__(report_file)
+        # {entry point: pstats.Stats}
+        self._profiles = {}
+    # end __init__
+
+    def _start(self, name):
+        self._local.profile = cProfile.Profile()
+        self._local.profile.enable()
+    # end _start
+
+    def _stop(self, name):
+        profile = self._local.profile
+        profile.disable()
+        self._local.profile = None
+        with self._lock:
+            if name in self._profiles:
+                self._profiles[name].add(profile)
+            else:
+                self._profiles[name] = pstats.Stats(profile)
+    # end _stop
+
+    def _entry_point_report(self, name):
+        with self._lock:
+            if name not in self._profiles:
+                return ''
+            stream = StringIO.StringIO()
+            profile = self._profiles[name]
+            profile.stream = stream
+            profile.sort_stats('cumulative').print_stats(
+                self.REPORT_FUNCTIONS)
+        return stream.getvalue().strip('\n')
+    # end _entry_point_report
+# end class CProfileProfiler
+
+
+PROFILERS = dict((profiler.name, profiler)
+                 for profiler in (Profiler, SamplingProfiler,
+                                  CProfileProfiler))
+# Profilers of the process, shared by the clients of the same settings
+_profilers = {}
+_profilers_lock = threading.Lock()
+
+
+def get_profiler(name, report_file=None, signal_name=None):
+    """Return the process profiler of the named type and report file,
+    dumping its report on exit and on the signal signal_name.
+    """
+    if name not in PROFILERS:
+        raise ValueError("Unknown profiler '%s'" % name)
+    with _profilers_lock:
+        profiler = _profilers.get((name, report_file))
+        if profiler is None:
+            profiler = _profilers[(name, report_file)] = PROFILERS[name](
+                report_file)
+            profiler.install(signal_name)
+    return profiler
+# end get_profiler
@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Retry policies of requests to the VNC API server
+import random
+import threading
+import time
+from email.utils import mktime_tz, parsedate_tz
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds of a Retry-After header value, given
+    either as a number of seconds or as an HTTP date, or None if it can not
+    be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, mktime_tz(date) - time.time())
+# end parse_retry_after
+
+
+class RetryBudget(object):
+    """Token bucket bounding the rate of retries of a client.
+
+    Each retry takes a token, tokens are refilled at refill_rate per second
+    up to capacity. Once the bucket is empty, failed requests are not
+    retried anymore so that many clients retrying against an overloaded or
+    restarting API server do not amplify the load.
+    """
+
+    def __init__(self, capacity=20, refill_rate=2.0):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._tokens = self.capacity
+        self._last_refill = time.time()
+        self._lock = threading.Lock()
+    # end __init__
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self._last_refill)
+        self._tokens = min(self.capacity,
+                           self._tokens + elapsed * self.refill_rate)
+        self._last_refill = now
+    # end _refill
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(time.time())
+            return self._tokens
+    # end tokens
+
+    def consume(self):
+        """Take a token, return False if the budget is exhausted."""
+        with self._lock:
+            self._refill(time.time())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+    # end consume
+# end class RetryBudget
+
+
+class RetryPolicy(object):
+    """Exponential backoff with full jitter, bounded by a total retry time
+    and an optional per-client retry budget.
+
+    The n-th retry (counted from 0) waits a random delay between 0 and
+    min(max_delay, base_delay * 2 ** n), so that clients failing at the
+    same time spread their retries. A Retry-After returned by the server is
+    waited at least, within the max_delay limit.
+
+    Any object providing backoff() and next_delay() can be given to VncApi
+    as retry policy.
+
+    :param base_delay: upper bound of the delay of the first retry, seconds
+    :param max_delay: upper bound of the delay of any retry, seconds
+    :param max_elapsed: time after which a failing call is not retried
+        anymore, seconds, None for no limit
+    :param budget: RetryBudget shared by the calls of a client, None for no
+        budget
+    """
+
+    def __init__(self, base_delay=0.5, max_delay=8.0, max_elapsed=60.0,
+                 budget=None):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.budget = budget
+    # end __init__
+
+    def backoff(self, attempt, retry_after=None):
+        """Return the delay in seconds before the retry number attempt."""
+        # the exponent is capped as the delay saturates at max_delay anyway
+        ceiling = min(self.max_delay,
+                      self.base_delay * (2 ** min(attempt, 32)))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+    # end backoff
+
+    def next_delay(self, attempt, elapsed, retry_after=None):
+        """Return the delay in seconds before retrying a call which failed
+        attempt times so far and has been running for elapsed seconds, or
+        None if it should not be retried.
+        """
+        delay = self.backoff(attempt, retry_after)
+        if (self.max_elapsed is not None and
+                elapsed + delay > self.max_elapsed):
+            return None
+        if self.budget is not None and not self.budget.consume():
+            return None
+        return delay
+    # end next_delay
+# end class RetryPolicy
@@ -0,0 +1,253 @@
+import threading
+import time
+from urlparse import urlparse
+
+from flexmock import flexmock
+from requests.exceptions import ConnectionError
+from testtools import ExpectedException
+from testtools import TestCase
+
+from vnc_api import vnc_api
+from vnc_api.vnc_api import ApiServerHostHealth, ApiServerSession
+
+
+class FakeResponse(str):
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession(object):
+    def __init__(self, down_hosts, requests, delays, responses=None):
+        self.down_hosts = down_hosts
+        self.requests = requests
+        self.delays = delays
+        self.responses = responses if responses is not None else []
+        self.closed = False
+
+    def get(self, url, *args, **kwargs):
+        host = urlparse(url).hostname
+        self.requests.append(host)
+        if host in self.delays:
+            time.sleep(self.delays[host])
+        if host in self.down_hosts:
+            raise ConnectionError
+        response = FakeResponse(host)
+        self.responses.append(response)
+        return response
+
+    post = put = delete = get
+
+    def close(self):
+        self.closed = True
+
+
+class TestApiServerSession(TestCase):
+    def setUp(self):
+        super(TestApiServerSession, self).setUp()
+        self.down_hosts = set()
+        self.requests = []
+        self.delays = {}
+        self.responses = []
+        self.now = [1000.0]
+        flexmock(ApiServerSession).should_receive('_new_session').replace_with(
+            lambda: FakeSession(self.down_hosts, self.requests, self.delays,
+                                self.responses))
+        flexmock(vnc_api.time).should_receive('time').replace_with(
+            lambda: self.now[0])
+    # end setUp
+
+    def _get(self, session):
+        return session.get('http://10.0.0.1:8082/')
+
+    def _record_get_latencies(self, session, latencies):
+        for latency in latencies:
+            session._record_get_latency(latency)
+
+    def test_circuit_breaker(self):
+        health = ApiServerHostHealth(failure_threshold=2, reset_timeout=10)
+        health.record_failure(0)
+        self.assertTrue(health.acquire(1))
+        health.record_failure(1)
+        self.assertEqual(health.OPEN, health.state)
+        self.assertFalse(health.acquire(5))
+
+        # half-open: a single probe goes through
+        self.assertTrue(health.acquire(11))
+        self.assertEqual(health.HALF_OPEN, health.state)
+        self.assertFalse(health.acquire(12))
+        health.record_failure(12)
+        self.assertEqual(health.OPEN, health.state)
+
+        self.assertTrue(health.acquire(22))
+        health.record_success(0.1)
+        self.assertEqual(health.CLOSED, health.state)
+        self.assertTrue(health.acquire(22))
+    # end test_circuit_breaker
+
+    def test_failed_host_skipped_and_probed(self):
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        session = ApiServerSession(hosts, 1, 1, circuit_failure_threshold=1,
+                                   circuit_reset_timeout=30)
+        healthy_session = session.api_server_sessions['10.0.0.2']
+        self.down_hosts.add('10.0.0.1')
+
+        self.assertEqual('10.0.0.2', self._get(session))
+        self.assertEqual(['10.0.0.1', '10.0.0.2'], self.requests)
+        self.assertEqual('open', session.health()['10.0.0.1']['state'])
+        # healthy hosts keep their connection pool
+        self.assertIs(healthy_session, session.api_server_sessions['10.0.0.2'])
+
+        del self.requests[:]
+        results = [self._get(session) for _ in range(4)]
+        self.assertEqual(['10.0.0.3', '10.0.0.2', '10.0.0.3', '10.0.0.2'],
+                         results)
+        self.assertNotIn('10.0.0.1', self.requests)
+
+        # after the reset timeout the host is probed again
+        self.down_hosts.clear()
+        self.now[0] += 31
+        self.assertEqual(['10.0.0.3', '10.0.0.1'],
+                         [self._get(session) for _ in range(2)])
+        self.assertEqual('closed', session.health()['10.0.0.1']['state'])
+    # end test_failed_host_skipped_and_probed
+
+    def test_all_hosts_down(self):
+        hosts = ['10.0.0.1', '10.0.0.2']
+        session = ApiServerSession(hosts, 1, 1, circuit_failure_threshold=1)
+        self.down_hosts.update(hosts)
+        with ExpectedException(ConnectionError):
+            self._get(session)
+
+        # open circuits are still tried as a last resort
+        self.down_hosts.clear()
+        self.assertEqual('10.0.0.1', self._get(session))
+    # end test_all_hosts_down
+
+    def test_latency_mode(self):
+        hosts = ['10.0.0.1', '10.0.0.2']
+        session = ApiServerSession(hosts, 1, 1, lb_mode='latency')
+        session.host_health['10.0.0.1'].record_success(0.5)
+        session.host_health['10.0.0.2'].record_success(0.01)
+
+        self.assertEqual(['10.0.0.2'] * 5,
+                         [self._get(session) for _ in range(5)])
+        with ExpectedException(ValueError):
+            ApiServerSession(hosts, 1, 1, lb_mode='foo')
+    # end test_latency_mode
+
+    def test_hedged_reads(self):
+        hosts = ['10.0.0.1', '10.0.0.2']
+        session = ApiServerSession(hosts, 1, 1, hedge_percentile=95)
+        # not hedged until enough latencies are known
+        self.delays['10.0.0.1'] = 0.2
+        self.assertEqual('10.0.0.1', self._get(session))
+        self.assertEqual(0, session.hedge_stats()['reads'])
+
+        self._record_get_latencies(session, [0.001] * 20)
+        self.assertEqual(session.hedge_min_delay, session.hedge_delay())
+        session._set_active(-1)
+        del self.responses[:]
+        threads = threading.active_count()
+        self.assertEqual('10.0.0.2', self._get(session))
+        # the slow primary is still answered and its response closed
+        self.assertEqual(['10.0.0.1', '10.0.0.1', '10.0.0.2'], self.requests)
+        for _ in range(100):
+            if len(self.responses) == 2:
+                break
+            time.sleep(0.01)
+        [hedge_response, primary_response] = self.responses
+        self.assertFalse(hedge_response.closed)
+        self.assertTrue(primary_response.closed)
+
+        self.delays.clear()
+        session.hedge_min_delay = 1
+        self.assertEqual(['10.0.0.1', '10.0.0.2'] * 2 + ['10.0.0.1'],
+                         [self._get(session) for _ in range(5)])
+        # the threads of the first hedged read are reused
+        self.assertEqual(threads + 2, threading.active_count())
+        self.assertEqual({'reads': 6, 'hedged': 1, 'hedge_wins': 1,
+                          'hedge_rate': 1 / 6.0, 'delay': 1},
+                         session.hedge_stats())
+    # end test_hedged_reads
+
+    def test_hedged_read_failures(self):
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        session = ApiServerSession(hosts, 1, 1, hedge_percentile=95)
+        self._record_get_latencies(session, [0.001] * 20)
+        self.delays['10.0.0.1'] = 0.05
+        self.down_hosts.update(['10.0.0.1', '10.0.0.2'])
+
+        self.assertEqual('10.0.0.3', self._get(session))
+        self.assertEqual(['10.0.0.1', '10.0.0.2', '10.0.0.3'],
+                         sorted(self.requests))
+    # end test_hedged_read_failures
+
+    def test_hedge_delay_window(self):
+        session = ApiServerSession(['10.0.0.1', '10.0.0.2'], 1, 1,
+                                   hedge_percentile=50)
+        session._HEDGE_LATENCY_WINDOW = 4
+        session._get_latencies = vnc_api.deque(maxlen=20)
+        self._record_get_latencies(session, [0.5, 0.1] * 10)
+        self.assertEqual(0.5, session.hedge_delay())
+        # the oldest latencies leave the window
+        self._record_get_latencies(session, [0.2] * 11)
+        self.assertEqual(0.2, session.hedge_delay())
+        self.assertEqual(sorted(session._get_latencies),
+                         session._sorted_get_latencies)
+    # end test_hedge_delay_window
+
+    def test_hash_routing(self):
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        session = ApiServerSession(hosts, 1, 1, lb_mode='hash',
+                                   circuit_failure_threshold=1)
+        urls = ['http://10.0.0.1:8082/virtual-network/uuid-%d' % i
+                for i in range(60)]
+        routes = [session.get(url) for url in urls]
+        self.assertEqual(routes, [session.get(url) for url in urls])
+        self.assertEqual(set(hosts), set(routes))
+
+        # only the keys of a failed host move
+        self.down_hosts.add('10.0.0.2')
+        session.host_health['10.0.0.2'].record_failure(self.now[0])
+        new_routes = [session.get(url) for url in urls]
+        for route, new_route in zip(routes, new_routes):
+            if route == '10.0.0.2':
+                self.assertNotEqual('10.0.0.2', new_route)
+            else:
+                self.assertEqual(route, new_route)
+
+        # fq_name resolutions are routed by name
+        body = '{"type": "virtual-network", "fq_name": ["vn"]}'
+        self.assertEqual(
+            1, len(set(session.post('http://10.0.0.1:8082/fqname-to-id',
+                                    data=body) for _ in range(5))))
+    # end test_hash_routing
+
+    def test_hash_routing_bounded_load(self):
+        hosts = ['10.0.0.1', '10.0.0.2']
+        session = ApiServerSession(hosts, 1, 1, lb_mode='hash')
+        url = 'http://10.0.0.1:8082/virtual-network/uuid'
+        host = session.get(url)
+        # the host of the key is overloaded, the next one on the ring is used
+        session._inflight[host] = session._inflight_total = 10
+        self.assertNotEqual(host, session.get(url))
+        session._inflight[host] = session._inflight_total = 0
+        self.assertEqual(host, session.get(url))
+    # end test_hash_routing_bounded_load
+
+    def test_writes_pinned(self):
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        session = ApiServerSession(hosts, 1, 1, lb_mode='hash',
+                                   write_hosts=['10.0.0.2', '10.0.0.3'])
+        writes = [session.put('http://10.0.0.1:8082/virtual-network/u%d' % i)
+                  for i in range(4)]
+        self.assertEqual(['10.0.0.2', '10.0.0.3'] * 2, writes)
+
+        self.down_hosts.update(['10.0.0.2', '10.0.0.3'])
+        with ExpectedException(ConnectionError):
+            session.delete('http://10.0.0.1:8082/virtual-network/u0')
+        self.assertNotIn('10.0.0.1', self.requests)
+    # end test_writes_pinned
+# end class TestApiServerSession
@@ -0,0 +1,110 @@
+import json
+
+import gevent
+import httpretty
+from testtools import ExpectedException
+
+import test_common
+from vnc_api.async_vnc_api import AsyncVncApi
+from vnc_api.exceptions import NoIdError
+from vnc_api.exceptions import TimeOutError
+
+
+class TestAsyncVncApi(test_common.TestCase):
+    def setUp(self):
+        super(TestAsyncVncApi, self).setUp()
+        links = [
+            {'link': {'href': 'http://127.0.0.1:8082/virtual-networks',
+                      'name': 'virtual-network',
+                      'rel': 'collection'}},
+            {'link': {'href': 'http://127.0.0.1:8082/virtual-network',
+                      'name': 'virtual-network',
+                      'rel': 'resource-base'}},
+        ]
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082",
+                             'links': links}))
+        self._vnc_lib._srv_root_url = None
+        self._async_lib = AsyncVncApi(vnc_lib=self._vnc_lib, pool_size=2)
+    # end setUp
+
+    def _register_vn(self, uuid):
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-network/%s" % uuid,
+            body=json.dumps({'virtual-network': {
+                'uuid': uuid,
+                'fq_name': ['default-domain', 'default-project', uuid]}}))
+    # end _register_vn
+
+    def test_per_type_methods_are_spawned(self):
+        uuids = ['vn-%d' % i for i in range(5)]
+        for uuid in uuids:
+            self._register_vn(uuid)
+
+        reads = [self._async_lib.virtual_network_read(id=uuid)
+                 for uuid in uuids]
+        gevent.joinall(reads)
+
+        self.assertEqual(uuids, [g.get().uuid for g in reads])
+    # end test_per_type_methods_are_spawned
+
+    def test_exception_raised_on_get(self):
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-network/unknown",
+            status=404, body='""')
+
+        read = self._async_lib.virtual_network_read(id='unknown')
+        with ExpectedException(NoIdError):
+            read.get()
+    # end test_exception_raised_on_get
+
+    def test_map_keeps_order_and_exceptions(self):
+        self._register_vn('vn-1')
+        self._register_vn('vn-2')
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-network/unknown",
+            status=404, body='""')
+        operations = [
+            ('virtual_network_read', (), {'id': 'vn-1'}),
+            ('virtual_network_read', (), {'id': 'unknown'}),
+            (self._vnc_lib.virtual_network_read, (), {'id': 'vn-2'}),
+        ]
+
+        for results in (self._vnc_lib.map(operations, pool_size=2),
+                        self._async_lib.map(operations)):
+            self.assertEqual('vn-1', results[0].uuid)
+            self.assertIsInstance(results[1], NoIdError)
+            self.assertEqual('vn-2', results[2].uuid)
+    # end test_map_keeps_order_and_exceptions
+
+    def test_request_context_propagated(self):
+        self._register_vn('vn-1')
+        with self._vnc_lib.request_context(token='user-token'):
+            read = self._async_lib.virtual_network_read(id='vn-1')
+
+        # the greenlet runs once the caller left the context
+        self.assertEqual('vn-1', read.get().uuid)
+        self.assertEqual('user-token',
+                         httpretty.last_request().headers['X-AUTH-TOKEN'])
+
+        with self._vnc_lib.request_context(token='map-token'):
+            results = self._async_lib.map(
+                [('virtual_network_read', (), {'id': 'vn-1'})])
+        self.assertEqual('vn-1', results[0].uuid)
+        self.assertEqual('map-token',
+                         httpretty.last_request().headers['X-AUTH-TOKEN'])
+
+        with self._vnc_lib.request_context(timeout=0):
+            read = self._async_lib.virtual_network_read(id='vn-1')
+        with ExpectedException(TimeOutError):
+            read.get()
+    # end test_request_context_propagated
+
+    def test_unknown_method(self):
+        with ExpectedException(AttributeError):
+            self._async_lib.foo_bar_read
+        with ExpectedException(AttributeError):
+            self._async_lib._request
+    # end test_unknown_method
+# end class TestAsyncVncApi
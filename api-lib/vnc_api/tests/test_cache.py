@@ -0,0 +1,412 @@
+import json
+import os
+import stat
+import threading
+import time
+
+import fixtures
+import httpretty
+from flexmock import flexmock
+from testtools import TestCase
+
+import test_common
+from vnc_api import cache
+from vnc_api import vnc_api
+
+
+class TestLRUCache(TestCase):
+    def test_lru_eviction(self):
+        lru = cache.LRUCache(max_size=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(1, lru.get('a'))
+        lru.set('c', 3)
+
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(1, lru.get('a'))
+        self.assertEqual(3, lru.get('c'))
+        self.assertEqual({'size': 2, 'max_size': 2, 'hits': 3, 'misses': 1,
+                          'evictions': 1}, lru.stats())
+    # end test_lru_eviction
+
+    def test_ttl_expiry(self):
+        now = [1000.0]
+        flexmock(cache.time).should_receive('time').replace_with(
+            lambda: now[0])
+        lru = cache.LRUCache(ttl=10)
+        lru.set('a', 1)
+        lru.set('b', 2, ttl=30)
+
+        now[0] += 20
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(2, lru.get('b'))
+    # end test_ttl_expiry
+
+    def test_object_cache_invalidation(self):
+        obj_cache = cache.ObjectCache(max_size=10, ttl=60)
+        obj_cache.set_obj_dict('project', 'uuid-1', 'all', {'uuid': 'uuid-1'})
+        obj_cache.set_obj_dict('project', 'uuid-1', 'fields', {'name': 'p'})
+        obj_cache.set_obj_dict('project', 'uuid-2', 'all', {'uuid': 'uuid-2'})
+
+        obj_cache.invalidate('uuid-1')
+
+        self.assertIsNone(obj_cache.get_obj_dict('project', 'uuid-1', 'all'))
+        self.assertIsNone(
+            obj_cache.get_obj_dict('project', 'uuid-1', 'fields'))
+        self.assertEqual({'uuid': 'uuid-2'},
+                         obj_cache.get_obj_dict('project', 'uuid-2', 'all'))
+    # end test_object_cache_invalidation
+
+    def test_object_cache_returns_copies(self):
+        obj_cache = cache.ObjectCache(max_size=10, ttl=60)
+        obj_cache.set_obj_dict('project', 'uuid-1', 'all', {'refs': []})
+        obj_cache.get_obj_dict('project', 'uuid-1', 'all')['refs'].append(1)
+
+        self.assertEqual({'refs': []},
+                         obj_cache.get_obj_dict('project', 'uuid-1', 'all'))
+    # end test_object_cache_returns_copies
+
+    def test_discovery_cache(self):
+        now = [1000.0]
+        flexmock(cache.time).should_receive('time').replace_with(
+            lambda: now[0])
+        cache_file = '%s/discovery' % self.useFixture(fixtures.TempDir()).path
+        discovery_cache = cache.DiscoveryCache(cache_file, ttl=10)
+        self.assertEqual((None, True), discovery_cache.get('a'))
+        discovery_cache.set('a', {'b': 1})
+
+        self.assertEqual(({'b': 1}, False),
+                         cache.DiscoveryCache(cache_file, ttl=10).get('a'))
+        now[0] += 20
+        self.assertEqual(({'b': 1}, True), discovery_cache.get('a'))
+
+        # other format versions are ignored
+        self.useFixture(fixtures.MonkeyPatch(
+            'vnc_api.cache.DiscoveryCache.VERSION', 2))
+        self.assertEqual((None, True), discovery_cache.get('a'))
+    # end test_discovery_cache
+
+    def test_discovery_cache_file(self):
+        cache_dir = self.useFixture(fixtures.TempDir()).path
+        cache_file = '%s/discovery' % cache_dir
+        discovery_cache = cache.DiscoveryCache(cache_file)
+        discovery_cache.set('a', {'b': 1})
+        self.assertEqual(0o644, stat.S_IMODE(os.stat(cache_file).st_mode))
+
+        # nothing left aside on failures
+        discovery_cache.set('a', object())
+        flexmock(cache.os).should_receive('rename').and_raise(OSError)
+        discovery_cache.set('a', {'b': 2})
+        self.assertEqual(['discovery'], os.listdir(cache_dir))
+        self.assertEqual({'b': 1}, discovery_cache.get('a')[0])
+    # end test_discovery_cache_file
+# end class TestLRUCache
+
+
+class TestVncApiObjectCache(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiObjectCache, self).setUp()
+        links = [
+            {'link': {'href': 'http://127.0.0.1:8082/virtual-network',
+                      'name': 'virtual-network',
+                      'rel': 'resource-base'}},
+            {'link': {'href': 'http://127.0.0.1:8082/project',
+                      'name': 'project',
+                      'rel': 'resource-base'}},
+            {'link': {'href': 'http://127.0.0.1:8082/network-ipam',
+                      'name': 'network-ipam',
+                      'rel': 'resource-base'}},
+        ]
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082",
+                             'links': links}))
+        self._vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                       object_cache_size=10)
+        self._reads = []
+
+        def _read_vn(request, url, headers):
+            self._reads.append(url)
+            return (200, headers, json.dumps({'virtual-network': {
+                'uuid': 'vn-uuid',
+                'fq_name': ['default-domain', 'default-project', 'vn']}}))
+
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-network/vn-uuid",
+            body=_read_vn)
+        httpretty.register_uri(
+            httpretty.DELETE, "http://127.0.0.1:8082/virtual-network/vn-uuid",
+            body='{}')
+    # end setUp
+
+    def test_read_through_and_invalidation(self):
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        vn = self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self.assertEqual('vn-uuid', vn.uuid)
+        self.assertEqual(1, len(self._reads))
+
+        # other field set is another cache entry
+        self._vnc_lib.virtual_network_read(id='vn-uuid', fields=['tag_refs'])
+        self.assertEqual(2, len(self._reads))
+
+        self._vnc_lib.virtual_network_delete(id='vn-uuid')
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self.assertEqual(3, len(self._reads))
+        stats = self._vnc_lib.object_cache_stats()
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(3, stats['misses'])
+    # end test_read_through_and_invalidation
+
+    def _register_related_objects(self):
+        vn_ref = {'to': ['default-domain', 'default-project', 'vn'],
+                  'uuid': 'vn-uuid'}
+        objects = {
+            'virtual-network': {
+                'uuid': 'vn-uuid',
+                'fq_name': ['default-domain', 'default-project', 'vn'],
+                'parent_type': 'project', 'parent_uuid': 'project-uuid',
+                'network_ipam_refs': [{
+                    'to': ['default-domain', 'default-project', 'ipam'],
+                    'uuid': 'ipam-uuid', 'attr': None}]},
+            'project': {
+                'uuid': 'project-uuid',
+                'fq_name': ['default-domain', 'default-project'],
+                'virtual_networks': [vn_ref]},
+            'network-ipam': {
+                'uuid': 'ipam-uuid',
+                'fq_name': ['default-domain', 'default-project', 'ipam'],
+                'virtual_network_back_refs': [dict(vn_ref, attr=None)]},
+        }
+        reads = []
+        for res_type, obj_dict in objects.items():
+            def _read(request, url, headers, res_type=res_type):
+                reads.append(res_type)
+                return (200, headers,
+                        json.dumps({res_type: objects[res_type]}))
+            httpretty.register_uri(
+                httpretty.GET, "http://127.0.0.1:8082/%s/%s" % (
+                    res_type, obj_dict['uuid']),
+                body=_read)
+        return reads
+    # end _register_related_objects
+
+    def test_parent_and_refs_invalidated_on_delete(self):
+        reads = self._register_related_objects()
+        self._vnc_lib.project_read(id='project-uuid')
+        self._vnc_lib.network_ipam_read(id='ipam-uuid')
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self._vnc_lib.virtual_network_delete(id='vn-uuid')
+
+        # parent children and back-refs of the referred ipam changed
+        self._vnc_lib.project_read(id='project-uuid')
+        self._vnc_lib.network_ipam_read(id='ipam-uuid')
+        self.assertEqual(['project', 'network-ipam', 'virtual-network',
+                          'project', 'network-ipam'], reads)
+
+        # the objects related to an object not cached are not known
+        self._vnc_lib.virtual_network_delete(id='vn-uuid')
+        self._vnc_lib.project_read(id='project-uuid')
+        self.assertEqual(6, len(reads))
+    # end test_parent_and_refs_invalidated_on_delete
+
+    def _read_concurrently(self):
+        reader = threading.Thread(target=self._vnc_lib.virtual_network_read,
+                                  kwargs={'id': 'vn-uuid'})
+        reader.start()
+        reader.join()
+    # end _read_concurrently
+
+    def test_read_during_update_not_cached(self):
+        def _update_vn(request, url, headers):
+            # read of the network before its update is applied
+            self._read_concurrently()
+            return (200, headers, '{}')
+
+        httpretty.register_uri(
+            httpretty.PUT, "http://127.0.0.1:8082/virtual-network/vn-uuid",
+            body=_update_vn)
+        vn = vnc_api.VirtualNetwork('vn')
+        vn.uuid = 'vn-uuid'
+        vn.set_display_name('updated')
+
+        self._vnc_lib.virtual_network_update(vn)
+        self.assertEqual(1, len(self._reads))
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self.assertEqual(2, len(self._reads))
+    # end test_read_during_update_not_cached
+
+    def test_read_racing_invalidation_not_cached(self):
+        def _read_vn(request, url, headers):
+            self._reads.append(url)
+            # written and invalidated while this read is in flight
+            self._vnc_lib._invalidate_cached_objects('vn-uuid')
+            return (200, headers, json.dumps({'virtual-network': {
+                'uuid': 'vn-uuid',
+                'fq_name': ['default-domain', 'default-project', 'vn']}}))
+
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-network/vn-uuid",
+            body=_read_vn)
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self.assertEqual(2, len(self._reads))
+    # end test_read_racing_invalidation_not_cached
+
+    def test_cache_bypassed_for_user_token(self):
+        self._vnc_lib.virtual_network_read(id='vn-uuid')
+        with self._vnc_lib.request_context(token='user-token'):
+            self._vnc_lib.virtual_network_read(id='vn-uuid')
+        self.assertEqual(2, len(self._reads))
+    # end test_cache_bypassed_for_user_token
+
+    def test_cache_disabled_by_default(self):
+        self.assertIsNone(vnc_api.VncApi(
+            conf_file='/tmp/fake-config-file').object_cache_stats())
+    # end test_cache_disabled_by_default
+# end class TestVncApiObjectCache
+
+
+class TestVncApiNameCache(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiNameCache, self).setUp()
+        links = [
+            {'link': {'href': 'http://127.0.0.1:8082/virtual-network',
+                      'name': 'virtual-network',
+                      'rel': 'resource-base'}},
+            {'link': {'href': 'http://127.0.0.1:8082/fqname-to-id',
+                      'name': 'name-to-id',
+                      'rel': 'action'}},
+            {'link': {'href': 'http://127.0.0.1:8082/id-to-fqname',
+                      'name': 'id-to-name',
+                      'rel': 'action'}},
+        ]
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082",
+                             'links': links}))
+        self._vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                       name_cache_size=10)
+        self._requests = []
+        self._fq_name = ['default-domain', 'default-project', 'vn']
+
+        def _name_to_id(request, url, headers):
+            self._requests.append(url)
+            body = json.loads(request.body)
+            if body['fq_name'] != self._fq_name:
+                return (404, headers, '""')
+            return (200, headers, json.dumps({'uuid': 'vn-uuid'}))
+
+        def _id_to_name(request, url, headers):
+            self._requests.append(url)
+            return (200, headers, json.dumps({'fq_name': self._fq_name,
+                                              'type': 'virtual-network'}))
+
+        httpretty.register_uri(
+            httpretty.POST, "http://127.0.0.1:8082/fqname-to-id",
+            body=_name_to_id)
+        httpretty.register_uri(
+            httpretty.POST, "http://127.0.0.1:8082/id-to-fqname",
+            body=_id_to_name)
+        httpretty.register_uri(
+            httpretty.DELETE, "http://127.0.0.1:8082/virtual-network/vn-uuid",
+            body='{}')
+    # end setUp
+
+    def test_resolutions_cached_both_ways(self):
+        self.assertEqual('vn-uuid', self._vnc_lib.fq_name_to_id(
+            'virtual-network', self._fq_name))
+        self.assertEqual('vn-uuid', self._vnc_lib.fq_name_to_id(
+            'virtual_network', self._fq_name))
+        self.assertEqual(self._fq_name,
+                         self._vnc_lib.id_to_fq_name('vn-uuid'))
+        self.assertEqual((self._fq_name, 'virtual-network'),
+                         self._vnc_lib.id_to_fq_name_type('vn-uuid'))
+        self.assertEqual(1, len(self._requests))
+    # end test_resolutions_cached_both_ways
+
+    def test_negative_entries(self):
+        unknown = ['default-domain', 'default-project', 'unknown']
+        for _ in range(2):
+            self.assertRaises(vnc_api.NoIdError, self._vnc_lib.fq_name_to_id,
+                              'virtual-network', unknown)
+        self.assertEqual(1, len(self._requests))
+    # end test_negative_entries
+
+    def test_invalidation_on_delete(self):
+        self._vnc_lib.virtual_network_delete(fq_name=self._fq_name)
+        self._vnc_lib.id_to_fq_name('vn-uuid')
+        self.assertEqual(2, len(self._requests))
+    # end test_invalidation_on_delete
+# end class TestVncApiNameCache
+
+
+class TestVncApiDiscoveryCache(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiDiscoveryCache, self).setUp()
+        self.cache_file = '%s/discovery' % self.useFixture(
+            fixtures.TempDir()).path
+        self.homepage_gets = []
+        self.keystone_posts = []
+
+        def _homepage(request, url, headers):
+            self.homepage_gets.append(url)
+            return (200, headers, json.dumps({
+                'href': 'http://127.0.0.1:8082',
+                'links': [{'link': {
+                    'href': 'http://127.0.0.1:8082/fqname-to-id',
+                    'name': 'name-to-id', 'rel': 'action'}}]}))
+
+        def _keystone_v3(request, url, headers):
+            self.keystone_posts.append(url)
+            return (404, headers, '')
+
+        # replaces the homepage registered by test_common
+        httpretty.reset()
+        httpretty.register_uri(httpretty.GET, 'http://127.0.0.1:8082/',
+                               body=_homepage)
+        httpretty.register_uri(httpretty.POST,
+                               'http://127.0.0.1:35357/v3/auth/tokens',
+                               body=_keystone_v3)
+    # end setUp
+
+    def _new_vnc_lib(self):
+        return vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                              discovery_cache_file=self.cache_file)
+    # end _new_vnc_lib
+
+    def test_startup_from_cache(self):
+        self._new_vnc_lib()
+        self.assertEqual(1, len(self.homepage_gets))
+        self.assertEqual(1, len(self.keystone_posts))
+
+        vnc_lib = self._new_vnc_lib()
+        self.assertEqual(1, len(self.homepage_gets))
+        self.assertEqual(1, len(self.keystone_posts))
+        self.assertEqual('/fqname-to-id', vnc_lib._action_uri['name-to-id'])
+        self.assertEqual('/v2.0/tokens', vnc_lib._authn_url)
+    # end test_startup_from_cache
+
+    def test_stale_entries_revalidated(self):
+        self._new_vnc_lib()
+        now = time.time() + 3600
+        flexmock(cache.time).should_receive('time').replace_with(
+            lambda: now)
+
+        self._new_vnc_lib()
+        for _ in range(100):
+            if len(self.homepage_gets) == 2 and len(self.keystone_posts) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(2, len(self.homepage_gets))
+        self.assertEqual(2, len(self.keystone_posts))
+    # end test_stale_entries_revalidated
+
+    def test_unknown_action_not_refetched(self):
+        vnc_lib = self._new_vnc_lib()
+        for _ in range(3):
+            self.assertRaises(KeyError, vnc_lib._action_uri.__getitem__,
+                              'unknown-action')
+        # homepage fetched at startup and once for the unknown action
+        self.assertEqual(2, len(self.homepage_gets))
+    # end test_unknown_action_not_refetched
+# end class TestVncApiDiscoveryCache
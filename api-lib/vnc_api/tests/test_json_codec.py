@@ -0,0 +1,78 @@
+import json
+
+import httpretty
+from flexmock import flexmock
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import json_codec
+from vnc_api.gen.resource_client import VirtualNetwork
+from vnc_api.gen.resource_xsd import IdPermsType
+
+
+class _RecordingCodec(json_codec.JsonCodec):
+    def __init__(self):
+        super(_RecordingCodec, self).__init__()
+        self.loaded = []
+        self.dumped = []
+    # end __init__
+
+    def dumps(self, obj, default=None):
+        data = super(_RecordingCodec, self).dumps(obj, default)
+        self.dumped.append(data)
+        return data
+    # end dumps
+
+    def loads(self, data):
+        self.loaded.append(data)
+        return super(_RecordingCodec, self).loads(data)
+    # end loads
+# end class _RecordingCodec
+
+
+class TestJsonCodecs(TestCase):
+    def test_codecs(self):
+        codecs = json_codec.available_codecs()
+        self.assertIn('json', [codec.name for codec in codecs])
+        obj = {'name': u'r\xe9seau', 'id_perms': IdPermsType(enable=True)}
+        for codec in codecs:
+            data = codec.dumps(obj, default=lambda o: o.__dict__)
+            self.assertIsInstance(data, bytes)
+            self.assertEqual(json.loads(data), codec.loads(data))
+            self.assertEqual(u'r\xe9seau', codec.loads(data)['name'])
+            self.assertTrue(codec.loads(data)['id_perms']['enable'])
+    # end test_codecs
+
+    def test_get_codec(self):
+        self.assertEqual('json', json_codec.get_codec('json').name)
+        with ExpectedException(ValueError):
+            json_codec.get_codec('foo')
+        flexmock(json_codec.UjsonCodec).should_receive('_import').and_raise(
+            ImportError)
+        with ExpectedException(ValueError):
+            json_codec.get_codec('ujson')
+    # end test_get_codec
+# end class TestJsonCodecs
+
+
+class TestVncApiJsonCodec(test_common.TestCase):
+    def test_bodies_go_through_codec(self):
+        codec = _RecordingCodec()
+        self._vnc_lib._json = codec
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:8082/virtual-networks',
+            body=json.dumps({'virtual-network': {
+                'uuid': 'vn-uuid',
+                'fq_name': ['default-domain', 'default-project', 'vn']}}))
+
+        self._vnc_lib.virtual_network_create(VirtualNetwork('vn'))
+
+        # object serialized at once, response handed over undecoded
+        self.assertEqual(1, len(codec.dumped))
+        self.assertEqual(['default-domain', 'default-project', 'vn'],
+                         json.loads(httpretty.last_request().body)
+                         ['virtual-network']['fq_name'])
+        self.assertIsInstance(codec.loaded[-1], bytes)
+    # end test_bodies_go_through_codec
+# end class TestVncApiJsonCodec
@@ -0,0 +1,88 @@
+import sys
+import types
+
+import fixtures
+from testtools import TestCase
+
+from vnc_api import lazy_loader
+from vnc_api import vnc_api
+
+
+class TestLazyModule(TestCase):
+    def setUp(self):
+        super(TestLazyModule, self).setUp()
+        self.imports = []
+        for name in ('lazy_test_types_a', 'lazy_test_types_b'):
+            module = types.ModuleType(name)
+            setattr(module, name[-1].upper(), object())
+            sys.modules[name] = module
+            self.addCleanup(sys.modules.pop, name)
+        real_import = lazy_loader.importlib.import_module
+
+        def import_module(name):
+            self.imports.append(name)
+            return real_import(name)
+        self.useFixture(fixtures.MonkeyPatch(
+            'vnc_api.lazy_loader.importlib.import_module', import_module))
+    # end setUp
+
+    def test_attributes_loaded_on_first_access(self):
+        loaded = []
+        lazy = lazy_loader.LazyModule(
+            'lazy_test', {'A': 'lazy_test_types_a', 'B': 'lazy_test_types_b'},
+            on_load=lambda name, value: loaded.append(name))
+
+        self.assertEqual([], self.imports)
+        self.assertIs(sys.modules['lazy_test_types_a'].A, lazy.A)
+        self.assertIs(sys.modules['lazy_test_types_a'].A, lazy.A)
+        self.assertEqual(['lazy_test_types_a'], self.imports)
+        self.assertEqual(['A'], loaded)
+        self.assertEqual(['A', 'B'], lazy.__all__)
+        self.assertRaises(AttributeError, getattr, lazy, 'C')
+    # end test_attributes_loaded_on_first_access
+
+    def test_wrapped_module(self):
+        module = types.ModuleType('lazy_test')
+        module.x = 1
+        module._private = 2
+        lazy = lazy_loader.LazyModule('lazy_test', {'A': 'lazy_test_types_a'},
+                                      module)
+
+        self.assertEqual(1, lazy.x)
+        lazy.y = 3
+        self.assertEqual(3, module.y)
+        # loaded attributes become globals of the wrapped module
+        self.assertIs(lazy.A, module.A)
+        self.assertEqual(['A', 'x', 'y'], lazy.__all__)
+    # end test_wrapped_module
+
+    def test_lazy_import(self):
+        proxy = lazy_loader.lazy_import('lazy_test_types_b')
+        self.assertEqual([], self.imports)
+        self.assertIs(sys.modules['lazy_test_types_b'].B, proxy.B)
+    # end test_lazy_import
+# end class TestLazyModule
+
+
+class TestGeneratedTypes(TestCase):
+    def test_get_object_class(self):
+        cls = vnc_api.get_object_class('virtual-network')
+        self.assertEqual('virtual-network', cls.resource_type)
+        self.assertIs(cls, vnc_api.VirtualNetwork)
+        self.assertIsNone(vnc_api.get_object_class('no-such-type'))
+    # end test_get_object_class
+
+    def test_homepage_uris_set_on_classes(self):
+        cls = vnc_api.get_object_class('virtual-network')
+        self.addCleanup(setattr, cls, 'create_uri', cls.create_uri)
+        vnc_api._homepage_uris['collection']['virtual-network'] = (
+            'http://server:8082/virtual-networks')
+        self.addCleanup(vnc_api._homepage_uris['collection'].pop,
+                        'virtual-network')
+
+        # as done on the first access to a lazily imported class
+        vnc_api._set_homepage_uris(cls)
+        self.assertEqual('http://server:8082/virtual-networks',
+                         cls.create_uri)
+    # end test_homepage_uris_set_on_classes
+# end class TestGeneratedTypes
@@ -1,7 +1,9 @@
 import os
 import shutil
 import tempfile
+import threading
 
+import fixtures
 from testtools import TestCase
 
 from vnc_api.vnc_api import CurlLogger, DEFAULT_LOG_DIR
@@ -28,4 +30,79 @@ class TestCurlLogger(TestCase):
                   os.path.exists(os.path.join(DEFAULT_LOG_DIR, logfile)))
         self.assertTrue(result)
         shutil.rmtree(DEFAULT_LOG_DIR, ignore_errors=True)
+
+    def _curl_logger(self, **kwargs):
+        logfile = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                               'vnc-api.log')
+        return CurlLogger(log_file=logfile, **kwargs)
+
+    def _read_log(self, log):
+        log.flush()
+        with open(log.log_file) as f:
+            return f.read()
+
+    def test_records_written_in_background(self):
+        log = self._curl_logger(max_body_size=10)
+        log.log('post', 'http://127.0.0.1:8082/virtual-networks',
+                data='{"virtual-network": {}}',
+                headers={'X-AUTH-TOKEN': 'abc123'})
+        log.log_response(FakeResponse(200, '{"virtual-network": "%s"}' %
+                                      ('x' * 100)))
+
+        content = self._read_log(log)
+        self.assertIn('curl -X POST -H "X-AUTH-TOKEN:$TOKEN"  '
+                      '-d \'{"virtual-network": {}}\' '
+                      'http://127.0.0.1:8082/virtual-networks', content)
+        self.assertIn('RESP: 200 {} {"virtual-... <123 bytes>', content)
+
+    def test_sampling_and_op_filter(self):
+        log = self._curl_logger(ops=['get', 'delete'])
+        self.assertTrue(log.sample('get'))
+        self.assertFalse(log.sample('post'))
+        log = self._curl_logger(sample_rate=0)
+        self.assertFalse(log.sample('get'))
+
+    def test_records_dropped_when_queue_full(self):
+        log = self._curl_logger(queue_size=1)
+        written = threading.Event()
+        self.addCleanup(written.set)
+
+        def format_request(*args):
+            written.wait()
+            return 'request'
+        log._format_request = format_request
+
+        for _ in range(3):
+            log.log('get', 'http://127.0.0.1:8082/virtual-networks')
+        self.assertIn(log.dropped, (1, 2))
+        written.set()
+        self.assertIn('request', self._read_log(log))
+
+    def test_loggers_share_a_writer_per_file(self):
+        log = self._curl_logger()
+        threads = threading.active_count()
+        same_file_log = CurlLogger(log_file=log.log_file, sample_rate=0.5)
+        self.assertEqual(threads, threading.active_count())
+        self.assertIs(log.curl_logger, same_file_log.curl_logger)
+        self.assertEqual(1, len(log.curl_logger.handlers))
+
+        written = threading.Event()
+        self.addCleanup(written.set)
+
+        def format_request(*args):
+            written.wait()
+            return 'request'
+        log._format_request = format_request
+        log.log('get', 'http://127.0.0.1:8082/virtual-networks')
+        self.assertFalse(same_file_log.flush(timeout=0.01))
+        written.set()
+        self.assertTrue(same_file_log.flush(timeout=5))
 # end class TestCurlLogger
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.headers = {}
+        self.content = content
+# end class FakeResponse
@@ -0,0 +1,97 @@
+import httpretty
+from flexmock import flexmock
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import metrics
+from vnc_api import vnc_api
+
+
+class TestMetricsRegistry(TestCase):
+    def test_metrics(self):
+        registry = metrics.MetricsRegistry(prefix='test')
+        registry.inc('requests_total', method='get')
+        registry.inc('requests_total', 2, method='get')
+        registry.set('inflight_requests', 3, host='h1')
+        registry.observe('latency_seconds', 0.02, buckets=(0.01, 0.1))
+        registry.observe('latency_seconds', 0.5, buckets=(0.01, 0.1))
+        registry.add_collector(lambda r: r.set('collected', 1))
+
+        self.assertEqual({
+            'requests_total': {'type': 'counter', 'values': [
+                {'labels': {'method': 'get'}, 'value': 3}]},
+            'inflight_requests': {'type': 'gauge', 'values': [
+                {'labels': {'host': 'h1'}, 'value': 3}]},
+            'latency_seconds': {'type': 'histogram', 'values': [
+                {'labels': {}, 'count': 2, 'sum': 0.52,
+                 'buckets': {0.01: 0, 0.1: 1, float('inf'): 2}}]},
+            'collected': {'type': 'gauge', 'values': [
+                {'labels': {}, 'value': 1}]},
+        }, registry.to_dict())
+
+        prometheus = registry.to_prometheus().splitlines()
+        self.assertIn('# TYPE test_requests_total counter', prometheus)
+        self.assertIn('test_requests_total{method="get"} 3', prometheus)
+        self.assertIn('test_latency_seconds_bucket{le="0.1"} 1', prometheus)
+        self.assertIn('test_latency_seconds_bucket{le="+Inf"} 2', prometheus)
+        self.assertIn('test_latency_seconds_count 2', prometheus)
+
+        statsd = registry.to_statsd().splitlines()
+        self.assertIn('test.requests_total.method.get:3|g', statsd)
+        self.assertIn('test.latency_seconds.count:2|g', statsd)
+
+        with ExpectedException(ValueError):
+            registry.observe('requests_total', 1)
+    # end test_metrics
+# end class TestMetricsRegistry
+
+
+class TestVncApiMetrics(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiMetrics, self).setUp()
+        self._vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                       metrics=True)
+    # end setUp
+
+    def test_disabled_by_default(self):
+        vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file')
+        self.assertFalse(vnc_lib.metrics.enabled)
+        flexmock(vnc_lib).should_call('_send_request').once()
+        vnc_lib._request(vnc_api.OP_GET, '/')
+        self.assertEqual({}, vnc_lib.metrics.to_dict())
+        self.assertEqual('', vnc_lib.metrics.to_prometheus())
+    # end test_disabled_by_default
+
+    def test_request_metrics(self):
+        flexmock(self._vnc_lib).should_receive('_retry_sleep')
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/virtual-networks',
+            responses=[httpretty.Response(status=503, body='""'),
+                       httpretty.Response(status=200, body='{}')])
+
+        self._vnc_lib._request(vnc_api.OP_GET, '/virtual-networks')
+
+        stats = self._vnc_lib.metrics.to_dict()
+        self.assertEqual(
+            [{'labels': {'status': '503'}, 'value': 1}],
+            stats['retries_total']['values'])
+        self.assertIn(
+            {'labels': {'method': 'get', 'resource': 'virtual-network',
+                        'outcome': 'ok'}, 'value': 1},
+            stats['requests_total']['values'])
+        [latency] = [value for value in
+                     stats['request_duration_seconds']['values']
+                     if value['labels']['resource'] == 'virtual-network']
+        self.assertEqual(1, latency['count'])
+        self.assertEqual(
+            self._vnc_lib.transfer_stats()['response_bytes'],
+            stats['response_bytes_total']['values'][0]['value'])
+        self.assertEqual(
+            [{'labels': {'host': '127.0.0.1'}, 'value': 0}],
+            stats['inflight_requests']['values'])
+        self.assertIn('vnc_api_http_request_duration_seconds_count'
+                      '{host="127.0.0.1",method="get"}',
+                      self._vnc_lib.metrics.to_prometheus())
+    # end test_request_metrics
+# end class TestVncApiMetrics
@@ -0,0 +1,131 @@
+import json
+import os
+import signal
+import tempfile
+import time
+
+import httpretty
+from flexmock import flexmock
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import profiler
+from vnc_api import vnc_api
+
+
+def _slow_read():
+    time.sleep(0.05)
+# end _slow_read
+
+
+def _slow_update():
+    _slow_read()
+    raise ValueError
+# end _slow_update
+
+
+class TestProfiler(TestCase):
+    def _profile(self, entry_points):
+        update = entry_points.wrap('update', _slow_update)
+        read = entry_points.wrap('read', _slow_read)
+        read()
+        with ExpectedException(ValueError):
+            update()
+        self.assertEqual({'calls': 1, 'errors': 1},
+                         dict((key, entry_points.stats()['update'][key])
+                              for key in ('calls', 'errors')))
+        self.assertGreaterEqual(entry_points.stats()['read']['total'], 0.05)
+        return entry_points.report()
+    # end _profile
+
+    def test_timing(self):
+        report = self._profile(profiler.Profiler())
+        self.assertIn('VNC API profile (timing)', report)
+        self.assertEqual(['read', 'update'], sorted(
+            line.split()[0] for line in report.splitlines()[2:]))
+    # end test_timing
+
+    def test_sample(self):
+        report = self._profile(profiler.SamplingProfiler(interval=0.001))
+        self.assertIn('== update', report)
+        update_report = report.split('== update')[1].split('==')[0]
+        self.assertIn('(_slow_update)', update_report)
+        self.assertIn('(_slow_read)', update_report)
+        self.assertNotIn('(call)', update_report)
+    # end test_sample
+
+    def test_cprofile(self):
+        report = self._profile(profiler.CProfileProfiler())
+        self.assertIn('== read', report)
+        self.assertIn('(_slow_read)', report.split('== read')[1])
+    # end test_cprofile
+
+    def test_dump(self):
+        report_file = os.path.join(tempfile.mkdtemp(), 'profile')
+        self.addCleanup(os.remove, report_file)
+        entry_points = profiler.Profiler(report_file)
+        entry_points.dump()
+        self.assertFalse(os.path.exists(report_file))
+        entry_points.wrap('read', _slow_read)()
+        entry_points.dump()
+        with open(report_file) as f:
+            self.assertIn('read ', f.read())
+        with ExpectedException(ValueError):
+            profiler.get_profiler('unknown')
+    # end test_dump
+
+    def test_dump_on_signal(self):
+        report_file = os.path.join(tempfile.mkdtemp(), 'profile')
+        self.addCleanup(os.remove, report_file)
+        self.addCleanup(signal.signal, signal.SIGUSR2,
+                        signal.getsignal(signal.SIGUSR2))
+        flexmock(profiler.atexit).should_receive('register').once()
+        entry_points = profiler.Profiler(report_file)
+        entry_points.install('SIGUSR2')
+        entry_points.wrap('read', _slow_read)()
+
+        # signaled while the stats are updated
+        with entry_points._lock:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            time.sleep(0.01)
+        report = ''
+        for _ in range(100):
+            if os.path.exists(report_file):
+                with open(report_file) as f:
+                    report = f.read()
+                if report.endswith('\n\n'):
+                    break
+            time.sleep(0.01)
+        self.assertIn('read ', report)
+    # end test_dump_on_signal
+# end class TestProfiler
+
+
+class TestVncApiProfiler(test_common.TestCase):
+    def test_entry_points_profiled(self):
+        self.assertIsNone(self._vnc_lib.profiler)
+        self.assertNotIn('virtual_network_read', vars(self._vnc_lib))
+
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082", 'links': [
+                {'link': {'href': 'http://127.0.0.1:8082/virtual-network',
+                          'name': 'virtual-network',
+                          'rel': 'resource-base'}}]}))
+        entry_points = profiler.Profiler()
+        vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                 profiler=entry_points)
+        httpretty.register_uri(
+            httpretty.GET,
+            'http://127.0.0.1:8082/virtual-network/vn-uuid',
+            body=json.dumps({'virtual-network': {
+                'fq_name': ['default-domain', 'default-project', 'vn'],
+                'uuid': 'vn-uuid'}}))
+        vnc_lib.virtual_network_read(id='vn-uuid')
+
+        self.assertEqual(['virtual_network_read'],
+                         list(entry_points.stats()))
+        self.assertIs(entry_points, vnc_lib.profiler)
+    # end test_entry_points_profiled
+# end class TestVncApiProfiler
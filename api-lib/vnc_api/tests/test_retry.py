@@ -0,0 +1,224 @@
+import json
+
+import httpretty
+from flexmock import flexmock
+from requests.exceptions import ReadTimeout
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import retry
+from vnc_api import vnc_api
+from vnc_api.exceptions import ServiceUnavailableError, TimeOutError
+from vnc_api.utils import OP_GET
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.now = [1000.0]
+        flexmock(retry.time).should_receive('time').replace_with(
+            lambda: self.now[0])
+    # end setUp
+
+    def test_backoff_bounds(self):
+        policy = retry.RetryPolicy(base_delay=1, max_delay=10)
+        for attempt, ceiling in [(0, 1), (1, 2), (3, 8), (4, 10), (500, 10)]:
+            for _ in range(20):
+                delay = policy.backoff(attempt)
+                self.assertTrue(0 <= delay <= ceiling)
+        # Retry-After is honoured within max_delay
+        self.assertEqual(5, policy.backoff(0, retry_after=5))
+        self.assertEqual(10, policy.backoff(0, retry_after=60))
+    # end test_backoff_bounds
+
+    def test_max_elapsed(self):
+        policy = retry.RetryPolicy(base_delay=1, max_delay=1, max_elapsed=5)
+        self.assertIsNotNone(policy.next_delay(0, 1))
+        self.assertIsNone(policy.next_delay(0, 5))
+    # end test_max_elapsed
+
+    def test_budget(self):
+        budget = retry.RetryBudget(capacity=2, refill_rate=1)
+        policy = retry.RetryPolicy(budget=budget)
+        self.assertIsNotNone(policy.next_delay(0, 0))
+        self.assertIsNotNone(policy.next_delay(0, 0))
+        self.assertIsNone(policy.next_delay(0, 0))
+
+        self.now[0] += 1.5
+        self.assertTrue(budget.consume())
+        self.assertFalse(budget.consume())
+        self.now[0] += 60
+        self.assertEqual(2, budget.tokens)
+    # end test_budget
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3, retry.parse_retry_after('3'))
+        self.now[0] = 1445412470.0  # 10s before the date
+        self.assertEqual(
+            10, retry.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+        self.now[0] += 60
+        self.assertEqual(
+            0, retry.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        self.assertIsNone(retry.parse_retry_after(None))
+    # end test_parse_retry_after
+# end class TestRetryPolicy
+
+
+class TestVncApiRetry(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiRetry, self).setUp()
+        self.sleeps = []
+        flexmock(vnc_api.time).should_receive('sleep').replace_with(
+            self.sleeps.append)
+    # end setUp
+
+    def test_retry_after_honoured(self):
+        url = 'http://127.0.0.1:8082/unavailable'
+        httpretty.register_uri(
+            httpretty.GET, url,
+            responses=[httpretty.Response(status=503, body='""',
+                                          adding_headers={'Retry-After': '4'}),
+                       httpretty.Response(status=200, body='"ok"')])
+
+        self.assertEqual(
+            'ok', self._vnc_lib._request_server(OP_GET, url='/unavailable'))
+        self.assertEqual(1, len(self.sleeps))
+        self.assertTrue(self.sleeps[0] >= 4)
+    # end test_retry_after_honoured
+
+    def test_retry_budget_exhausted(self):
+        self._vnc_lib._retry_policy = retry.RetryPolicy(
+            budget=retry.RetryBudget(capacity=3, refill_rate=0))
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/unavailable',
+            status=503, body='""')
+
+        with ExpectedException(ServiceUnavailableError):
+            self._vnc_lib._request_server(OP_GET, url='/unavailable')
+        self.assertEqual(3, len(self.sleeps))
+        # budget is per client, next failing call is not retried
+        with ExpectedException(ServiceUnavailableError):
+            self._vnc_lib._request_server(OP_GET, url='/unavailable')
+        self.assertEqual(3, len(self.sleeps))
+    # end test_retry_budget_exhausted
+# end class TestVncApiRetry
+
+
+class TestVncApiDeadline(test_common.TestCase):
+    def setUp(self):
+        super(TestVncApiDeadline, self).setUp()
+        self.now = [1000.0]
+        self.sleeps = []
+
+        def _sleep(delay):
+            self.sleeps.append(delay)
+            self.now[0] += delay
+
+        flexmock(vnc_api.time).should_receive('sleep').replace_with(_sleep)
+        flexmock(vnc_api.time).should_receive('time').replace_with(
+            lambda: self.now[0])
+    # end setUp
+
+    def _record_http_get(self):
+        calls = []
+
+        def _http_get(uri, headers=None, query_params=None, **kwargs):
+            calls.append(kwargs)
+            return (200, '{}')
+
+        self._vnc_lib._http_get = _http_get
+        return calls
+    # end _record_http_get
+
+    def test_deadline_mapped_to_socket_timeouts(self):
+        calls = self._record_http_get()
+        self._vnc_lib._request_server(OP_GET, url='/')
+        with self._vnc_lib.request_context(timeout=10):
+            with self._vnc_lib.request_context(timeout=20):
+                self._vnc_lib._request_server(OP_GET, url='/')
+        self._vnc_lib._connect_timeout = 3
+        with self._vnc_lib.request_context(timeout=10):
+            self._vnc_lib._request_server(OP_GET, url='/')
+
+        self.assertEqual([{}, {'timeout': (10, 10)}, {'timeout': (3, 10)}],
+                         calls)
+    # end test_deadline_mapped_to_socket_timeouts
+
+    def test_deadline_bounds_retries(self):
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/unavailable',
+            status=503, body='""', adding_headers={'Retry-After': '4'})
+
+        with ExpectedException(TimeOutError):
+            with self._vnc_lib.request_context(timeout=5):
+                self._vnc_lib._request_server(OP_GET, url='/unavailable')
+        self.assertEqual(1, len(self.sleeps))
+    # end test_deadline_bounds_retries
+
+    def test_client_timeout_and_read_timeout(self):
+        vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                 timeout=30)
+
+        def _http_get(uri, headers=None, query_params=None, **kwargs):
+            self.assertEqual((30, 30), kwargs['timeout'])
+            raise ReadTimeout
+
+        vnc_lib._http_get = _http_get
+        with ExpectedException(TimeOutError):
+            vnc_lib._request_server(OP_GET, url='/')
+    # end test_client_timeout_and_read_timeout
+
+    def _register_keystone(self, keystone_timeouts):
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:35357/v2.0/tokens',
+            body=json.dumps({'access': {'token': {
+                'id': 'token', 'expires': '2100-01-01T00:00:00Z'}}}))
+        post = self._vnc_lib._ks_session.post
+
+        def _post(url, **kwargs):
+            keystone_timeouts.append(kwargs.get('timeout'))
+            return post(url, **kwargs)
+        self._vnc_lib._ks_session.post = _post
+    # end _register_keystone
+
+    def test_deadline_bounds_reauthentication(self):
+        keystone_timeouts = []
+        self._register_keystone(keystone_timeouts)
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/unauthorized',
+            responses=[httpretty.Response(status=401, body='""'),
+                       httpretty.Response(status=200, body='{}')])
+
+        with self._vnc_lib.request_context(timeout=10):
+            self._vnc_lib._request_server(OP_GET, url='/unauthorized')
+        self.assertEqual([(10, 10)], keystone_timeouts)
+    # end test_deadline_bounds_reauthentication
+
+    def test_no_reauthentication_past_deadline(self):
+        keystone_timeouts = []
+        self._register_keystone(keystone_timeouts)
+
+        def _unauthorized(request, url, headers):
+            self.now[0] += 20
+            return (401, headers, '""')
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/unauthorized',
+            body=_unauthorized)
+
+        with ExpectedException(TimeOutError):
+            with self._vnc_lib.request_context(timeout=10):
+                self._vnc_lib._request_server(OP_GET, url='/unauthorized')
+        self.assertEqual([], keystone_timeouts)
+    # end test_no_reauthentication_past_deadline
+
+    def test_keystone_timeout(self):
+        def _post(url, **kwargs):
+            raise ReadTimeout
+        self._vnc_lib._ks_session.post = _post
+
+        with ExpectedException(TimeOutError):
+            self._vnc_lib._fetch_auth_token()
+    # end test_keystone_timeout
+# end class TestVncApiDeadline
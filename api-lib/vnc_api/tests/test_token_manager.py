@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+
+import fixtures
+import httpretty
+from flexmock import flexmock
+from testtools import TestCase
+
+import test_common
+from vnc_api import token_manager
+from vnc_api import vnc_api
+from vnc_api.token_manager import TokenManager, parse_token_expiry
+
+
+class TestTokenManager(TestCase):
+    def setUp(self):
+        super(TestTokenManager, self).setUp()
+        self.fetched = []
+    # end setUp
+
+    def _fetch_token(self, expires_at=None, delay=0):
+        def _fetch():
+            time.sleep(delay)
+            self.fetched.append('token-%d' % len(self.fetched))
+            return self.fetched[-1], expires_at
+        return _fetch
+    # end _fetch_token
+
+    def test_parse_token_expiry(self):
+        self.assertEqual(1493823107,
+                         parse_token_expiry('2017-05-03T14:51:47Z'))
+        self.assertEqual(1493823107,
+                         parse_token_expiry('2017-05-03T14:51:47.000000Z'))
+        self.assertEqual(1493823107,
+                         parse_token_expiry('2017-05-03T14:51:47+00:00'))
+        self.assertIsNone(parse_token_expiry('tomorrow'))
+        self.assertIsNone(parse_token_expiry(None))
+    # end test_parse_token_expiry
+
+    def test_refresh_ahead_of_expiry(self):
+        now = [1000.0]
+        flexmock(token_manager.time).should_receive('time').replace_with(
+            lambda: now[0])
+        manager = TokenManager(self._fetch_token(expires_at=2000),
+                               refresh_margin=60)
+        self.assertEqual('token-0', manager.get_token())
+        now[0] = 1900
+        self.assertEqual('token-0', manager.get_token())
+        now[0] = 1950
+        self.assertEqual('token-1', manager.get_token())
+    # end test_refresh_ahead_of_expiry
+
+    def test_single_flight_refresh(self):
+        manager = TokenManager(self._fetch_token(delay=0.05))
+        manager.set_token('rejected')
+        tokens = []
+
+        def _renew():
+            tokens.append(manager.get_token(rejected_token='rejected'))
+
+        threads = [threading.Thread(target=_renew) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(['token-0'], self.fetched)
+        self.assertEqual(['token-0'] * 5, tokens)
+    # end test_single_flight_refresh
+
+    def test_token_shared_between_processes(self):
+        cache_file = '%s/tokens' % self.useFixture(fixtures.TempDir()).path
+        first = TokenManager(self._fetch_token(), cache_file=cache_file,
+                             cache_key='admin')
+        self.assertEqual('token-0', first.get_token())
+
+        second = TokenManager(self._fetch_token(), cache_file=cache_file,
+                              cache_key='admin')
+        self.assertEqual('token-0', second.get_token())
+        self.assertEqual('token-1', second.get_token(
+            rejected_token='token-0'))
+        # the renewal made by the second one is reused by the first one
+        self.assertEqual('token-1', first.get_token(
+            rejected_token='token-0'))
+        self.assertEqual(['token-0', 'token-1'], self.fetched)
+
+        other = TokenManager(self._fetch_token(), cache_file=cache_file,
+                             cache_key='other-user')
+        self.assertFalse(other.has_token())
+    # end test_token_shared_between_processes
+# end class TestTokenManager
+
+
+class TestVncApiTokenManager(test_common.TestCase):
+    def test_get_auth_token_reuses_token(self):
+        posts = []
+
+        def _keystone(request, url, headers):
+            posts.append(url)
+            return (200, headers, json.dumps({'access': {'token': {
+                'id': 'token-%d' % len(posts),
+                'expires': '2100-01-01T00:00:00Z'}}}))
+
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:35357/v2.0/tokens',
+            body=_keystone)
+
+        self.assertEqual('token-1', self._vnc_lib.get_auth_token())
+        self.assertEqual('token-1', self._vnc_lib.get_auth_token())
+        self.assertEqual(1, len(posts))
+        self.assertEqual('token-1', self._vnc_lib._headers['X-AUTH-TOKEN'])
+    # end test_get_auth_token_reuses_token
+
+    def test_cached_tokens_scoped_by_tenant_and_password(self):
+        posts = []
+
+        def _keystone(request, url, headers):
+            auth = json.loads(request.body)['auth']
+            posts.append(auth)
+            return (200, headers, json.dumps({'access': {'token': {
+                'id': 'token-%s-%d' % (auth['tenantName'], len(posts)),
+                'expires': '2100-01-01T00:00:00Z'}}}))
+
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:35357/v2.0/tokens',
+            body=_keystone)
+        cache_file = self.useFixture(fixtures.TempDir()).join('tokens')
+
+        def _vnc_lib(tenant, password='secret'):
+            return vnc_api.VncApi(
+                conf_file='/tmp/fake-config-file', username='admin',
+                password=password, tenant_name=tenant,
+                auth_token_cache_file=cache_file)
+
+        self.assertEqual('token-tenant-a-1',
+                         _vnc_lib('tenant-a').get_auth_token())
+        self.assertEqual('token-tenant-b-2',
+                         _vnc_lib('tenant-b').get_auth_token())
+        self.assertEqual('token-tenant-a-1',
+                         _vnc_lib('tenant-a').get_auth_token())
+        self.assertEqual('token-tenant-a-3',
+                         _vnc_lib('tenant-a', 'changed').get_auth_token())
+        self.assertEqual(3, len(posts))
+        with open(cache_file) as f:
+            self.assertNotIn('secret', f.read())
+    # end test_cached_tokens_scoped_by_tenant_and_password
+# end class TestVncApiTokenManager
@@ -0,0 +1,94 @@
+import json
+
+import httpretty
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import tracing
+from vnc_api.utils import OP_GET
+
+
+class TestTracer(TestCase):
+    def test_nested_spans(self):
+        exporter = tracing.InMemoryExporter()
+        tracer = tracing.Tracer(exporter)
+
+        with tracer.span('update', resource='virtual-network') as update:
+            with tracer.span('request', method='put'):
+                pass
+            with ExpectedException(ValueError):
+                with tracer.span('request', method='post'):
+                    raise ValueError
+        with tracer.span('read'):
+            pass
+
+        spans = exporter.get_spans(update.trace_id)
+        self.assertEqual(['update', 'request', 'request'],
+                         [span.name for span in spans])
+        self.assertEqual([None, update.span_id, update.span_id],
+                         [span.parent_id for span in spans])
+        self.assertEqual([None, None, 'ValueError'],
+                         [span.error for span in spans])
+        self.assertIsNone(tracer.current_span())
+        self.assertNotEqual(update.trace_id,
+                            exporter.get_spans(name='read')[0].trace_id)
+
+        lines = exporter.waterfall(update.trace_id).splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[0].endswith('  update resource=virtual-network'))
+        self.assertTrue(lines[2].endswith('    request method=post'))
+    # end test_nested_spans
+
+    def test_disabled(self):
+        tracer = tracing.Tracer()
+        with tracer.span('request') as span:
+            span.set_attribute('status', 200)
+            self.assertIsNone(span.request_id)
+            self.assertIsNone(tracer.current_span())
+        with ExpectedException(ValueError):
+            tracing.get_exporter('unknown')
+    # end test_disabled
+# end class TestTracer
+
+
+class TestVncApiTracing(test_common.TestCase):
+    def test_list_spans(self):
+        exporter = tracing.InMemoryExporter()
+        self._vnc_lib.tracer = tracing.Tracer(exporter)
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082", 'links': [
+                {'link': {'href': 'http://127.0.0.1:8082/virtual-networks',
+                          'name': 'virtual-network',
+                          'rel': 'collection'}}]}))
+        self._vnc_lib._parse_homepage(self._vnc_lib._request(OP_GET, '/'))
+        vns = [{'virtual-network': {
+            'fq_name': ['default-domain', 'default-project', 'vn%d' % i],
+            'uuid': 'vn-uuid-%d' % i}} for i in range(2)]
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-networks",
+            body=json.dumps({'virtual-networks': vns}))
+        exporter.clear()
+
+        self._vnc_lib.virtual_networks_list(detail=True)
+
+        spans = exporter.get_spans()
+        self.assertEqual(
+            ['list', 'request', 'http', 'deserialize', 'from_dict',
+             'from_dict'], [span.name for span in spans])
+        [list_span, request_span, http_span] = spans[:3]
+        self.assertEqual({'resource': 'virtual-network'},
+                         list_span.attributes)
+        self.assertEqual(request_span.span_id, http_span.parent_id)
+        self.assertEqual(200, http_span.attributes['status'])
+        self.assertEqual(request_span.request_id,
+                         httpretty.last_request().headers['X-Request-Id'])
+
+        # given request IDs are kept
+        with self._vnc_lib.request_context(headers={'X-Request-Id': 'id'}):
+            self._vnc_lib.virtual_networks_list()
+        self.assertEqual('id',
+                         httpretty.last_request().headers['X-Request-Id'])
+    # end test_list_spans
+# end class TestVncApiTracing
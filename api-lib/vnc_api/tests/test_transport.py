@@ -0,0 +1,228 @@
+import BaseHTTPServer
+import json
+import SocketServer
+import threading
+import zlib
+
+import fixtures
+import httpretty
+import requests
+from flexmock import flexmock
+from requests.exceptions import ConnectionError, ReadTimeout
+from testtools import ExpectedException
+from testtools import TestCase
+
+import test_common
+from vnc_api import transport
+from vnc_api import vnc_api
+from vnc_api.utils import OP_GET, OP_POST
+
+
+class TestTransports(TestCase):
+    def test_requests_session_verify(self):
+        calls = []
+        flexmock(requests.Session).should_receive('request').replace_with(
+            lambda method, url, **kwargs: calls.append(kwargs))
+
+        transport.RequestsTransport(1, 1, verify='/ca.pem').new_session().get(
+            'http://10.0.0.1/')
+        transport.RequestsTransport(1, 1, verify=False).new_session().get(
+            'http://10.0.0.1/', verify=True)
+        transport.RequestsTransport(1, 1).new_session().get(
+            'http://10.0.0.1/')
+
+        self.assertEqual(['/ca.pem', True, None],
+                         [kwargs.get('verify') for kwargs in calls])
+    # end test_requests_session_verify
+
+    def test_urllib3_errors(self):
+        session = transport.Urllib3Transport(1, 1).new_session()
+        with ExpectedException(ConnectionError):
+            session.get('http://127.0.0.1:1/', timeout=(1, 1))
+
+        flexmock(session._pool_manager).should_receive('urlopen').and_raise(
+            transport.urllib3.exceptions.ReadTimeoutError(None, '/', 'slow'))
+        with ExpectedException(ReadTimeout):
+            session.get('http://127.0.0.1:8082/')
+    # end test_urllib3_errors
+# end class TestTransports
+
+
+class TestUrllib3Transport(test_common.TestCase):
+    def setUp(self):
+        super(TestUrllib3Transport, self).setUp()
+        self._vnc_lib = vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                                       transport='urllib3')
+    # end setUp
+
+    def test_requests(self):
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/foo',
+            body=json.dumps({'foo': 'bar'}))
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:8082/foo',
+            body=lambda request, url, headers: (
+                200, headers, request.body + request.querystring.get(
+                    'detail', [''])[0]))
+
+        self.assertEqual({'foo': 'bar'}, self._vnc_lib._request_server(
+            OP_GET, '/foo', data={'detail': True}))
+        self.assertEqual(
+            'detail=True', httpretty.last_request().path.split('?')[1])
+        content = self._vnc_lib._request_server(OP_POST, '/foo', data='{}')
+        # response handed over undecoded
+        self.assertIsInstance(content, bytes)
+        self.assertEqual('{}', content)
+    # end test_requests
+
+    def test_query_params(self):
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/foo',
+            body=json.dumps({'foo': 'bar'}))
+        self._vnc_lib._request_server(OP_GET, '/foo', data='uuid=vn-uuid')
+        self.assertEqual('/foo?uuid=vn-uuid', httpretty.last_request().path)
+        self._vnc_lib._request_server(OP_GET, '/foo',
+                                      data={u'fq_name': u'caf\xe9'})
+        self.assertEqual('/foo?fq_name=caf%C3%A9',
+                         httpretty.last_request().path)
+    # end test_query_params
+
+    def test_compression(self):
+        body = json.dumps({'foo': ['bar'] * 1000})
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compressed = compressor.compress(body) + compressor.flush()
+        httpretty.register_uri(
+            httpretty.GET, 'http://127.0.0.1:8082/foo', body=compressed,
+            adding_headers={'Content-Encoding': 'gzip'})
+        received = []
+        httpretty.register_uri(
+            httpretty.POST, 'http://127.0.0.1:8082/foo',
+            body=lambda request, url, headers: (
+                received.append(request) or (200, headers, '{}')))
+
+        before = self._vnc_lib.transfer_stats()
+        self.assertEqual(json.loads(body),
+                         self._vnc_lib._request_server(OP_GET, '/foo'))
+        self.assertEqual('gzip, deflate',
+                         httpretty.last_request().headers['Accept-Encoding'])
+        self.assertEqual({'request_bytes': 0, 'request_wire_bytes': 0,
+                          'response_bytes': len(body),
+                          'response_wire_bytes': len(compressed)},
+                         self._vnc_lib.last_transfer_stats())
+
+        self._vnc_lib._request_compression_threshold = 1024
+        self._vnc_lib._request_server(OP_POST, '/foo', data='{}')
+        self.assertNotIn('Content-Encoding', received[0].headers)
+        self._vnc_lib._request_server(OP_POST, '/foo', data=body)
+        self.assertEqual('gzip', received[1].headers['Content-Encoding'])
+        self.assertEqual(body, zlib.decompress(received[1].body,
+                                               16 + zlib.MAX_WBITS))
+        last = self._vnc_lib.last_transfer_stats()
+        self.assertEqual(len(body), last['request_bytes'])
+        self.assertTrue(last['request_wire_bytes'] < len(body))
+
+        stats = self._vnc_lib.transfer_stats()
+        self.assertEqual(3, stats['requests'] - before['requests'])
+        self.assertEqual(len(body) + 2,
+                         stats['request_bytes'] - before['request_bytes'])
+    # end test_compression
+
+    def test_unknown_transport(self):
+        with ExpectedException(ValueError):
+            vnc_api.VncApi(conf_file='/tmp/fake-config-file',
+                           transport='foo')
+    # end test_unknown_transport
+# end class TestUrllib3Transport
+
+
+class _UnixHTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = []
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.connections.append(self.connection)
+
+    def address_string(self):
+        return 'unix'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/':
+            body = json.dumps({'href': 'http://127.0.0.1:8082',
+                               'links': []})
+        else:
+            body = json.dumps({'path': self.path})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+# end class _UnixHTTPRequestHandler
+
+
+class _UnixHTTPServer(SocketServer.ThreadingMixIn,
+                      SocketServer.UnixStreamServer):
+    daemon_threads = True
+# end class _UnixHTTPServer
+
+
+class TestUnixSocketTransport(TestCase):
+    def setUp(self):
+        super(TestUnixSocketTransport, self).setUp()
+        self.socket_path = '%s/api.sock' % self.useFixture(
+            fixtures.TempDir()).path
+        _UnixHTTPRequestHandler.connections = []
+        server = _UnixHTTPServer(self.socket_path, _UnixHTTPRequestHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+    # end setUp
+
+    def test_requests_over_unix_socket(self):
+        vnc_lib = vnc_api.VncApi(auth_type='noauth',
+                                 conf_file='/tmp/fake-config-file',
+                                 api_server_unix_socket=self.socket_path)
+        for _ in range(3):
+            self.assertEqual(
+                {'path': '/foo?detail=True'},
+                vnc_lib._request_server(OP_GET, '/foo',
+                                        data={'detail': True}))
+        # connection kept alive
+        self.assertEqual(1, len(_UnixHTTPRequestHandler.connections))
+    # end test_requests_over_unix_socket
+
+    def test_streamed_response_closed(self):
+        session = transport.UnixSocketTransport(
+            1, 1, socket_path=self.socket_path).new_session()
+        session.get('http://127.0.0.1:8082/foo', stream=True).close()
+        self.assertEqual({'path': '/bar'}, json.loads(
+            session.get('http://127.0.0.1:8082/bar').content))
+        # the connection of the unread body was not reused
+        self.assertEqual(2, len(_UnixHTTPRequestHandler.connections))
+    # end test_streamed_response_closed
+
+    def test_query_params(self):
+        session = transport.UnixSocketTransport(
+            1, 1, socket_path=self.socket_path).new_session()
+        for params, query in (('uuid=vn-uuid', 'uuid=vn-uuid'),
+                              ({u'fq_name': [u'caf\xe9', 'vn']},
+                               'fq_name=caf%C3%A9&fq_name=vn')):
+            self.assertEqual({'path': '/foo?%s' % query}, json.loads(
+                session.get('http://127.0.0.1:8082/foo',
+                            params=params).content))
+    # end test_query_params
+
+    def test_socket_unavailable(self):
+        session = transport.UnixSocketTransport(
+            1, 1, socket_path='%s-missing' % self.socket_path).new_session()
+        with ExpectedException(ConnectionError):
+            session.get('http://127.0.0.1:8082/')
+        with ExpectedException(ValueError):
+            transport.UnixSocketTransport(1, 1)
+    # end test_socket_unavailable
+# end class TestUnixSocketTransport
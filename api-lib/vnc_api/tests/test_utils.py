@@ -0,0 +1,52 @@
+import json
+
+from flexmock import flexmock
+from testtools import TestCase
+
+from vnc_api import utils
+from vnc_api.utils import iter_json_array
+
+
+class TestIterJsonArray(TestCase):
+    def _chunks(self, document, size):
+        return (document[i:i + size] for i in range(0, len(document), size))
+
+    def test_elements_across_chunks(self):
+        elements = [{'uuid': 'uuid-%d' % i, 'value': i * 1000,
+                     'nested': {'list': [1, 2, {'a': '[],{}'}]}}
+                    for i in range(20)]
+        document = json.dumps({'count': 20, 'virtual-networks': elements,
+                               'other': [0]})
+        for size in (1, 7, 64, len(document)):
+            self.assertEqual(elements, list(iter_json_array(
+                self._chunks(document, size), 'virtual-networks')))
+
+    def test_strings_across_chunks(self):
+        elements = ['a"]\\', {'b': 'x\\"}]{['}, ['\\'], 'end', True, None]
+        document = json.dumps({'results': elements})
+        for size in (1, 2, 3, len(document)):
+            self.assertEqual(elements, list(iter_json_array(
+                self._chunks(document, size), 'results')))
+
+    def test_elements_decoded_once(self):
+        element = {'values': range(1000)}
+        decoder = flexmock(utils.json.JSONDecoder)
+        decoder.should_call('raw_decode').once()
+        self.assertEqual([element], list(iter_json_array(
+            self._chunks(json.dumps({'results': [element]}), 10),
+            'results')))
+
+    def test_numbers_split_between_chunks(self):
+        self.assertEqual([12345, 6789], list(iter_json_array(
+            ['{"results": [123', '45, 6', '789]}'], 'results')))
+
+    def test_empty_array(self):
+        self.assertEqual([], list(iter_json_array(['{"results" : [ ]}'],
+                                                  'results')))
+
+    def test_truncated_document(self):
+        self.assertRaises(ValueError, list, iter_json_array(
+            ['{"results": [{"a": 1}, {"b"'], 'results'))
+        self.assertRaises(ValueError, list, iter_json_array(
+            ['{"foo": []}'], 'results'))
+# end class TestIterJsonArray
@@ -4,6 +4,7 @@ import json
 import httpretty
 from urlparse import urlparse
 from requests.exceptions import ConnectionError
+from flexmock import flexmock
 
 from testtools.matchers import Contains
 from testtools import ExpectedException
@@ -74,6 +75,47 @@ class TestVncApi(test_common.TestCase):
             self._vnc_lib._http_get = orig_http_get
     # end test_contrail_useragent_header
 
+    def test_request_context_headers(self):
+        sent_headers = []
+
+        def _record_headers(uri, headers=None, query_params=None):
+            sent_headers.append(headers)
+            return (200, json.dumps({}))
+
+        orig_headers = self._vnc_lib._headers.copy()
+        orig_http_get = self._vnc_lib._http_get
+        try:
+            self._vnc_lib._http_get = _record_headers
+            with self._vnc_lib.request_context(token='user-token',
+                                               roles=['member']):
+                with self._vnc_lib.request_context(tenant='demo'):
+                    self._vnc_lib._request_server(OP_GET, url='/')
+            self._vnc_lib._request_server(
+                OP_GET, url='/', headers={'X-AUTH-TOKEN': 'call-token'})
+            self._vnc_lib._request_server(OP_GET, url='/')
+        finally:
+            self._vnc_lib._http_get = orig_http_get
+
+        self.assertEqual('user-token', sent_headers[0]['X-AUTH-TOKEN'])
+        self.assertEqual('member', sent_headers[0]['X-API-ROLE'])
+        self.assertEqual('demo', sent_headers[0]['X-Tenant-Name'])
+        self.assertEqual('call-token', sent_headers[1]['X-AUTH-TOKEN'])
+        self.assertNotIn('X-AUTH-TOKEN', sent_headers[2])
+        self.assertNotIn('X-API-ROLE', sent_headers[2])
+        # client wide headers are left untouched
+        self.assertEqual(orig_headers, self._vnc_lib._headers)
+    # end test_request_context_headers
+
+    def test_user_token_not_replaced_on_401(self):
+        httpretty.register_uri(
+                httpretty.GET, 'http://127.0.0.1:8082/obj-perms',
+                responses=[httpretty.Response(status=401, body='""')])
+
+        with ExpectedException(vnc_api.AuthFailed):
+            self._vnc_lib.obj_perms('user-token')
+        self.assertNotIn('X-AUTH-TOKEN', self._vnc_lib._headers)
+    # end test_user_token_not_replaced_on_401
+
     def test_server_has_more_types_than_client(self):
         links = [
             {"link": {
@@ -223,4 +265,133 @@ class TestVncApi(test_common.TestCase):
             else:
                 self.assertFalse(hasattr(self._vnc_lib, method_name))
 
+    def test_resource_methods_defined_on_class(self):
+        self.assertNotIn('virtual_network_read', vars(self._vnc_lib))
+        self.assertEqual('virtual_network_read',
+                         self._vnc_lib.virtual_network_read.__name__)
+        flexmock(self._vnc_lib).should_receive('_object_read').with_args(
+            'virtual-network', id='vn-uuid').and_return('vn').once()
+        self.assertEqual('vn', self._vnc_lib.virtual_network_read(
+            id='vn-uuid'))
+        flexmock(self._vnc_lib).should_receive(
+            '_object_get_default_id').with_args('project').and_return(
+                'project-uuid').once()
+        self.assertEqual('project-uuid',
+                         self._vnc_lib.get_default_project_id())
+    # end test_resource_methods_defined_on_class
+
+    def _register_vn_collection(self, vns):
+        links = [
+            {'link': {'href': 'http://127.0.0.1:8082/virtual-networks',
+                      'name': 'virtual-network',
+                      'rel': 'collection'}},
+            {'link': {'href': 'http://127.0.0.1:8082/id-to-fqname',
+                      'name': 'id-to-name',
+                      'rel': 'action'}},
+        ]
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/",
+            body=json.dumps({'href': "http://127.0.0.1:8082",
+                             'links': links}))
+        self._vnc_lib._parse_homepage(
+            self._vnc_lib._request(OP_GET, '/'))
+        list_requests = []
+
+        def _list_vns(request, url, headers):
+            list_requests.append(request.querystring)
+            if 'obj_uuids' not in request.querystring and \
+                    'fq_names' not in request.querystring:
+                match = vns
+            elif 'fq_names' in request.querystring:
+                fq_names = request.querystring['fq_names'][0].split(',')
+                match = [vn for vn in vns
+                         if ':'.join(vn['fq_name']) in fq_names]
+            else:
+                uuids = request.querystring['obj_uuids'][0].split(',')
+                match = [vn for vn in vns if vn['uuid'] in uuids]
+            if request.querystring['detail'] == ['True']:
+                match = [{'virtual-network': vn} for vn in match]
+            return (200, headers, json.dumps({'virtual-networks': match}))
+
+        httpretty.register_uri(
+            httpretty.GET, "http://127.0.0.1:8082/virtual-networks",
+            body=_list_vns)
+        return list_requests
+    # end _register_vn_collection
+
+    def test_bulk_name_resolution(self):
+        vns = [{'fq_name': ['default-domain', 'default-project', 'vn%d' % i],
+                'uuid': 'vn-uuid-%d' % i} for i in range(3)]
+        list_requests = self._register_vn_collection(vns)
+        unknown = ['default-domain', 'default-project', 'unknown']
+        fq_names = [vn['fq_name'] for vn in vns] + [unknown]
+
+        uuids = self._vnc_lib.fq_names_to_ids('virtual-network', fq_names,
+                                              chunk_size=2)
+        self.assertEqual(['vn-uuid-0', 'vn-uuid-1', 'vn-uuid-2', None],
+                         uuids)
+        self.assertEqual(2, len(list_requests))
+
+        resolved_fq_names = self._vnc_lib.ids_to_fq_names(
+            ['vn-uuid-2', 'unknown', 'vn-uuid-0'], obj_type='virtual_network')
+        self.assertEqual([vns[2]['fq_name'], None, vns[0]['fq_name']],
+                         resolved_fq_names)
+        self.assertEqual(3, len(list_requests))
+    # end test_bulk_name_resolution
+
+    def test_untyped_bulk_name_resolution(self):
+        vns = [{'fq_name': ['default-domain', 'default-project', 'vn%d' % i],
+                'uuid': 'vn-uuid-%d' % i} for i in range(10)]
+        list_requests = self._register_vn_collection(vns)
+        id_to_name_requests = []
+
+        def _id_to_name(request, url, headers):
+            uuid = json.loads(request.body)['uuid']
+            id_to_name_requests.append(uuid)
+            for vn in vns:
+                if vn['uuid'] == uuid:
+                    return (200, headers, json.dumps({
+                        'fq_name': vn['fq_name'], 'type': 'virtual-network'}))
+            return (404, headers, '""')
+        httpretty.register_uri(
+            httpretty.POST, "http://127.0.0.1:8082/id-to-fqname",
+            body=_id_to_name)
+
+        uuids = [vn['uuid'] for vn in vns] + ['unknown']
+        self.assertEqual([vn['fq_name'] for vn in vns] + [None],
+                         self._vnc_lib.ids_to_fq_names(uuids, chunk_size=5))
+        # the type is found with the first uuid, the other ones are listed
+        self.assertEqual(['vn-uuid-0', 'unknown'], id_to_name_requests)
+        self.assertEqual(2, len(list_requests))
+    # end test_untyped_bulk_name_resolution
+
+    def test_iter_resources(self):
+        vns = [{'fq_name': ['default-domain', 'default-project', 'vn%d' % i],
+                'uuid': 'vn-uuid-%d' % i} for i in range(5)]
+        list_requests = self._register_vn_collection(vns)
+
+        vn_iter = self._vnc_lib.iter_resources('virtual_network',
+                                               chunk_size=2)
+        # nothing requested before iterating
+        self.assertEqual(0, len(list_requests))
+        self.assertEqual([vn['uuid'] for vn in vns],
+                         [vn.uuid for vn in vn_iter])
+        # one listing of uuids and three chunks of details
+        self.assertEqual(4, len(list_requests))
+    # end test_iter_resources
+
+    def test_resource_list_stream(self):
+        vns = [{'fq_name': ['default-domain', 'default-project', 'vn%d' % i],
+                'uuid': 'vn-uuid-%d' % i} for i in range(3)]
+        self._register_vn_collection(vns)
+
+        vn_refs = self._vnc_lib.resource_list('virtual-network', stream=True)
+        self.assertEqual(vns, list(vn_refs))
+        vn_objs = self._vnc_lib.resource_list(
+            'virtual-network', obj_uuids=['vn-uuid-0', 'vn-uuid-2'],
+            detail=True, stream=True)
+        self.assertEqual(['vn-uuid-0', 'vn-uuid-2'],
+                         [vn.uuid for vn in vn_objs])
+    # end test_resource_list_stream
+
 # end class TestVncApi
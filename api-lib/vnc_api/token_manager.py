@@ -0,0 +1,189 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Life cycle of the keystone token used by the VNC API client
+import calendar
+import errno
+import fcntl
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+
+def parse_token_expiry(value):
+    """Return the epoch time of a keystone ISO 8601 expiry date, ie.
+    '2017-05-03T14:51:47Z' (v2) or '2017-05-03T14:51:47.000000Z' (v3), or
+    None if it can not be parsed.
+    """
+    if not value:
+        return None
+    value = value.rstrip('Z')
+    # drop the UTC offset keystone may add, tokens are always issued in UTC
+    for sep in ('+', '-'):
+        if len(value) > 19 and sep in value[19:]:
+            value = value[:19 + value[19:].index(sep)]
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return calendar.timegm(datetime.strptime(value, fmt).timetuple())
+        except ValueError:
+            continue
+    return None
+# end parse_token_expiry
+
+
+class TokenManager(object):
+    """Keep a valid authentication token, refreshing it ahead of its expiry.
+
+    Tokens are obtained with fetch_token(), a callable returning a
+    (token, expires_at) tuple, expires_at being an epoch time or None if
+    unknown. Concurrent refreshes are collapsed into a single fetch: threads
+    asking for a token while it is refreshed wait for and reuse the new one.
+
+    With a cache_file, tokens are shared between processes using the same
+    credentials (identified by cache_key): the file is locked while a token
+    is fetched and a token refreshed by another process is reused.
+
+    :param fetch_token: callable returning a new (token, expires_at)
+    :param refresh_margin: seconds before expiry at which a token is renewed
+    :param cache_file: optional path of the token cache shared between
+        processes
+    :param cache_key: identity of the credentials in the cache file
+    """
+
+    def __init__(self, fetch_token, refresh_margin=60, cache_file=None,
+                 cache_key=None):
+        self._fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.cache_file = cache_file
+        self.cache_key = cache_key
+        self.token = None
+        self.expires_at = None
+        self.fetches = 0
+        self._lock = threading.Lock()
+        if self.cache_file:
+            self._adopt(self._read_cache(), time.time())
+    # end __init__
+
+    def _usable(self, token, expires_at, now, rejected_token=None):
+        return (token is not None and token != rejected_token and
+                (expires_at is None or
+                 now < expires_at - self.refresh_margin))
+    # end _usable
+
+    def _adopt(self, entry, now, seen_token=None, rejected_token=None):
+        """Take over a cached token if it is usable and newer than the one
+        the caller saw, return True if it was.
+        """
+        if not entry:
+            return False
+        token, expires_at = entry
+        if (token == seen_token or
+                not self._usable(token, expires_at, now, rejected_token)):
+            return False
+        self.token, self.expires_at = token, expires_at
+        return True
+    # end _adopt
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file) as cache_file:
+                entry = json.load(cache_file).get(self.cache_key)
+        except (IOError, OSError, ValueError, AttributeError):
+            return None
+        if not entry:
+            return None
+        return entry.get('token'), entry.get('expires_at')
+    # end _read_cache
+
+    def _write_cache(self):
+        try:
+            with open(self.cache_file) as cache_file:
+                entries = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            entries = {}
+        entries[self.cache_key] = {'token': self.token,
+                                   'expires_at': self.expires_at}
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+        try:
+            # written aside and renamed so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(entries, tmp_file)
+            os.rename(tmp_path, self.cache_file)
+        except (IOError, OSError) as e:
+            logger = logging.getLogger(__name__)
+            logger.warn("Unable to write token cache %s: %s",
+                        self.cache_file, str(e))
+    # end _write_cache
+
+    def _fetch(self):
+        token, expires_at = self._fetch_token()
+        self.fetches += 1
+        self.token, self.expires_at = token, expires_at
+    # end _fetch
+
+    def _fetch_shared(self, now, seen_token, rejected_token):
+        lock_path = '%s.lock' % self.cache_file
+        try:
+            lock_file = open(lock_path, 'a')
+        except (IOError, OSError) as e:
+            if e.errno not in (errno.EACCES, errno.ENOENT, errno.EROFS):
+                raise
+            self._fetch()
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # another process may have refreshed while we waited
+                if self._adopt(self._read_cache(), now, seen_token,
+                               rejected_token):
+                    return
+                self._fetch()
+                self._write_cache()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    # end _fetch_shared
+
+    def set_token(self, token, expires_at=None):
+        with self._lock:
+            self.token, self.expires_at = token, expires_at
+    # end set_token
+
+    def has_token(self):
+        return self.token is not None
+    # end has_token
+
+    def get_token(self, refresh=False, rejected_token=None):
+        """Return a valid token, fetching a new one if there is none yet,
+        if it expires soon, if refresh is set or if the current token is the
+        rejected_token (ie. the server answered 401 to it). A refresh done
+        by another thread or process in the meantime is reused.
+        """
+        token, expires_at = self.token, self.expires_at
+        now = time.time()
+        if not refresh and self._usable(token, expires_at, now,
+                                        rejected_token):
+            return token
+
+        with self._lock:
+            now = time.time()
+            if (self.token != token and
+                    self._usable(self.token, self.expires_at, now,
+                                 rejected_token)):
+                # refreshed by another thread while we waited for the lock
+                return self.token
+            if not self.cache_file:
+                self._fetch()
+            elif refresh or not self._adopt(self._read_cache(), now,
+                                            token, rejected_token):
+                self._fetch_shared(now, token, rejected_token)
+            return self.token
+    # end get_token
+# end class TokenManager
@@ -0,0 +1,227 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# Request tracing of the VNC API client
+import logging
+import threading
+import time
+import uuid
+
+
+class Span(object):
+    """Timed step of a traced operation, nested in the span active in the
+    thread when it started. Spans are context managers, the span is
+    exported when the context exits.
+    """
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_time = None
+        self.end_time = None
+        self.error = None
+    # end __init__
+
+    @property
+    def duration(self):
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+    # end duration
+
+    @property
+    def request_id(self):
+        """Correlation ID sent as X-Request-Id header."""
+        return '%s-%s' % (self.trace_id, self.span_id)
+    # end request_id
+
+    def set_attribute(self, name, value):
+        self.attributes[name] = value
+    # end set_attribute
+
+    def __enter__(self):
+        self.tracer._push(self)
+        self.start_time = time.time()
+        return self
+    # end __enter__
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.end_time = time.time()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer._pop(self)
+        return False
+    # end __exit__
+
+    def __repr__(self):
+        return '<Span %s %s/%s>' % (self.name, self.trace_id, self.span_id)
+    # end __repr__
+# end class Span
+
+
+class _NoopSpan(object):
+    """Span of a disabled tracer, shared and doing nothing."""
+    request_id = None
+
+    def set_attribute(self, name, value):
+        pass
+    # end set_attribute
+
+    def __enter__(self):
+        return self
+    # end __enter__
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+    # end __exit__
+# end class _NoopSpan
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer(object):
+    """Create the spans of the operations of a thread and hand them over
+    to an exporter once finished. Without exporter tracing is disabled and
+    spans are no-ops.
+
+        with tracer.span('virtual-network.update', uuid=vn_uuid):
+            ...
+
+    :param exporter: object with an export(span) method, called with each
+        finished span
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self._local = threading.local()
+    # end __init__
+
+    @property
+    def enabled(self):
+        return self.exporter is not None
+    # end enabled
+
+    def span(self, name, **attributes):
+        if self.exporter is None:
+            return _NOOP_SPAN
+        return Span(self, name, self.current_span(), attributes)
+    # end span
+
+    def current_span(self):
+        """Return the innermost span active in the thread, None if none."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+    # end current_span
+
+    def _push(self, span):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+    # end _push
+
+    def _pop(self, span):
+        stack = self._local.stack
+        # spans of generators may exit out of order
+        if span in stack:
+            stack.remove(span)
+        self.exporter.export(span)
+    # end _pop
+# end class Tracer
+
+
+class InMemoryExporter(object):
+    """Keep the finished spans, for tests and interactive analysis."""
+    name = 'memory'
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+    # end __init__
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+    # end export
+
+    def clear(self):
+        with self._lock:
+            del self.spans[:]
+    # end clear
+
+    def get_spans(self, trace_id=None, name=None):
+        """Return the finished spans, of a trace or with a name if given,
+        by start time.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        return sorted([span for span in spans
+                       if (trace_id is None or span.trace_id == trace_id) and
+                       (name is None or span.name == name)],
+                      key=lambda span: span.start_time)
+    # end get_spans
+
+    def waterfall(self, trace_id=None):
+        """Return the spans of a trace, by default of the last finished
+        one, as text lines of their start offset and duration in
+        milliseconds, indented by nesting level.
+        """
+        if trace_id is None:
+            if not self.spans:
+                return ''
+            trace_id = self.spans[-1].trace_id
+        return format_waterfall(self.get_spans(trace_id))
+    # end waterfall
+# end class InMemoryExporter
+
+
+class LoggingExporter(object):
+    """Log each finished span at debug level."""
+    name = 'log'
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+    # end __init__
+
+    def export(self, span):
+        self.logger.debug(
+            'span %s trace %s id %s parent %s duration %.3fms%s %s',
+            span.name, span.trace_id, span.span_id, span.parent_id,
+            span.duration * 1000,
+            ' error %s' % span.error if span.error else '', span.attributes)
+    # end export
+# end class LoggingExporter
+
+
+EXPORTERS = dict((exporter.name, exporter)
+                 for exporter in (InMemoryExporter, LoggingExporter))
+
+
+def get_exporter(name):
+    """Return an instance of the named exporter."""
+    if name not in EXPORTERS:
+        raise ValueError("Unknown tracing exporter '%s'" % name)
+    return EXPORTERS[name]()
+# end get_exporter
+
+
+def format_waterfall(spans):
+    if not spans:
+        return ''
+    origin = min(span.start_time for span in spans)
+    depths = {}
+    lines = []
+    for span in sorted(spans, key=lambda span: span.start_time):
+        depth = depths[span.span_id] = depths.get(span.parent_id, -1) + 1
+        lines.append('%9.3f %9.3f  %s%s%s' % (
+            (span.start_time - origin) * 1000, span.duration * 1000,
+            '  ' * depth, span.name,
+            ''.join(' %s=%s' % item for item in sorted(
+                span.attributes.items()))))
+    return '\n'.join(lines)
+# end format_waterfall
@@ -0,0 +1,312 @@
+#
+# Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
+#
+# HTTP transports of the VNC API client
+import socket
+import ssl
+from urlparse import urlparse
+
+import requests
+from requests.models import RequestEncodingMixin
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+try:
+    # See ssl_adapter, python-requests may use the site installed urllib3
+    from requests.packages import urllib3
+except ImportError:
+    import urllib3
+
+import ssl_adapter
+
+
+class RequestsSession(requests.Session):
+    """requests session applying the certificate verification setting of
+    the transport to all its requests.
+    """
+
+    def __init__(self, verify=True):
+        super(RequestsSession, self).__init__()
+        self._verify = verify
+    # end __init__
+
+    def request(self, method, url, **kwargs):
+        if self._verify is not True:
+            kwargs.setdefault('verify', self._verify)
+        return super(RequestsSession, self).request(method, url, **kwargs)
+    # end request
+
+    def pool_stats(self):
+        return connection_pools_stats(
+            pool for adapter in self.adapters.values()
+            for pool in _manager_pools(adapter.poolmanager))
+    # end pool_stats
+# end class RequestsSession
+
+
+class RequestsTransport(object):
+    """Default transport, based on python-requests sessions.
+
+    A transport creates the per API server host sessions used by
+    ApiServerSession. A session provides request(method, url, headers=,
+    params=, data=, stream=, timeout=) returning a response with
+    status_code, headers, text, content and iter_content(), and raises the
+    requests ConnectionError, ConnectTimeout and ReadTimeout exceptions.
+    Sessions may also provide pool_stats(), see connection_pools_stats.
+
+    :param max_conns_per_pool: number of connection pools of a session
+    :param max_pools: number of connections kept per pool
+    :param verify: False to skip the API server certificate verification,
+        or path of the CA bundle to verify it with
+    """
+    name = 'requests'
+
+    def __init__(self, max_conns_per_pool, max_pools, verify=True):
+        self.max_conns_per_pool = max_conns_per_pool
+        self.max_pools = max_pools
+        self.verify = verify
+    # end __init__
+
+    def new_session(self):
+        session = RequestsSession(self.verify)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.max_conns_per_pool,
+            pool_maxsize=self.max_pools)
+        ssladapter = ssl_adapter.SSLAdapter(ssl.PROTOCOL_SSLv23)
+        ssladapter.init_poolmanager(
+            connections=self.max_conns_per_pool,
+            maxsize=self.max_pools)
+        session.mount("http://", adapter)
+        session.mount("https://", ssladapter)
+        return session
+    # end new_session
+# end class RequestsTransport
+
+
+class Urllib3Response(object):
+    """Minimal requests like view of a urllib3 response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.raw = response
+        self.status_code = response.status
+        self.headers = response.headers
+    # end __init__
+
+    @property
+    def content(self):
+        return self._response.data
+    # end content
+
+    @property
+    def text(self):
+        return self._response.data.decode('utf-8', 'replace')
+    # end text
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self._response.stream(chunk_size, decode_content=True):
+            yield chunk
+        self._response.release_conn()
+    # end iter_content
+
+    def close(self):
+        # the connection of a body not read till the end is not reusable
+        self._response.close()
+        self._response.release_conn()
+    # end close
+# end class Urllib3Response
+
+
+class Urllib3Session(object):
+    """Session sending requests straight to a urllib3 pool manager,
+    skipping the requests layers (hooks, cookies, redirects, environment
+    settings and response encoding detection).
+    """
+
+    def __init__(self, max_conns_per_pool, max_pools, verify=True):
+        pool_kwargs = {'ssl_version': ssl.PROTOCOL_SSLv23}
+        if verify is False:
+            pool_kwargs['cert_reqs'] = 'CERT_NONE'
+        elif verify is not True:
+            pool_kwargs['cert_reqs'] = 'CERT_REQUIRED'
+            pool_kwargs['ca_certs'] = verify
+        self._pool_manager = urllib3.PoolManager(
+            num_pools=max_conns_per_pool, maxsize=max_pools, **pool_kwargs)
+    # end __init__
+
+    def request(self, method, url, headers=None, params=None, data=None,
+                stream=False, timeout=None):
+        if params:
+            # encoded as requests does: strings as they are, unicode keys
+            # and values in UTF-8
+            query = RequestEncodingMixin._encode_params(params)
+            url = '%s?%s' % (url, query)
+        if isinstance(timeout, tuple):
+            timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        elif timeout is None:
+            timeout = urllib3.Timeout(connect=None, read=None)
+        try:
+            response = self._urlopen(
+                method.upper(), url, body=data, headers=headers,
+                retries=False, redirect=False, timeout=timeout,
+                preload_content=not stream)
+        except urllib3.exceptions.NewConnectionError as e:
+            raise ConnectionError(e)
+        except urllib3.exceptions.ConnectTimeoutError as e:
+            raise ConnectTimeout(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise ReadTimeout(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise ConnectionError(e)
+        return Urllib3Response(response)
+    # end request
+
+    def _urlopen(self, method, url, **kwargs):
+        return self._pool_manager.urlopen(method, url, **kwargs)
+    # end _urlopen
+
+    def get(self, url, **kwargs):
+        return self.request('get', url, **kwargs)
+    # end get
+
+    def post(self, url, **kwargs):
+        return self.request('post', url, **kwargs)
+    # end post
+
+    def put(self, url, **kwargs):
+        return self.request('put', url, **kwargs)
+    # end put
+
+    def delete(self, url, **kwargs):
+        return self.request('delete', url, **kwargs)
+    # end delete
+
+    def close(self):
+        self._pool_manager.clear()
+    # end close
+
+    def pool_stats(self):
+        return connection_pools_stats(_manager_pools(self._pool_manager))
+    # end pool_stats
+# end class Urllib3Session
+
+
+class Urllib3Transport(RequestsTransport):
+    """Transport using urllib3 connection pools directly."""
+    name = 'urllib3'
+
+    def new_session(self):
+        return Urllib3Session(self.max_conns_per_pool, self.max_pools,
+                              self.verify)
+    # end new_session
+# end class Urllib3Transport
+
+
+class UnixHTTPConnection(urllib3.connection.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, *args, **kwargs):
+        self.socket_path = kwargs.pop('socket_path')
+        super(UnixHTTPConnection, self).__init__(*args, **kwargs)
+    # end __init__
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except socket.error:
+            sock.close()
+            raise
+        self.sock = sock
+    # end connect
+# end class UnixHTTPConnection
+
+
+class UnixHTTPConnectionPool(urllib3.HTTPConnectionPool):
+    """Pool of keep-alive HTTP connections over a Unix domain socket."""
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path, **kwargs):
+        super(UnixHTTPConnectionPool, self).__init__('localhost', **kwargs)
+        self.conn_kw['socket_path'] = socket_path
+    # end __init__
+# end class UnixHTTPConnectionPool
+
+
+class UnixSocketSession(Urllib3Session):
+    """Session sending requests to the API server listening on a Unix
+    domain socket, whatever the host of their URL.
+    """
+
+    def __init__(self, socket_path, max_pools):
+        self._pool_manager = UnixHTTPConnectionPool(socket_path,
+                                                    maxsize=max_pools)
+    # end __init__
+
+    def _urlopen(self, method, url, **kwargs):
+        parsed_url = urlparse(url)
+        path = parsed_url.path or '/'
+        if parsed_url.query:
+            path = '%s?%s' % (path, parsed_url.query)
+        return self._pool_manager.urlopen(method, path, **kwargs)
+    # end _urlopen
+
+    def close(self):
+        self._pool_manager.close()
+    # end close
+
+    def pool_stats(self):
+        return connection_pools_stats([self._pool_manager])
+    # end pool_stats
+# end class UnixSocketSession
+
+
+class UnixSocketTransport(Urllib3Transport):
+    """Transport to an API server on the same node, talking HTTP/1.1 over
+    its Unix domain socket.
+
+    :param socket_path: path of the Unix domain socket of the API server
+    """
+    name = 'unix'
+
+    def __init__(self, max_conns_per_pool, max_pools, verify=True,
+                 socket_path=None):
+        super(UnixSocketTransport, self).__init__(
+            max_conns_per_pool, max_pools, verify)
+        if not socket_path:
+            raise ValueError('The unix transport needs a socket path')
+        self.socket_path = socket_path
+    # end __init__
+
+    def new_session(self):
+        return UnixSocketSession(self.socket_path, self.max_pools)
+    # end new_session
+# end class UnixSocketTransport
+
+
+TRANSPORTS = dict((transport.name, transport)
+                  for transport in (RequestsTransport, Urllib3Transport,
+                                    UnixSocketTransport))
+
+
+def connection_pools_stats(pools):
+    """Return the number of connections opened by urllib3 connection pools
+    and the number of them idle in the pools.
+    """
+    stats = {'connections': 0, 'idle_connections': 0}
+    for pool in pools:
+        stats['connections'] += pool.num_connections
+        if pool.pool is not None:
+            stats['idle_connections'] += len(
+                [conn for conn in list(pool.pool.queue) if conn is not None])
+    return stats
+# end connection_pools_stats
+
+
+def _manager_pools(pool_manager):
+    pools = []
+    for key in pool_manager.pools.keys():
+        pool = pool_manager.pools.get(key)
+        if pool is not None:
+            pools.append(pool)
+    return pools
+# end _manager_pools
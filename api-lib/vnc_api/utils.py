@@ -1,7 +1,13 @@
 import os
+import re
 import sys
 import errno
+import itertools
 import logging
+try:
+    import simplejson as json
+except ImportError:
+    import json
 
 
 AAA_MODE_VALID_VALUES = ['no-auth', 'cloud-admin', 'rbac']
@@ -10,6 +16,12 @@ OP_GET = 2
 OP_PUT = 3
 OP_DELETE = 4
 
+# Characters iter_json_array looks for to find the end of an element
+_JSON_ELEMENT_START = re.compile(r'[^\s,]')
+_JSON_STRING_SPECIAL = re.compile(r'["\\]')
+_JSON_CONTAINER_SPECIAL = re.compile(r'["{}\[\]]')
+_JSON_SCALAR_END = re.compile(r'[\s,\]]')
+
 
 def hdr_client_tenant():
     return 'X-Tenant-Name'
@@ -74,3 +86,105 @@ def getCertKeyCaBundle(bundle, certs):
     os.chmod(bundle, 0o777)
     return bundle
 # end CreateCertKeyCaBundle
+
+
+def iter_json_array(chunks, key):
+    """Incrementally parse the array of a '{..., "<key>": [...], ...}' JSON
+    document read by chunks and yield its elements as soon as they are
+    complete, without holding the whole document in memory.
+
+    The chunks are scanned once for the end of the current element, which
+    is decoded once complete.
+
+    :param chunks: iterable of JSON document chunks (ie. the iter_content()
+        of a streamed HTTP response)
+    :param key: key of the array in the top level JSON object
+    """
+    decoder = json.JSONDecoder()
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    chunks = iter(chunks)
+    buf = ''
+
+    # look for the start of the array
+    while True:
+        match = array_start.search(buf)
+        if match:
+            buf = buf[match.end():]
+            break
+        try:
+            buf += next(chunks)
+        except StopIteration:
+            raise ValueError('No "%s" array found in JSON document' % key)
+
+    # chunks of the element being received, from its start
+    parts = []
+    started = in_string = scalar = False
+    depth = 0
+    # characters to skip at the start of the next chunk (escaped ones)
+    skip = 0
+    for chunk in itertools.chain([buf], chunks):
+        index = 0
+        element_start = 0
+        while index < len(chunk):
+            if skip:
+                skipped = min(skip, len(chunk) - index)
+                index += skipped
+                skip -= skipped
+                continue
+            if in_string:
+                match = _JSON_STRING_SPECIAL.search(chunk, index)
+                if match is None:
+                    break
+                index = match.end()
+                if match.group() == '\\':
+                    skip = 1
+                    continue
+                in_string = False
+                complete = depth == 0
+            elif not started:
+                match = _JSON_ELEMENT_START.search(chunk, index)
+                if match is None:
+                    break
+                index = match.start()
+                char = chunk[index]
+                if char == ']':
+                    return
+                started = True
+                element_start = index
+                index += 1
+                if char in '{[':
+                    depth = 1
+                elif char == '"':
+                    in_string = True
+                else:
+                    scalar = True
+                continue
+            elif scalar:
+                match = _JSON_SCALAR_END.search(chunk, index)
+                if match is None:
+                    break
+                index = match.start()
+                complete = True
+            else:
+                match = _JSON_CONTAINER_SPECIAL.search(chunk, index)
+                if match is None:
+                    break
+                index = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                complete = depth == 0
+            if complete:
+                parts.append(chunk[element_start:index])
+                element = ''.join(parts)
+                parts = []
+                started = scalar = False
+                yield decoder.decode(element)
+        if started:
+            parts.append(chunk[element_start:])
+    raise ValueError('Truncated "%s" JSON array' % key)
+# end iter_json_array
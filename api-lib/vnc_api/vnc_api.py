@@ -2,41 +2,60 @@
 # Copyright (c) 2013 Juniper Networks, Inc. All rights reserved.
 #
 import logging
-from collections import OrderedDict
+import atexit
+import bisect
+import hashlib
+import math
+from collections import OrderedDict, deque
 import requests
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, ReadTimeout, Timeout
 
 import ConfigParser
+import Queue
 import pprint
-# always try to load simplejson first
-# as we get better performance
-try:
-    import simplejson as json
-except ImportError:
-    import json
 import time
+import random
 import platform
 import functools
+import threading
+from contextlib import contextmanager
 import __main__ as main
-import ssl
 import re
 import os
+import sys
+import zlib
 from urlparse import urlparse
 
+from gen.vnc_api_client_gen import all_resource_types
 from gen.vnc_api_client_gen import all_resource_type_tuples
-from gen.resource_xsd import *
-from gen.resource_client import *
+try:
+    # types generated in their own modules (generateDS --lazy-modules),
+    # imported on first access to their name
+    from gen.resource_types import xsd_types as _xsd_types
+    from gen.resource_types import client_types as _client_types
+except ImportError:
+    from gen.resource_xsd import *
+    from gen.resource_client import *
+    _xsd_types = _client_types = None
 from gen.generatedssuper import GeneratedsSuper
 
 from utils import (
     OP_POST, OP_PUT, OP_GET, OP_DELETE, hdr_client_tenant,
     _obj_serializer_all, obj_type_to_vnc_class, getCertKeyCaBundle,
-    AAA_MODE_VALID_VALUES, CamelCase, str_to_class)
+    AAA_MODE_VALID_VALUES, CamelCase, str_to_class, iter_json_array)
 from exceptions import (
     ServiceUnavailableError, NoIdError, PermissionDenied, OverQuota,
     RefsExistError, TimeOutError, BadRequest, HttpError,
     ResourceTypeUnknownError, RequestSizeError, AuthFailed)
-import ssl_adapter
+from cache import ObjectCache, NameCache, DiscoveryCache, LRUCache
+from json_codec import get_codec
+from lazy_loader import lazy_module
+from metrics import MetricsRegistry, NoopMetricsRegistry
+from profiler import get_profiler
+from retry import RetryPolicy, RetryBudget, parse_retry_after
+from token_manager import TokenManager, parse_token_expiry
+from tracing import Tracer, get_exporter
+from transport import RequestsTransport, UnixSocketTransport, TRANSPORTS
 
 DEFAULT_LOG_DIR = "/var/tmp/contrail_vnc_lib"
 
@@ -52,6 +71,38 @@ def check_homepage(func):
     return wrapper
 
 
+def traced(name):
+    """Trace the calls of a method taking a resource type as first
+    argument in a span name.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, res_type, *args, **kwargs):
+            with self.tracer.span(name, resource=res_type):
+                return func(self, res_type, *args, **kwargs)
+        return wrapper
+    return decorator
+# end traced
+
+
+_OP_METHODS = {OP_POST: 'post', OP_GET: 'get', OP_PUT: 'put',
+               OP_DELETE: 'delete'}
+
+
+def _metrics_resource(uri):
+    """Return the resource type or the action a request URI is about,
+    to label its metrics.
+    """
+    name = urlparse(uri).path.strip('/').split('/')[0]
+    if name in all_resource_types:
+        return name
+    if name[:-1] in all_resource_types:
+        # collection
+        return name[:-1]
+    return name or 'homepage'
+# end _metrics_resource
+
+
 def get_object_class(res_type):
     cls_name = '%s' % (CamelCase(res_type))
     return str_to_class(cls_name, __name__)
@@ -71,7 +122,26 @@ def _read_cfg(cfg_parser, section, option, default):
 
 
 class CurlLogger(object):
-    def __init__(self, log_file="/var/log/contrail/vnc-api.log"):
+    """Log the requests sent to the API servers as curl command lines, and
+    their responses.
+
+    Records are formatted and written by a background thread, the requests
+    only queue them. Records are dropped while the queue is full. The
+    loggers of a log file share its queue and thread, sized by the first
+    one.
+
+    :param log_file: path or name of the log file
+    :param sample_rate: fraction of the requests logged
+    :param max_body_size: number of bytes logged of the response bodies, 0
+        to log them whole
+    :param ops: operations logged (get, post, put and delete), all if None
+    :param queue_size: number of records waiting to be written at most
+    """
+    DEFAULT_QUEUE_SIZE = 10000
+
+    def __init__(self, log_file="/var/log/contrail/vnc-api.log",
+                 sample_rate=1.0, max_body_size=0, ops=None,
+                 queue_size=DEFAULT_QUEUE_SIZE):
         if os.path.dirname(log_file):
             # absolute path to log file provided
             self.log_file = log_file
@@ -90,22 +160,57 @@ class CurlLogger(object):
                 self.log_file = os.path.join(DEFAULT_LOG_DIR,
                         os.path.basename(self.log_file))
 
-        formatter = logging.Formatter('%(asctime)s %(levelname)-8s %(message)s',
-                                      datefmt='%Y/%m/%d %H:%M:%S')
-        self.curl_logger = logging.getLogger('log_curl')
-        self.curl_logger.setLevel(logging.DEBUG)
-        if os.path.exists(self.log_file):
-            curl_log_handler = logging.FileHandler(self.log_file, mode='a')
-        else:
-            curl_log_handler = logging.FileHandler(self.log_file, mode='w')
-        curl_log_handler.setFormatter(formatter)
-        self.curl_logger.addHandler(curl_log_handler)
+        self._writer = _get_curl_log_writer(self.log_file, queue_size)
+        self.curl_logger = self._writer.curl_logger
         self.pattern = re.compile(r'(.*-H "X-AUTH-TOKEN:)[0-9a-z]+(")')
+
+        self.sample_rate = sample_rate
+        self.max_body_size = max_body_size
+        self.ops = set(ops) if ops else None
     # end __init__
 
+    @property
+    def dropped(self):
+        """Number of records of the log file dropped."""
+        return self._writer.dropped
+    # end dropped
+
+    def sample(self, op):
+        """Return whether a request of operation op is to be logged."""
+        if self.ops is not None and op not in self.ops:
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+    # end sample
+
     def log(self, op, url, data=None, headers=None):
-        if not headers:
-            headers = {}
+        if isinstance(data, dict):
+            data = dict(data)
+        self._put(self._format_request, op, url, data, dict(headers or {}))
+    # end log
+
+    def log_response(self, resp, stream=False):
+        # do not read in memory the body of a streamed response
+        body = None if stream else resp.content
+        body_size = None
+        if body and self.max_body_size and len(body) > self.max_body_size:
+            body_size = len(body)
+            body = body[:self.max_body_size]
+        self._put(self._format_response, resp.status_code, resp.headers,
+                  body, body_size)
+    # end log_response
+
+    def flush(self, timeout=None):
+        """Wait for the records queued to be written, at most timeout
+        seconds if given. Return whether they all were.
+        """
+        return self._writer.flush(timeout)
+    # end flush
+
+    def _put(self, format_record, *args):
+        self._writer.put(format_record, args)
+    # end _put
+
+    def _format_request(self, op, url, data, headers):
         op_str = {'get': 'GET', 'post': 'POST',
                   'delete': 'DELETE', 'put': 'PUT'}
         cmd_url = url
@@ -129,81 +234,456 @@ class CurlLogger(object):
                                                 cmd_data, cmd_url)
         else:
             cmd = "curl -X %s %s %s" % (cmd_op, cmd_hdr, cmd_url)
-        self.curl_logger.debug(cmd)
-    # end log
+        return cmd
+    # end _format_request
 
-    def log_response(self, resp):
-        self.curl_logger.debug("RESP: %s %s %s",
-            resp.status_code, resp.headers, resp.text)
-    # end log_response
+    def _format_response(self, status_code, headers, body, body_size):
+        if body is None:
+            body = '<streamed>'
+        else:
+            body = body.decode('utf-8', 'replace')
+            if body_size is not None:
+                body += '... <%d bytes>' % body_size
+        return "RESP: %s %s %s" % (status_code, headers, body)
+    # end _format_response
 # end CurlLogger
 
 
+class _CurlLogWriter(object):
+    """Queue and background thread writing the records of a log file."""
+    # Seconds waited at exit for the records queued to be written
+    EXIT_FLUSH_TIMEOUT = 5
+
+    def __init__(self, log_file, queue_size):
+        formatter = logging.Formatter('%(asctime)s %(levelname)-8s %(message)s',
+                                      datefmt='%Y/%m/%d %H:%M:%S')
+        self.curl_logger = logging.getLogger('log_curl.%s' % log_file)
+        self.curl_logger.setLevel(logging.DEBUG)
+        if os.path.exists(log_file):
+            curl_log_handler = logging.FileHandler(log_file, mode='a')
+        else:
+            curl_log_handler = logging.FileHandler(log_file, mode='w')
+        curl_log_handler.setFormatter(formatter)
+        self.curl_logger.addHandler(curl_log_handler)
+
+        self.dropped = 0
+        self._queue = Queue.Queue(queue_size)
+        thread = threading.Thread(target=self._write_records,
+                                  name='vnc_api-curl-log')
+        thread.daemon = True
+        thread.start()
+        atexit.register(self.flush, self.EXIT_FLUSH_TIMEOUT)
+    # end __init__
+
+    def put(self, format_record, args):
+        try:
+            self._queue.put_nowait((format_record, args))
+        except Queue.Full:
+            self.dropped += 1
+    # end put
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if deadline is None:
+                    self._queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    # end flush
+
+    def _write_records(self):
+        while True:
+            format_record, args = self._queue.get()
+            try:
+                self.curl_logger.debug(format_record(*args))
+            except Exception as e:
+                logger = logging.getLogger(__name__)
+                logger.warn("Failed to write curl log record: %s", str(e))
+            finally:
+                self._queue.task_done()
+    # end _write_records
+# end class _CurlLogWriter
+
+
+# Writers of the curl log files of the process, by path
+_curl_log_writers = {}
+_curl_log_writers_lock = threading.Lock()
+
+
+def _get_curl_log_writer(log_file, queue_size):
+    with _curl_log_writers_lock:
+        writer = _curl_log_writers.get(log_file)
+        if writer is None:
+            writer = _curl_log_writers[log_file] = _CurlLogWriter(
+                log_file, queue_size)
+        return writer
+# end _get_curl_log_writer
+
 
 class ActionUriDict(dict):
     """Action uri dictionary with operator([]) overloading to parse home page
        and populate the action_uri, if not populated already.
+       Actions still unknown once the home page is parsed again are not
+       looked up again for UNKNOWN_ACTION_TTL seconds.
     """
+    UNKNOWN_ACTION_TTL = 60
 
     def __init__(self, vnc_api,  *args, **kwargs):
         dict.__init__(self, args, **kwargs)
         self.vnc_api = vnc_api
+        self._unknown_actions = LRUCache(max_size=1000,
+                                         ttl=self.UNKNOWN_ACTION_TTL)
 
     def __getitem__(self, key):
         try:
             return dict.__getitem__(self, key)
         except KeyError:
+            if self._unknown_actions.get(key):
+                raise
             homepage = self.vnc_api._request(
                 OP_GET, self.vnc_api._base_url, retry_on_error=False)
             self.vnc_api._parse_homepage(homepage)
-            return dict.__getitem__(self, key)
+            try:
+                return dict.__getitem__(self, key)
+            except KeyError:
+                self._unknown_actions.set(key, True)
+                raise
+
+
+class ApiServerHostHealth(object):
+    """Circuit breaker and latency tracking of one API server host.
+
+    The circuit opens after failure_threshold consecutive connection
+    failures and the host is then skipped. Once reset_timeout seconds
+    elapsed, the circuit is half-open: a single probe request is let
+    through, closing the circuit on success or re-opening it on failure.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    # weight of the last sample in the latency moving average
+    _LATENCY_EWMA_WEIGHT = 0.2
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.latency = None
+    # end __init__
+
+    def available(self, now):
+        """Return True if a request could be sent to the host now."""
+        return (self.state == self.CLOSED or
+                now - self.opened_at >= self.reset_timeout)
+    # end available
+
+    def acquire(self, now):
+        """Return True and take the probe slot of a non-closed circuit if a
+        request can be sent to the host now.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if now - self.opened_at >= self.reset_timeout:
+            # let one probe request through, another one may only be sent
+            # after reset_timeout if this one never completes
+            self.state = self.HALF_OPEN
+            self.opened_at = now
+            return True
+        return False
+    # end acquire
+
+    def record_success(self, latency):
+        self.state = self.CLOSED
+        self.failures = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self._LATENCY_EWMA_WEIGHT * (latency -
+                                                         self.latency)
+    # end record_success
+
+    def record_failure(self, now):
+        self.failures += 1
+        if (self.state == self.HALF_OPEN or
+                self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self.opened_at = now
+    # end record_failure
+# end class ApiServerHostHealth
+
+
+class _WorkerPool(object):
+    """Daemon threads running submitted functions, reused from one call to
+    the next. Threads are started on demand up to max_threads, calls are
+    queued beyond, and exit after idle_timeout seconds without work.
+    """
+
+    def __init__(self, max_threads, idle_timeout=60):
+        self.max_threads = max_threads
+        self.idle_timeout = idle_timeout
+        self._tasks = Queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._idle = 0
+    # end __init__
+
+    def submit(self, func, *args):
+        with self._lock:
+            self._tasks.put((func, args))
+            if self._idle:
+                # taken by an idle thread
+                self._idle -= 1
+                return
+            if self._threads >= self.max_threads:
+                return
+            self._threads += 1
+        thread = threading.Thread(target=self._work)
+        thread.daemon = True
+        thread.start()
+    # end submit
+
+    def _work(self):
+        while True:
+            try:
+                func, args = self._tasks.get(timeout=self.idle_timeout)
+            except Queue.Empty:
+                with self._lock:
+                    if self._tasks.empty():
+                        self._idle -= 1
+                        self._threads -= 1
+                        return
+                # submitted while timing out, this thread was counted idle
+                continue
+            try:
+                func(*args)
+            except Exception:
+                pass
+            with self._lock:
+                self._idle += 1
+    # end _work
+# end class _WorkerPool
 
 
 class ApiServerSession(object):
+    # Host selection modes
+    LB_MODE_ROUNDROBIN = 'roundrobin'
+    LB_MODE_LATENCY = 'latency'
+    LB_MODE_HASH = 'hash'
+    LB_MODES = [LB_MODE_ROUNDROBIN, LB_MODE_LATENCY, LB_MODE_HASH]
+
+    _DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3
+    _DEFAULT_CIRCUIT_RESET_TIMEOUT = 30
+
+    # Hedged reads: number of recent GET latencies the hedge delay is
+    # computed from, and number of them needed before reads are hedged
+    _HEDGE_LATENCY_WINDOW = 500
+    _HEDGE_MIN_SAMPLES = 20
+    _DEFAULT_HEDGE_MIN_DELAY = 0.01
+
+    # Consistent hashing: points of each host on the ring, and load bound
+    # of a host relative to the average number of requests in flight
+    _HASH_RING_REPLICAS = 100
+    _DEFAULT_HASH_LOAD_FACTOR = 1.25
+    # POST actions which only read, routed by their body
+    _HASH_READ_ACTIONS = ['/fqname-to-id', '/id-to-fqname',
+                          '/list-bulk-collection']
+
     def __init__(self, api_server_hosts, max_conns_per_pool,
-            max_pools, logger=None):
+            max_pools, logger=None, lb_mode=None,
+            circuit_failure_threshold=None, circuit_reset_timeout=None,
+            hedge_percentile=None, hedge_min_delay=None,
+            hash_load_factor=None, write_hosts=None, transport=None,
+            metrics=None):
         self.api_server_hosts = api_server_hosts
         self.max_conns_per_pool = max_conns_per_pool
         self.max_pools = max_pools
         self.logger = logger
+        self.transport = transport or RequestsTransport(max_conns_per_pool,
+                                                        max_pools)
+        # MetricsRegistry of the request latencies per host, optional
+        self.metrics = metrics
+        self.lb_mode = lb_mode or self.LB_MODE_ROUNDROBIN
+        if self.lb_mode not in self.LB_MODES:
+            raise ValueError("Unknown API server load balancing mode '%s'" %
+                             self.lb_mode)
+        self.circuit_failure_threshold = (
+            circuit_failure_threshold or
+            self._DEFAULT_CIRCUIT_FAILURE_THRESHOLD)
+        self.circuit_reset_timeout = (
+            circuit_reset_timeout or self._DEFAULT_CIRCUIT_RESET_TIMEOUT)
+        # GETs not answered within this percentile of the recent GET
+        # latencies are sent to a second host, disabled if None
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = (hedge_min_delay or
+                                self._DEFAULT_HEDGE_MIN_DELAY)
+        self.hedge_reads = 0
+        self.hedged_reads = 0
+        self.hedge_wins = 0
+        # recent GET latencies, in arrival order and sorted
+        self._get_latencies = deque(maxlen=self._HEDGE_LATENCY_WINDOW)
+        self._sorted_get_latencies = []
+        # threads sending hedged GETs, at most one per pooled connection
+        self._hedge_pool = _WorkerPool(max_pools * len(api_server_hosts))
+        # In hash mode, writes can be restricted to a subset of the hosts
+        self.hash_load_factor = (hash_load_factor or
+                                 self._DEFAULT_HASH_LOAD_FACTOR)
+        self.write_hosts = [host for host in write_hosts or []
+                            if host in api_server_hosts]
+        self._write_index = -1
+        self._inflight = dict((host, 0) for host in api_server_hosts)
+        self._inflight_total = 0
+        self._ring = []
+        self._ring_keys = []
         self.api_server_sessions = OrderedDict()
+        self.host_health = {}
         self.active_session = (None, None)
+        self._active_index = -1
+        self._lock = threading.Lock()
         self.create()
     # end __init__
 
-    def roundrobin(self):
-        session_hosts = self.api_server_sessions.keys()
-        if self.active_session[0] in session_hosts:
-            last_used_index = session_hosts.index(self.active_session[0])
+    def _set_active(self, index):
+        self._active_index = index
+        if index < 0:
+            self.active_session = (None, None)
         else:
-            # no active session start from the first host
-            last_used_index = -1
-        # use the next host in the list
-        next_index = last_used_index + 1
-        if next_index >= len(session_hosts):
-            # reuse the first host from the list
-            next_index = 0
-        active_host = session_hosts[next_index]
-        self.active_session = (active_host,
-                               self.api_server_sessions[active_host])
+            host = self.api_server_hosts[index]
+            self.active_session = (host, self.api_server_sessions[host])
+    # end _set_active
+
+    def roundrobin(self):
+        """Make the next host with a non-open circuit the active one."""
+        now = time.time()
+        hosts_count = len(self.api_server_hosts)
+        for offset in range(1, hosts_count + 1):
+            index = (self._active_index + offset) % hosts_count
+            host = self.api_server_hosts[index]
+            if self.host_health[host].acquire(now):
+                self._set_active(index)
+                return
+        self._set_active(-1)
+    # end roundrobin
+
+    def _select_by_latency(self):
+        """Power of two choices: pick two random available hosts and make
+        the one with the lowest average latency the active one. Hosts
+        without latency sample yet are preferred so they get one.
+        """
+        now = time.time()
+        indexes = [i for i, host in enumerate(self.api_server_hosts)
+                   if self.host_health[host].available(now)]
+        if not indexes:
+            self._set_active(-1)
+            return
+        candidates = random.sample(indexes, min(2, len(indexes)))
+        index = min(candidates, key=lambda i: self.host_health[
+            self.api_server_hosts[i]].latency or 0)
+        self.host_health[self.api_server_hosts[index]].acquire(now)
+        self._set_active(index)
+    # end _select_by_latency
+
+    @staticmethod
+    def _hash(key):
+        if isinstance(key, unicode):
+            key = key.encode('utf-8')
+        return int(hashlib.md5(key).hexdigest()[:16], 16)
+    # end _hash
+
+    def _build_ring(self):
+        # the ring holds the index of the hosts in api_server_hosts
+        ring = sorted((self._hash('%s-%d' % (host, replica)), index)
+                      for index, host in enumerate(self.api_server_hosts)
+                      for replica in range(self._HASH_RING_REPLICAS))
+        self._ring = [index for _, index in ring]
+        self._ring_keys = [point for point, _ in ring]
+    # end _build_ring
+
+    def _routing_key(self, method, url, kwargs):
+        """Return the key a read is routed by, ie. the resource path (which
+        holds its uuid) or the body of a read action (holding an fq_name or
+        uuids), None for writes.
+        """
+        path = urlparse(url).path
+        if method == 'get':
+            return path
+        if method == 'post' and path in self._HASH_READ_ACTIONS:
+            return '%s %s' % (path, kwargs.get('data'))
+        return None
+    # end _routing_key
+
+    def _select_by_hash(self, key):
+        """Consistent hashing with bounded load: make the first host on the
+        ring after the key hash which is available and has less requests
+        in flight than the load bound the active one. Keys of a failed host
+        move to the next host on the ring, other keys keep their host.
+        """
+        now = time.time()
+        hosts_count = len(self.api_server_hosts)
+        max_load = math.ceil(self.hash_load_factor *
+                             (self._inflight_total + 1) / hosts_count)
+        start = bisect.bisect(self._ring_keys, self._hash(key))
+        seen_indexes = set()
+        for offset in range(len(self._ring)):
+            index = self._ring[(start + offset) % len(self._ring)]
+            if index in seen_indexes:
+                continue
+            seen_indexes.add(index)
+            host = self.api_server_hosts[index]
+            if (self._inflight[host] < max_load and
+                    self.host_health[host].acquire(now)):
+                self._set_active(index)
+                return
+            if len(seen_indexes) == hosts_count:
+                break
+        self._set_active(-1)
+    # end _select_by_hash
+
+    def _select_write_host(self):
+        """Make the next available host of the write subset the active
+        one.
+        """
+        now = time.time()
+        hosts_count = len(self.write_hosts)
+        for offset in range(1, hosts_count + 1):
+            index = (self._write_index + offset) % hosts_count
+            host = self.write_hosts[index]
+            if self.host_health[host].acquire(now):
+                self._write_index = index
+                self._set_active(self.api_server_hosts.index(host))
+                return
+        self._set_active(-1)
+    # end _select_write_host
+
+    def _new_session(self):
+        return self.transport.new_session()
+    # end _new_session
 
     def create(self):
         for api_server_host in self.api_server_hosts:
-            api_server_session = requests.Session()
-
-            adapter = requests.adapters.HTTPAdapter(
-                pool_connections=self.max_conns_per_pool,
-                pool_maxsize=self.max_pools)
-            ssladapter = ssl_adapter.SSLAdapter(ssl.PROTOCOL_SSLv23)
-            ssladapter.init_poolmanager(
-                connections=self.max_conns_per_pool,
-                maxsize=self.max_pools)
-            api_server_session.mount("http://", adapter)
-            api_server_session.mount("https://", ssladapter)
             self.api_server_sessions.update(
-                {api_server_host: api_server_session})
+                {api_server_host: self._new_session()})
+            self.host_health[api_server_host] = ApiServerHostHealth(
+                self.circuit_failure_threshold, self.circuit_reset_timeout)
+        self._build_ring()
     # end create
 
+    def reconnect(self, api_server_host):
+        """Drop the connection pool of a failed host only, the pools of the
+        other hosts are kept warm.
+        """
+        old_session = self.api_server_sessions[api_server_host]
+        self.api_server_sessions[api_server_host] = self._new_session()
+        old_session.close()
+    # end reconnect
+
     def get_url(self, url, api_server_host):
         parsed_url = urlparse(url)
         port = parsed_url.netloc.split(':')[-1]
@@ -212,47 +692,307 @@ class ApiServerSession(object):
         return modified_url.geturl()
     # end get_url
 
+    def _host_crud(self, host, method, url, *args, **kwargs):
+        if host not in url:
+            url = self.get_url(url, host)
+        crud_method = getattr(self.api_server_sessions[host], '%s' % method)
+        health = self.host_health[host]
+        log_request = self.logger and self.logger.sample(method)
+        if log_request:
+            data = kwargs.get('params',
+                    kwargs.get('data', None))
+            headers = kwargs.get('headers', None)
+            self.logger.log(op=method, url=url,
+                    data=data, headers=headers)
+        start = time.time()
+        with self._lock:
+            self._inflight[host] += 1
+            self._inflight_total += 1
+        try:
+            result = crud_method(url, *args, **kwargs)
+        except ConnectionError:
+            with self._lock:
+                health.record_failure(time.time())
+            if self.metrics is not None:
+                self.metrics.inc('connection_errors_total', host=host)
+            self.reconnect(host)
+            raise
+        finally:
+            with self._lock:
+                self._inflight[host] -= 1
+                self._inflight_total -= 1
+        latency = time.time() - start
+        with self._lock:
+            health.record_success(latency)
+            if self.hedge_percentile and method == 'get':
+                self._record_get_latency(latency)
+        if self.metrics is not None:
+            self.metrics.observe('http_request_duration_seconds', latency,
+                                 method=method, host=host)
+        if log_request:
+            self.logger.log_response(
+                result, stream=kwargs.get('stream', False))
+        return result
+    # end _host_crud
+
+    def _select_host(self, method, url, kwargs):
+        with self._lock:
+            if self.lb_mode == self.LB_MODE_LATENCY:
+                self._select_by_latency()
+            elif self.lb_mode == self.LB_MODE_HASH:
+                key = self._routing_key(method, url, kwargs)
+                if key is not None:
+                    self._select_by_hash(key)
+                elif self.write_hosts:
+                    self._select_write_host()
+                else:
+                    self.roundrobin()
+            else:
+                self.roundrobin()
+            return self.active_session[0]
+    # end _select_host
+
     def crud(self, method, url, *args, **kwargs):
-        self.roundrobin()
-        active_host, active_session = self.active_session
-        if active_host and active_session:
-            if active_host not in url:
-                url = self.get_url(url, active_host)
-            crud_method = getattr(active_session, '%s' % method)
+        active_host = self._select_host(method, url, kwargs)
+        if (active_host and self.hedge_percentile and method == 'get' and
+                not kwargs.get('stream') and len(self.api_server_hosts) > 1):
+            return self._hedged_get(active_host, url, *args, **kwargs)
+
+        tried_hosts = set()
+        if active_host:
             try:
-                if self.logger:
-                    data = kwargs.get('params',
-                            kwargs.get('data', None))
-                    headers = kwargs.get('headers', None)
-                    self.logger.log(op=method, url=url,
-                            data=data, headers=headers)
-                result = crud_method(url, *args, **kwargs)
-                if self.logger:
-                    self.logger.log_response(result)
-                return result
+                return self._host_crud(active_host, method, url,
+                                       *args, **kwargs)
             except ConnectionError:
-                self.active_session = (None, None)
+                tried_hosts.add(active_host)
+        return self._fallback_crud(tried_hosts, method, url, *args, **kwargs)
+    # end crud
 
-        for host, session in self.api_server_sessions.items():
-            if host not in url:
-                url = self.get_url(url, host)
-            crud_method = getattr(session, '%s' % method)
+    def _record_get_latency(self, latency):
+        """Add latency to the window of recent GET latencies, keeping its
+        sorted copy up to date. Called with the lock held.
+        """
+        latencies = self._sorted_get_latencies
+        if len(self._get_latencies) == self._get_latencies.maxlen:
+            del latencies[bisect.bisect_left(latencies,
+                                             self._get_latencies[0])]
+        self._get_latencies.append(latency)
+        bisect.insort(latencies, latency)
+    # end _record_get_latency
+
+    def hedge_delay(self):
+        """Return the delay after which a GET is hedged, None while there
+        are too few latency samples.
+        """
+        with self._lock:
+            latencies = self._sorted_get_latencies
+            if len(latencies) < self._HEDGE_MIN_SAMPLES:
+                return None
+            index = min(len(latencies) - 1,
+                        int(len(latencies) * self.hedge_percentile / 100.0))
+            return max(self.hedge_min_delay, latencies[index])
+    # end hedge_delay
+
+    def _hedge_host(self, primary_host):
+        """Return the next host after primary_host able to take a request,
+        None if there is none.
+        """
+        now = time.time()
+        index = self.api_server_hosts.index(primary_host)
+        hosts_count = len(self.api_server_hosts)
+        with self._lock:
+            for offset in range(1, hosts_count):
+                host = self.api_server_hosts[(index + offset) % hosts_count]
+                if self.host_health[host].acquire(now):
+                    return host
+        return None
+    # end _hedge_host
+
+    def _submit_get(self, hedge, host, url, args, kwargs):
+        """Send a GET of the hedged read to host from the hedge pool. Its
+        outcome is queued, or its response closed if the read already
+        returned the other one.
+        """
+        def _get():
+            result = None
+            try:
+                result = self._host_crud(host, 'get', url, *args, **kwargs)
+            except Exception as e:
+                outcome = (host, None, e)
+            else:
+                outcome = (host, result, None)
+            with self._lock:
+                if not hedge['done']:
+                    hedge['outcomes'].put(outcome)
+                    return
+            if result is not None:
+                result.close()
+        self._hedge_pool.submit(_get)
+    # end _submit_get
+
+    def _end_hedge(self, hedge):
+        """Close the responses of the hedged read not returned."""
+        with self._lock:
+            hedge['done'] = True
+        while True:
             try:
-                if self.logger:
-                    data = kwargs.get('params',
-                            kwargs.get('data', None))
-                    headers = kwargs.get('headers', None)
-                    self.logger.log(op=method, url=url,
-                            data=data, headers=headers)
-                result = crud_method(url, *args, **kwargs)
-                if self.logger:
-                    self.logger.log_response(result)
-                self.active_session = (host, session)
+                _, result, _ = hedge['outcomes'].get_nowait()
+            except Queue.Empty:
+                return
+            if result is not None:
+                result.close()
+    # end _end_hedge
+
+    def _hedged_get(self, primary_host, url, *args, **kwargs):
+        """Send a GET to primary_host and, if it did not answer within the
+        hedge delay, the same GET to another host. The first successful
+        response is returned, the other one is closed when it comes.
+        Responses are streamed so that closing the loser releases its
+        connection without reading its body.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            try:
+                return self._host_crud(primary_host, 'get', url,
+                                       *args, **kwargs)
+            except ConnectionError:
+                return self._fallback_crud(set([primary_host]), 'get', url,
+                                           *args, **kwargs)
+
+        with self._lock:
+            self.hedge_reads += 1
+        get_kwargs = dict(kwargs, stream=True)
+        hedge = {'done': False, 'outcomes': Queue.Queue()}
+        tried_hosts = set([primary_host])
+        self._submit_get(hedge, primary_host, url, args, get_kwargs)
+        pending = 1
+        try:
+            outcome = hedge['outcomes'].get(timeout=delay)
+            pending -= 1
+        except Queue.Empty:
+            outcome = None
+            hedge_host = self._hedge_host(primary_host)
+            if hedge_host:
+                with self._lock:
+                    self.hedged_reads += 1
+                tried_hosts.add(hedge_host)
+                self._submit_get(hedge, hedge_host, url, args, get_kwargs)
+                pending += 1
+
+        while True:
+            if outcome is None:
+                outcome = hedge['outcomes'].get()
+                pending -= 1
+            host, result, error = outcome
+            if error is None:
+                self._end_hedge(hedge)
+                if host != primary_host:
+                    with self._lock:
+                        self.hedge_wins += 1
+                        self._set_active(self.api_server_hosts.index(host))
                 return result
+            if not pending:
+                break
+            # wait for the other request
+            outcome = None
+
+        if isinstance(error, ConnectionError):
+            return self._fallback_crud(tried_hosts, 'get', url,
+                                       *args, **kwargs)
+        raise error
+    # end _hedged_get
+
+    def hedge_stats(self):
+        """Return the number of hedgeable reads, of hedged ones and of
+        those answered first by the second host.
+        """
+        return {
+            'reads': self.hedge_reads,
+            'hedged': self.hedged_reads,
+            'hedge_wins': self.hedge_wins,
+            'hedge_rate': (float(self.hedged_reads) / self.hedge_reads
+                           if self.hedge_reads else 0.0),
+            'delay': self.hedge_delay() if self.hedge_percentile else None,
+        }
+    # end hedge_stats
+
+    def collect_metrics(self, metrics):
+        """Set in the MetricsRegistry metrics the connection pools usage,
+        requests in flight and circuit state of each host, and the hedged
+        reads counters.
+        """
+        for host, session in self.api_server_sessions.items():
+            metrics.set('inflight_requests', self._inflight[host], host=host)
+            metrics.set('circuit_open', int(
+                self.host_health[host].state != ApiServerHostHealth.CLOSED),
+                host=host)
+            metrics.set('pool_max_size', self.max_pools, host=host)
+            if hasattr(session, 'pool_stats'):
+                pool_stats = session.pool_stats()
+                metrics.set('pool_connections_opened_total',
+                            pool_stats['connections'],
+                            MetricsRegistry.COUNTER, host=host)
+                metrics.set('pool_idle_connections',
+                            pool_stats['idle_connections'], host=host)
+        if self.hedge_percentile:
+            stats = self.hedge_stats()
+            metrics.set('hedge_reads_total', stats['reads'],
+                        MetricsRegistry.COUNTER)
+            metrics.set('hedged_reads_total', stats['hedged'],
+                        MetricsRegistry.COUNTER)
+            metrics.set('hedge_wins_total', stats['hedge_wins'],
+                        MetricsRegistry.COUNTER)
+            if stats['delay'] is not None:
+                metrics.set('hedge_delay_seconds', stats['delay'])
+    # end collect_metrics
+
+    def _fallback_crud(self, tried_hosts, method, url, *args, **kwargs):
+        """Try the hosts not tried yet in order, the ones with an open
+        circuit last. Writes pinned to a host subset stay in it.
+        """
+        hosts = self.api_server_hosts
+        if (self.lb_mode == self.LB_MODE_HASH and self.write_hosts and
+                self._routing_key(method, url, kwargs) is None):
+            hosts = self.write_hosts
+        unhealthy_hosts = []
+        for host in hosts:
+            if host in tried_hosts:
+                continue
+            with self._lock:
+                available = self.host_health[host].acquire(time.time())
+            if not available:
+                unhealthy_hosts.append(host)
+                continue
+            try:
+                result = self._host_crud(host, method, url, *args, **kwargs)
             except ConnectionError:
                 continue
+            with self._lock:
+                self._set_active(self.api_server_hosts.index(host))
+            return result
+        for host in unhealthy_hosts:
+            try:
+                result = self._host_crud(host, method, url, *args, **kwargs)
+            except ConnectionError:
+                continue
+            with self._lock:
+                self._set_active(self.api_server_hosts.index(host))
+            return result
+        with self._lock:
+            # restart from the first host next time
+            self._set_active(-1)
         raise ConnectionError
-    # end crud
+    # end _fallback_crud
+
+    def health(self):
+        """Return the circuit state, consecutive failures and average
+        latency of each host.
+        """
+        return dict((host, {'state': health.state,
+                            'failures': health.failures,
+                            'latency': health.latency})
+                    for host, health in self.host_health.items())
+    # end health
 
     def get(self, url, *args, **kwargs):
         return self.crud('get', url, *args, **kwargs)
@@ -295,6 +1035,16 @@ class VncApi(object):
     _DEFAULT_AUTHN_PASSWORD = ""
     _DEFAULT_AUTHN_TENANT = 'default-tenant'
     _DEFAULT_DOMAIN_ID = "default"
+    # Keystone tokens are renewed this many seconds before they expire
+    _DEFAULT_AUTHN_TOKEN_REFRESH_MARGIN = 60
+    _V2_AUTHN_URL = '/v2.0/tokens'
+    _V3_AUTHN_URL = '/v3/auth/tokens'
+    # Cached homepage and keystone version are revalidated after this many
+    # seconds
+    _DEFAULT_DISCOVERY_CACHE_TTL = 300
+    _DEFAULT_PROFILE_SIGNAL = 'SIGUSR2'
+    # Methods profiled besides the per type CRUD ones
+    _PROFILED_METHODS = ('resource_list', 'ref_update', 'fq_name_to_id')
 
     # Keystone and and vnc-api SSL support
     # contrail-api will remain to be on http
@@ -313,17 +1063,45 @@ class VncApi(object):
     # a POST /list-bulk-collection is issued
     POST_FOR_LIST_THRESHOLD = 25
 
+    # Number of fq_names or uuids resolved per request by the bulk resolvers
+    BULK_RESOLVE_CHUNK_SIZE = 200
+
+    # Number of resources read per request by iter_resources
+    ITER_RESOURCES_CHUNK_SIZE = 200
+
+    # Size in bytes of the chunks read from streamed responses
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # zlib level of the gzip compression of large request bodies
+    _REQUEST_COMPRESSION_LEVEL = 6
+
     # Number of pools and number of pool per conn to api-server
     _DEFAULT_MAX_POOLS = 100
     _DEFAULT_MAX_CONNS_PER_POOL = 100
 
+    # Default time to live in seconds of objects in the optional cache
+    _DEFAULT_OBJECT_CACHE_TTL = 60
+    # Default time to live in seconds of fq_name <-> uuid resolutions and
+    # of unknown names/uuids in the optional name cache
+    _DEFAULT_NAME_CACHE_TTL = 300
+    _DEFAULT_NAME_CACHE_NEGATIVE_TTL = 5
+
+    # Default backoff bounds and total retry time of a failing request, in
+    # seconds, and default retry budget of a client (bucket capacity and
+    # refill rate in retries per second)
+    _DEFAULT_RETRY_BASE_DELAY = 0.5
+    _DEFAULT_RETRY_MAX_DELAY = 8
+    _DEFAULT_RETRY_MAX_ELAPSED = 60
+    _DEFAULT_RETRY_BUDGET = 20
+    _DEFAULT_RETRY_BUDGET_RATE = 2
+
     # Defined in Sandesh common headers but not importable in vnc_api lib
     _SECURITY_OBJECT_TYPES = [
-        ApplicationPolicySet.object_type,
-        FirewallPolicy.object_type,
-        FirewallRule.object_type,
-        ServiceGroup.object_type,
-        AddressGroup.object_type,
+        'application_policy_set',
+        'firewall_policy',
+        'firewall_rule',
+        'service_group',
+        'address_group',
     ]
     _POLICY_MANAGEMENT_NAME_FOR_SECURITY_DRAFT = 'draft-policy-management'
 
@@ -336,25 +1114,19 @@ class VncApi(object):
                  domain_name=None, exclude_hrefs=None, auth_token_url=None,
                  apicertfile=None, apikeyfile=None, apicafile=None,
                  kscertfile=None, kskeyfile=None, kscafile=None,
-                 apiinsecure=None, ksinsecure=None):
+                 apiinsecure=None, ksinsecure=None, object_cache_size=None,
+                 object_cache_ttl=None, object_cache_type_ttls=None,
+                 name_cache_size=None, name_cache_ttl=None,
+                 api_server_lb_mode=None, retry_policy=None,
+                 auth_token_cache_file=None, timeout=None,
+                 connect_timeout=None, api_server_hedge_percentile=None,
+                 transport=None, api_server_unix_socket=None,
+                 request_compression_threshold=None, json_codec=None,
+                 discovery_cache_file=None, tracing_exporter=None,
+                 profiler=None, metrics=None):
         # TODO allow for username/password to be present in creds file
 
         self._obj_serializer = self._obj_serializer_diff
-        for object_type, resource_type in all_resource_type_tuples:
-            for oper_str in ('_create', '_read', '_update', '_delete',
-                             's_list', '_get_default_id', '_read_draft'):
-                if (oper_str == '_read_draft' and
-                        object_type not in self._SECURITY_OBJECT_TYPES):
-                    continue
-                method = getattr(self, '_object%s' % oper_str)
-                bound_method = functools.partial(method, resource_type)
-                functools.update_wrapper(bound_method, method)
-                if oper_str == '_get_default_id':
-                    setattr(self, 'get_default_%s_id' % (object_type),
-                            bound_method)
-                else:
-                    setattr(self, '%s%s' % (object_type, oper_str),
-                            bound_method)
 
         cfg_parser = ConfigParser.ConfigParser()
         try:
@@ -364,6 +1136,40 @@ class VncApi(object):
             logger = logging.getLogger(__name__)
             logger.warn("Exception: %s", str(e))
 
+        # State of the requests of the current thread (request contexts,
+        # deadlines, transfers)
+        self._request_context_local = threading.local()
+
+        # Deadline of a request retries included, and timeout of connection
+        # attempts to the API server and keystone, in seconds. None by
+        # default, requests can also be given a deadline with
+        # request_context
+        self._request_timeout = float(timeout or _read_cfg(
+            cfg_parser, 'global', 'REQUEST_TIMEOUT', 0)) or None
+        self._connect_timeout = float(connect_timeout or _read_cfg(
+            cfg_parser, 'global', 'CONNECT_TIMEOUT', 0)) or None
+
+        # JSON codec of the request and response bodies, simplejson if
+        # installed by default. A codec name or instance can be given
+        json_codec = json_codec or _read_cfg(cfg_parser, 'global',
+                                             'JSON_CODEC', None)
+        if json_codec is None or isinstance(json_codec, basestring):
+            json_codec = get_codec(json_codec)
+        self._json = json_codec
+
+        # Homepage and keystone version discovered by a previous client,
+        # disabled by default. Stale entries are used and revalidated in
+        # the background
+        discovery_cache_file = discovery_cache_file or _read_cfg(
+            cfg_parser, 'global', 'DISCOVERY_CACHE_FILE', None)
+        self._discovery_cache = None
+        if discovery_cache_file:
+            self._discovery_cache = DiscoveryCache(
+                discovery_cache_file, ttl=float(_read_cfg(
+                    cfg_parser, 'global', 'DISCOVERY_CACHE_TTL',
+                    self._DEFAULT_DISCOVERY_CACHE_TTL)))
+        self._stale_discoveries = []
+
         self._api_connect_protocol = VncApi._DEFAULT_API_SERVER_CONNECT
         # API server SSL Support
         if api_server_use_ssl is None:
@@ -503,12 +1309,28 @@ class VncApi(object):
                 '}' + \
                 '}' + \
                 '}'
+            # keystone connections are kept open between authentications
+            self._ks_session = requests.Session()
+            discovered_token = None
             if not self._authn_url:
-                self._discover()
-            elif 'v2' in self._authn_url:
-                self._authn_body = self._v2_authn_body
+                discovered_token = self._discover()
             else:
-                self._authn_body = self._v3_authn_body
+                self._use_authn_url(self._authn_url)
+
+            # Tokens are renewed ahead of their expiry and optionally shared
+            # with the other processes using the same credentials
+            self._token_manager = TokenManager(
+                self._fetch_auth_token,
+                refresh_margin=float(_read_cfg(
+                    cfg_parser, 'auth', 'AUTHN_TOKEN_REFRESH_MARGIN',
+                    self._DEFAULT_AUTHN_TOKEN_REFRESH_MARGIN)),
+                cache_file=auth_token_cache_file or _read_cfg(
+                    cfg_parser, 'auth', 'AUTHN_TOKEN_CACHE_FILE', None),
+                cache_key=self._token_cache_key())
+            if discovered_token and not self._token_manager.has_token():
+                self._token_manager.set_token(*discovered_token)
+        else:
+            self._token_manager = None
 
         if not api_server_port:
             self._web_port = _read_cfg(cfg_parser, 'global', 'WEB_PORT',
@@ -523,10 +1345,160 @@ class VncApi(object):
             cfg_parser, 'global', 'MAX_CONNS_PER_POOL',
             self._DEFAULT_MAX_CONNS_PER_POOL))
 
+        # HTTP transport to the API servers: 'requests', 'urllib3', 'unix'
+        # (default if a socket path is set) or a transport object (see
+        # transport.RequestsTransport)
+        unix_socket = api_server_unix_socket or _read_cfg(
+            cfg_parser, 'global', 'UNIX_SOCKET', None)
+        transport = transport or _read_cfg(
+            cfg_parser, 'global', 'TRANSPORT',
+            UnixSocketTransport.name if unix_socket else
+            RequestsTransport.name)
+        if isinstance(transport, basestring):
+            if transport not in TRANSPORTS:
+                raise ValueError("Unknown transport '%s'" % transport)
+            if self._apiinsecure:
+                verify = False
+            elif self._use_api_certs:
+                verify = self._apicertbundle
+            else:
+                verify = True
+            transport_kwargs = {}
+            if transport == UnixSocketTransport.name:
+                transport_kwargs['socket_path'] = unix_socket
+            transport = TRANSPORTS[transport](
+                self._max_conns_per_pool, self._max_pools, verify,
+                **transport_kwargs)
+        self._transport = transport
+
+        # Request bodies larger than this size in bytes are sent gzip
+        # compressed, disabled by default as the API server must support it.
+        # Compressed responses are always accepted
+        self._request_compression_threshold = int(
+            request_compression_threshold or _read_cfg(
+                cfg_parser, 'global', 'REQUEST_COMPRESSION_THRESHOLD', 0))
+        self._transfer_stats = dict.fromkeys(
+            ['requests', 'request_bytes', 'request_wire_bytes',
+             'responses', 'response_bytes', 'response_wire_bytes'], 0)
+        self._transfer_stats_lock = threading.Lock()
+
+        # Client side metrics (latencies, retries, transfers, connection
+        # pools), disabled by default. Exported with self.metrics.to_dict(),
+        # to_prometheus() or to_statsd(). A MetricsRegistry can be given
+        if metrics is None:
+            metrics = str(_read_cfg(cfg_parser, 'global', 'METRICS',
+                                    False)).lower() == 'true'
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self.metrics = metrics or NoopMetricsRegistry()
+        self.metrics.add_collector(self._collect_metrics)
+
+        # Request tracing, disabled by default. An exporter name or an
+        # object with an export(span) method can be given. When enabled,
+        # requests are sent with the X-Request-Id header of their span
+        tracing_exporter = tracing_exporter or _read_cfg(
+            cfg_parser, 'global', 'TRACING_EXPORTER', None)
+        if isinstance(tracing_exporter, basestring):
+            tracing_exporter = get_exporter(tracing_exporter)
+        self.tracer = Tracer(tracing_exporter)
+
+        # Profiling of the public entry points, disabled by default and
+        # enabled with the name of a profiler (timing, sample or cprofile),
+        # also from the VNC_API_PROFILE environment variable. Its report is
+        # dumped on exit and on PROFILE_SIGNAL. A profiler instance can be
+        # given
+        profiler = (profiler or os.environ.get('VNC_API_PROFILE') or
+                    _read_cfg(cfg_parser, 'global', 'PROFILE', None))
+        if isinstance(profiler, basestring):
+            profiler = get_profiler(
+                profiler,
+                _read_cfg(cfg_parser, 'global', 'PROFILE_REPORT_FILE', None),
+                _read_cfg(cfg_parser, 'global', 'PROFILE_SIGNAL',
+                          self._DEFAULT_PROFILE_SIGNAL))
+        self.profiler = profiler
+        if profiler is not None:
+            self._profile_entry_points(profiler)
+
+        # API server host selection and circuit breaking
+        self._lb_mode = api_server_lb_mode or _read_cfg(
+            cfg_parser, 'global', 'API_SERVER_LB_MODE', None)
+        self._circuit_failure_threshold = int(_read_cfg(
+            cfg_parser, 'global', 'CIRCUIT_FAILURE_THRESHOLD', 0)) or None
+        self._circuit_reset_timeout = float(_read_cfg(
+            cfg_parser, 'global', 'CIRCUIT_RESET_TIMEOUT', 0)) or None
+        # Hosts writes are sent to in hash mode, all of them by default
+        self._write_hosts = [host.strip() for host in _read_cfg(
+            cfg_parser, 'global', 'API_SERVER_WRITE_HOSTS', '').split(',')
+            if host.strip()]
+        # Hedged reads, disabled by default
+        self._hedge_percentile = float(
+            api_server_hedge_percentile or _read_cfg(
+                cfg_parser, 'global', 'HEDGE_READS_PERCENTILE', 0)) or None
+        self._hedge_min_delay = float(_read_cfg(
+            cfg_parser, 'global', 'HEDGE_MIN_DELAY', 0)) or None
+
+        # Optional read-through cache of objects read by id, disabled by
+        # default. Objects are invalidated when updated or deleted through
+        # this client, changes made by other clients are seen once the
+        # cached entry expired.
+        self._object_cache = None
+        object_cache_size = int(object_cache_size or _read_cfg(
+            cfg_parser, 'global', 'OBJECT_CACHE_SIZE', 0))
+        if object_cache_size > 0:
+            object_cache_ttl = float(object_cache_ttl or _read_cfg(
+                cfg_parser, 'global', 'OBJECT_CACHE_TTL',
+                self._DEFAULT_OBJECT_CACHE_TTL))
+            self._object_cache = ObjectCache(
+                object_cache_size, object_cache_ttl, object_cache_type_ttls)
+
+        # Optional cache of fq_name <-> uuid resolutions, disabled by default
+        self._name_cache = None
+        name_cache_size = int(name_cache_size or _read_cfg(
+            cfg_parser, 'global', 'NAME_CACHE_SIZE', 0))
+        if name_cache_size > 0:
+            name_cache_ttl = float(name_cache_ttl or _read_cfg(
+                cfg_parser, 'global', 'NAME_CACHE_TTL',
+                self._DEFAULT_NAME_CACHE_TTL))
+            name_cache_negative_ttl = float(_read_cfg(
+                cfg_parser, 'global', 'NAME_CACHE_NEGATIVE_TTL',
+                self._DEFAULT_NAME_CACHE_NEGATIVE_TTL))
+            self._name_cache = NameCache(
+                name_cache_size, name_cache_ttl, name_cache_negative_ttl)
+
+        # Backoff between retries of requests failing on connection errors
+        # or 502/503 responses
+        if retry_policy is None:
+            retry_budget = int(_read_cfg(
+                cfg_parser, 'global', 'RETRY_BUDGET',
+                self._DEFAULT_RETRY_BUDGET))
+            retry_policy = RetryPolicy(
+                base_delay=float(_read_cfg(
+                    cfg_parser, 'global', 'RETRY_BASE_DELAY',
+                    self._DEFAULT_RETRY_BASE_DELAY)),
+                max_delay=float(_read_cfg(
+                    cfg_parser, 'global', 'RETRY_MAX_DELAY',
+                    self._DEFAULT_RETRY_MAX_DELAY)),
+                max_elapsed=float(_read_cfg(
+                    cfg_parser, 'global', 'RETRY_MAX_ELAPSED',
+                    self._DEFAULT_RETRY_MAX_ELAPSED)),
+                budget=RetryBudget(retry_budget, float(_read_cfg(
+                    cfg_parser, 'global', 'RETRY_BUDGET_RATE',
+                    self._DEFAULT_RETRY_BUDGET_RATE)))
+                if retry_budget > 0 else None)
+        self._retry_policy = retry_policy
+
         self.curl_logger = None
         if _read_cfg(cfg_parser, 'global', 'curl_log', False):
+            curl_log_ops = _read_cfg(cfg_parser, 'global', 'CURL_LOG_OPS',
+                                     None)
             self.curl_logger = CurlLogger(
-                    _read_cfg(cfg_parser, 'global', 'curl_log', False))
+                _read_cfg(cfg_parser, 'global', 'curl_log', False),
+                sample_rate=float(_read_cfg(
+                    cfg_parser, 'global', 'CURL_LOG_SAMPLE_RATE', 1)),
+                max_body_size=int(_read_cfg(
+                    cfg_parser, 'global', 'CURL_LOG_MAX_BODY_SIZE', 0)),
+                ops=[op.strip().lower() for op in curl_log_ops.split(',')]
+                if curl_log_ops else None)
 
         # Where client's view of world begins
         if not api_server_url:
@@ -541,7 +1513,11 @@ class VncApi(object):
         # Type-independent actions offered by server
         self._action_uri = ActionUriDict(self)
 
+        # Client wide headers. They are never mutated in place but replaced,
+        # so a request can use them while another thread updates them.
+        # Per-call headers travel with the request (see request_context)
         self._headers = self._DEFAULT_HEADERS.copy()
+        self._headers['Accept-Encoding'] = 'gzip, deflate'
         if self._authn_strategy == VncApi._KEYSTONE_AUTHN_STRATEGY:
             self._headers[hdr_client_tenant()] = self._tenant_name
 
@@ -566,7 +1542,8 @@ class VncApi(object):
 
         self._create_api_server_session()
 
-        retry_count = 6
+        retry_count = 0 if self._load_cached_homepage() else 6
+        attempt = 0
         while retry_count:
             try:
                 homepage = self._request(OP_GET, self._base_url,
@@ -577,16 +1554,37 @@ class VncApi(object):
                 logger.warn("Exception: %s", str(e))
                 if wait_for_connect:
                     # Retry connect infinitely when http retcode 503
-                    continue
+                    time.sleep(self._retry_policy.backoff(attempt))
+                    attempt += 1
                 elif retry_count:
-                    # Retry connect 60 times when http retcode 503
+                    # Retry connect 6 times when http retcode 503
                     retry_count -= 1
-                    time.sleep(1)
+                    time.sleep(self._retry_policy.backoff(attempt))
+                    attempt += 1
             else:
                 # connected successfully
                 break
+
+        if self._stale_discoveries:
+            thread = threading.Thread(target=self._revalidate_discoveries,
+                                      args=(self._stale_discoveries,))
+            thread.daemon = True
+            thread.start()
+            self._stale_discoveries = []
     # end __init__
 
+    def _profile_entry_points(self, profiler):
+        # the instance methods wrap the class ones, clients without
+        # profiler are left untouched
+        names = list(self._PROFILED_METHODS)
+        for object_type, _ in all_resource_type_tuples:
+            names.extend('%s%s' % (object_type, oper_str) for oper_str in
+                         ('_create', '_read', '_update', '_delete', 's_list'))
+        for name in names:
+            setattr(self, name, profiler.wrap(name, getattr(self, name)))
+    # end _profile_entry_points
+
+    @traced('create')
     @check_homepage
     def _object_create(self, res_type, obj):
         obj_cls = obj_type_to_vnc_class(res_type, __name__)
@@ -595,21 +1593,27 @@ class VncApi(object):
         obj._pending_ref_updates = set([])
         # Ignore fields with None value in json representation
         # encode props + refs in object body
-        obj_json_param = json.dumps(obj, default=self._obj_serializer)
-
-        json_body = '{"%s":%s}' % (res_type, obj_json_param)
+        with self.tracer.span('serialize'):
+            json_body = self._json.dumps({res_type: obj},
+                                         default=self._obj_serializer)
         content = self._request_server(
             OP_POST, obj_cls.create_uri, data=json_body)
 
-        obj_dict = json.loads(content)[res_type]
+        obj_dict = self._json.loads(content)[res_type]
         obj.uuid = obj_dict['uuid']
         obj.fq_name = obj_dict['fq_name']
+        if self._name_cache is not None:
+            # also replaces a negative entry of that name
+            self._name_cache.set_name(res_type, obj.fq_name, obj.uuid)
         if 'parent_type' in obj_dict:
             obj.parent_type = obj_dict['parent_type']
         if 'parent_uuid' in obj_dict:
             obj.parent_uuid = obj_dict['parent_uuid']
 
         obj.set_server_conn(self)
+        # parent children and referred objects back-refs changed
+        self._invalidate_cached_objects(getattr(obj, 'parent_uuid', None),
+                                        *self._obj_ref_uuids(obj))
 
         # encode any prop-<list|map> operations and
         # POST on /prop-collection-update
@@ -636,7 +1640,7 @@ class VncApi(object):
         obj.clear_pending_updates()
 
         if prop_coll_body['updates']:
-            prop_coll_json = json.dumps(prop_coll_body)
+            prop_coll_json = self._json.dumps(prop_coll_body)
             self._request_server(
                 OP_POST, self._action_uri['prop-collection-update'],
                 data=prop_coll_json)
@@ -644,6 +1648,7 @@ class VncApi(object):
         return obj.uuid
     # end _object_create
 
+    @traced('read')
     @check_homepage
     def _object_read(self, res_type, fq_name=None, fq_name_str=None,
                      id=None, ifmap_id=None, fields=None,
@@ -678,16 +1683,37 @@ class VncApi(object):
         if self._exclude_hrefs is not None:
             query_params['exclude_hrefs'] = True
 
-        response = self._request_server(OP_GET, uri, query_params)
+        obj_dict = None
+        use_cache = (self._object_cache is not None and
+                     self._caching_allowed())
+        if use_cache:
+            cache_variant = (frozenset(fields), exclude_back_refs is True,
+                             exclude_children is True)
+            obj_dict = self._object_cache.get_obj_dict(
+                res_type, id, cache_variant)
+        if obj_dict is None:
+            if use_cache:
+                cache_generation = self._object_cache.generation
+            response = self._request_server(OP_GET, uri, query_params)
+            obj_dict = response[res_type]
+            if use_cache:
+                self._object_cache.set_obj_dict(
+                    res_type, id, cache_variant, obj_dict, cache_generation)
+            if (self._name_cache is not None and self._caching_allowed() and
+                    'fq_name' in obj_dict):
+                self._name_cache.set_name(res_type, obj_dict['fq_name'], id)
 
-        obj_dict = response[res_type]
         # if requested child/backref fields are not in the result, that means
         # resource does not have child/backref of that type. Set it to None to
         # prevent VNC client lib to call again VNC API when user uses the get
         # child/backref method on that type in the 'resource_client' file
         [obj_dict.setdefault(field, None) for field
          in fields & (obj_cls.backref_fields | obj_cls.children_fields)]
-        obj = obj_cls.from_dict(**obj_dict)
+        started_at = time.time()
+        with self.tracer.span('from_dict'):
+            obj = obj_cls.from_dict(**obj_dict)
+        self.metrics.observe('from_dict_duration_seconds',
+                             time.time() - started_at, resource=res_type)
         obj.clear_pending_updates()
         obj.set_server_conn(self)
 
@@ -723,6 +1749,7 @@ class VncApi(object):
         return self._object_read(res_type, fq_name=draft_fq_name,
                                  fields=fields)
 
+    @traced('update')
     @check_homepage
     def _object_update(self, res_type, obj):
         obj_cls = obj_type_to_vnc_class(res_type, __name__)
@@ -731,59 +1758,63 @@ class VncApi(object):
         if not obj.uuid:
             obj.uuid = self.fq_name_to_id(res_type, obj.get_fq_name())
 
-        # Generate PUT on object only if some attr was modified
-        content = None
-        if obj.get_pending_updates():
-            # Ignore fields with None value in json representation
-            obj_json_param = json.dumps(obj, default=self._obj_serializer)
-            if obj_json_param:
-                json_body = '{"%s":%s}' % (res_type, obj_json_param)
+        try:
+            # Generate PUT on object only if some attr was modified
+            content = None
+            if obj.get_pending_updates():
+                # Ignore fields with None value in json representation
+                with self.tracer.span('serialize'):
+                    json_body = self._json.dumps({res_type: obj},
+                                                 default=self._obj_serializer)
                 uri = obj_cls.resource_uri_base[res_type] + '/' + obj.uuid
-                content = self._request_server(
-                    OP_PUT, uri, data=json_body)
+                content = self._request_server(OP_PUT, uri, data=json_body)
 
-        # Generate POST on /prop-collection-update if needed/pending
-        prop_coll_body = {'uuid': obj.uuid,
-                          'updates': []}
+            # Generate POST on /prop-collection-update if needed/pending
+            prop_coll_body = {'uuid': obj.uuid,
+                              'updates': []}
 
-        operations = []
-        for prop_name in obj._pending_field_list_updates:
-            operations.extend(obj._pending_field_list_updates[prop_name])
-        for prop_name in obj._pending_field_map_updates:
-            operations.extend(obj._pending_field_map_updates[prop_name])
-
-        for oper, elem_val, elem_pos in operations:
-            if isinstance(elem_val, GeneratedsSuper):
-                serialized_elem_value = elem_val.exportDict('')
-            else:
-                serialized_elem_value = elem_val
-
-            prop_coll_body['updates'].append(
-                {'field': prop_name, 'operation': oper,
-                 'value': serialized_elem_value, 'position': elem_pos})
-
-        if prop_coll_body['updates']:
-            prop_coll_json = json.dumps(prop_coll_body)
-            self._request_server(
-                OP_POST, self._action_uri['prop-collection-update'],
-                data=prop_coll_json)
+            operations = []
+            for prop_name in obj._pending_field_list_updates:
+                operations.extend(obj._pending_field_list_updates[prop_name])
+            for prop_name in obj._pending_field_map_updates:
+                operations.extend(obj._pending_field_map_updates[prop_name])
 
-        # Generate POST on /ref-update if needed/pending
-        for ref_name in obj._pending_ref_updates:
-            ref_orig = set(
-                [(x.get('uuid'), tuple(x.get('to', [])), x.get('attr'))
-                 for x in getattr(obj, '_original_' + ref_name, [])])
-            ref_new = set(
-                [(x.get('uuid'), tuple(x.get('to', [])), x.get('attr'))
-                 for x in getattr(obj, ref_name, [])])
-            for ref in ref_orig - ref_new:
-                self.ref_update(
-                    res_type, obj.uuid, ref_name, ref[0], list(ref[1]),
-                    'DELETE')
-            for ref in ref_new - ref_orig:
-                self.ref_update(
-                    res_type, obj.uuid, ref_name, ref[0], list(ref[1]),
-                    'ADD', ref[2])
+            for oper, elem_val, elem_pos in operations:
+                if isinstance(elem_val, GeneratedsSuper):
+                    serialized_elem_value = elem_val.exportDict('')
+                else:
+                    serialized_elem_value = elem_val
+
+                prop_coll_body['updates'].append(
+                    {'field': prop_name, 'operation': oper,
+                     'value': serialized_elem_value, 'position': elem_pos})
+
+            if prop_coll_body['updates']:
+                prop_coll_json = self._json.dumps(prop_coll_body)
+                self._request_server(
+                    OP_POST, self._action_uri['prop-collection-update'],
+                    data=prop_coll_json)
+
+            # Generate POST on /ref-update if needed/pending
+            for ref_name in obj._pending_ref_updates:
+                ref_orig = set(
+                    [(x.get('uuid'), tuple(x.get('to', [])), x.get('attr'))
+                     for x in getattr(obj, '_original_' + ref_name, [])])
+                ref_new = set(
+                    [(x.get('uuid'), tuple(x.get('to', [])), x.get('attr'))
+                     for x in getattr(obj, ref_name, [])])
+                for ref in ref_orig - ref_new:
+                    self.ref_update(
+                        res_type, obj.uuid, ref_name, ref[0], list(ref[1]),
+                        'DELETE')
+                for ref in ref_new - ref_orig:
+                    self.ref_update(
+                        res_type, obj.uuid, ref_name, ref[0], list(ref[1]),
+                        'ADD', ref[2])
+        finally:
+            # after the writes, a concurrent read must not cache the
+            # object as it was before them
+            self._invalidate_cached_objects(obj.uuid)
         obj.clear_pending_updates()
 
         return content
@@ -813,7 +1844,20 @@ class VncApi(object):
         id = result
         uri = obj_cls.resource_uri_base[res_type] + '/' + id
 
-        self._request_server(OP_DELETE, uri)
+        # parent children and referred objects back-refs change, they are
+        # known if the object is cached
+        related_uuids = None
+        if self._object_cache is not None:
+            related_uuids = self._cached_related_uuids(obj_cls, id)
+        try:
+            self._request_server(OP_DELETE, uri)
+        finally:
+            if related_uuids is not None:
+                self._invalidate_cached_objects(id, *related_uuids)
+            elif self._object_cache is not None:
+                self._object_cache.invalidate_all()
+            if self._name_cache is not None:
+                self._name_cache.invalidate_uuid(id)
     # end _object_delete
 
     def _object_get_default_id(self, res_type):
@@ -822,6 +1866,62 @@ class VncApi(object):
         return self.fq_name_to_id(res_type, obj_cls().get_fq_name())
     # end _object_get_default_id
 
+    def _caching_allowed(self):
+        # requests made on behalf of users are subject to RBAC, do not serve
+        # them content cached for this client
+        return 'X-AUTH-TOKEN' not in self._context_headers()
+    # end _caching_allowed
+
+    def _invalidate_cached_objects(self, *uuids):
+        if self._object_cache is not None:
+            self._object_cache.invalidate(*[u for u in uuids if u])
+    # end _invalidate_cached_objects
+
+    def _cached_related_uuids(self, obj_cls, id):
+        """Return the uuids of the parent and of the objects referred by
+        the object id, None if it is not cached with all its fields.
+        """
+        for (fields, _, _), obj_dict in self._object_cache.obj_dicts(id):
+            if not fields:
+                return [obj_dict.get('parent_uuid')] + [
+                    ref.get('uuid') for ref_field in obj_cls.ref_fields
+                    for ref in obj_dict.get(ref_field) or []]
+        return None
+    # end _cached_related_uuids
+
+    @staticmethod
+    def _obj_ref_uuids(obj):
+        return [ref.get('uuid') for ref_field in obj.ref_fields
+                for ref in getattr(obj, ref_field, None) or []]
+    # end _obj_ref_uuids
+
+    def name_cache_stats(self):
+        """Return hit/miss/eviction counters of the name cache, None if
+        the cache is not enabled.
+        """
+        if self._name_cache is None:
+            return None
+        return self._name_cache.stats()
+    # end name_cache_stats
+
+    def object_cache_stats(self):
+        """Return hit/miss/eviction counters of the object cache, None if
+        the cache is not enabled.
+        """
+        if self._object_cache is None:
+            return None
+        return self._object_cache.stats()
+    # end object_cache_stats
+
+    def hedge_stats(self):
+        """Return the hedged reads counters and current hedge delay, None
+        if reads are not hedged.
+        """
+        if not self._hedge_percentile:
+            return None
+        return self._api_server_session.hedge_stats()
+    # end hedge_stats
+
     def _obj_serializer_diff(self, obj):
         if hasattr(obj, 'serialize_to_json'):
             try:
@@ -836,175 +1936,376 @@ class VncApi(object):
     def _create_api_server_session(self):
         self._api_server_session = ApiServerSession(
             self._web_hosts, self._max_conns_per_pool,
-            self._max_pools, self.curl_logger)
+            self._max_pools, self.curl_logger, lb_mode=self._lb_mode,
+            circuit_failure_threshold=self._circuit_failure_threshold,
+            circuit_reset_timeout=self._circuit_reset_timeout,
+            hedge_percentile=self._hedge_percentile,
+            hedge_min_delay=self._hedge_min_delay,
+            write_hosts=self._write_hosts, transport=self._transport,
+            metrics=self.metrics if self.metrics.enabled else None)
     # end _create_api_server_session
 
-    def _discover(self):
-        """Discover the authn_url when not specified"""
-        try:
-            # Try keystone v3
-            self._authn_url = '/v3/auth/tokens'
+    def _discovery_key(self, name):
+        if name == 'keystone':
+            return 'keystone %s://%s:%s %s' % (
+                self._authn_protocol, self._authn_server, self._authn_port,
+                self._authn_token_url)
+        return 'homepage %s://%s:%s%s' % (
+            self._api_connect_protocol, ','.join(self._web_hosts),
+            self._web_port, self._base_url)
+    # end _discovery_key
+
+    def _cached_discovery(self, name):
+        """Return the cached discovery result, if any, and remember to
+        revalidate it if it is stale.
+        """
+        if self._discovery_cache is None:
+            return None
+        value, stale = self._discovery_cache.get(self._discovery_key(name))
+        if value is not None and stale:
+            self._stale_discoveries.append(name)
+        return value
+    # end _cached_discovery
+
+    def _cache_discovery(self, name, value):
+        if self._discovery_cache is not None:
+            self._discovery_cache.set(self._discovery_key(name), value)
+    # end _cache_discovery
+
+    def _revalidate_discoveries(self, names):
+        for name in names:
+            try:
+                if name == 'keystone':
+                    authn_url, _, cacheable = self._probe_authn_url()
+                    if cacheable:
+                        self._cache_discovery(name, authn_url)
+                        self._use_authn_url(authn_url)
+                else:
+                    # cached by _parse_homepage
+                    self._parse_homepage(self._request(
+                        OP_GET, self._base_url, retry_on_error=False))
+            except Exception as e:
+                logger = logging.getLogger(__name__)
+                logger.warn("Unable to revalidate the cached %s: %s",
+                            name, str(e))
+    # end _revalidate_discoveries
+
+    def _use_authn_url(self, authn_url):
+        if 'v2' in authn_url:
+            self._authn_body = self._v2_authn_body
+        else:
             self._authn_body = self._v3_authn_body
-            self._authenticate()
+        self._authn_url = authn_url
+    # end _use_authn_url
+
+    def _probe_authn_url(self):
+        """Probe keystone v3, return the authn_url to use, the (token,
+        expires_at) obtained if v3 is available and whether the result can
+        be cached (ie. keystone was reachable).
+        """
+        try:
+            response = self._post_authn(self._V3_AUTHN_URL,
+                                        self._v3_authn_body)
         except RuntimeError:
-            # Use keystone v2
-            self._authn_url = '/v2.0/tokens'
-            self._authn_body = self._v2_authn_body
+            return self._V2_AUTHN_URL, None, False
+        try:
+            token = self._parse_authn_response(self._V3_AUTHN_URL, response)
+        except (RuntimeError, KeyError):
+            return self._V2_AUTHN_URL, None, True
+        return self._V3_AUTHN_URL, token, True
+    # end _probe_authn_url
+
+    def _discover(self):
+        """Discover the authn_url when not specified, return the
+        (token, expires_at) obtained while probing keystone v3 if any.
+        """
+        authn_url = self._cached_discovery('keystone')
+        if authn_url is not None:
+            self._use_authn_url(authn_url)
+            return None
+        authn_url, token, cacheable = self._probe_authn_url()
+        self._use_authn_url(authn_url)
+        if cacheable:
+            self._cache_discovery('keystone', authn_url)
+        return token
     # end _discover
 
+    def _token_cache_key(self):
+        """Return the identity of the credentials and of the scope of the
+        tokens in the token cache file. The password is hashed, so that
+        tokens of a former password are not reused either.
+        """
+        password = self._password or ''
+        if isinstance(password, unicode):
+            password = password.encode('utf-8')
+        return '%s %s %s %s %s %s %s %s' % (
+            self._authn_token_url, self._authn_server, self._authn_port,
+            self._authn_url, self._domain_name, self._username,
+            self._tenant_name, hashlib.sha256(password).hexdigest())
+    # end _token_cache_key
+
+    def _fetch_auth_token(self):
+        """Get a new token from keystone, return (token, expires_at)."""
+        authn_url = self._authn_url
+        response = self._post_authn(authn_url, self._authn_body)
+        return self._parse_authn_response(authn_url, response)
+    # end _fetch_auth_token
+
+    def _post_authn(self, authn_url, authn_body):
+        if self._authn_token_url:
+            url = self._authn_token_url
+        else:
+            url = "%s://%s:%s%s" % (
+                self._authn_protocol,
+                self._authn_server,
+                self._authn_port,
+                authn_url,
+            )
+        verify_kwargs = {}
+        if self._ksinsecure:
+            verify_kwargs['verify'] = False
+        elif self._use_ks_certs:
+            verify_kwargs['verify'] = self._kscertbundle
+        # bounded by the deadline of the request re-authenticated if any
+        timeout = self._attempt_timeout(getattr(
+            self._request_context_local, 'authn_deadline', None))
+        try:
+            response = self._ks_session.post(
+                url,
+                data=authn_body,
+                headers=self._DEFAULT_AUTHN_HEADERS,
+                timeout=timeout,
+                **verify_kwargs)
+        except Timeout as e:
+            raise TimeOutError('No response from keystone (%s) in time: %s'
+                               % (url, e))
+        except Exception as e:
+            errmsg = ('Unable to connect to keystone (%s) for authentication. '
+                'Exception %s' % (url, e))
+            raise RuntimeError(errmsg)
+        return response
+    # end _post_authn
+
+    def _parse_authn_response(self, authn_url, response):
+        if (response.status_code == 200) or (response.status_code == 201):
+            try:
+                authn_content = self._json.loads(response.content)
+            except ValueError:
+                authn_content = {}
+            if 'v2' in authn_url:
+                token = authn_content['access']['token']
+                return (token['id'], parse_token_expiry(token.get('expires')))
+            expires_at = parse_token_expiry(
+                authn_content.get('token', {}).get('expires_at'))
+            return (response.headers['x-subject-token'], expires_at)
+        else:
+            raise RuntimeError('Authentication Failure')
+    # end _parse_authn_response
+
     # Authenticate with configured service
-    def _authenticate(self, response=None, headers=None):
+    def _authenticate(self, response=None, headers=None, rejected_token=None):
+        """Set a keystone token in headers. Called on a 401 response
+        (response given), a new token is only fetched if rejected_token is
+        still the current one, otherwise a new token is always fetched.
+        """
         if self._authn_strategy == VncApi._NOAUTH_AUTHN_STRATEGY:
             return headers
 
         elif self._authn_strategy == VncApi._KEYSTONE_AUTHN_STRATEGY:
-            if self._authn_token_url:
-                url = self._authn_token_url
-            else:
-                url = "%s://%s:%s%s" % (
-                    self._authn_protocol,
-                    self._authn_server,
-                    self._authn_port,
-                    self._authn_url,
-                )
             new_headers = headers or {}
-            try:
-                if self._ksinsecure:
-                    response = requests.post(
-                        url,
-                        data=self._authn_body,
-                        headers=self._DEFAULT_AUTHN_HEADERS,
-                        verify=False,
-                    )
-                elif not self._ksinsecure and self._use_ks_certs:
-                    response = requests.post(
-                        url,
-                        data=self._authn_body,
-                        headers=self._DEFAULT_AUTHN_HEADERS,
-                        verify=self._kscertbundle,
-                    )
-                else:
-                    response = requests.post(
-                        url,
-                        data=self._authn_body,
-                        headers=self._DEFAULT_AUTHN_HEADERS,
-                    )
-            except Exception as e:
-                errmsg = ('Unable to connect to keystone (%s) for authentication. '
-                    'Exception %s' % (url, e))
-                raise RuntimeError(errmsg)
-
-            if (response.status_code == 200) or (response.status_code == 201):
-                # plan is to re-issue original request with new token
-                if 'v2' in self._authn_url:
-                    authn_content = json.loads(response.text)
-                    self._auth_token = authn_content['access']['token']['id']
-                else:
-                    self._auth_token = response.headers['x-subject-token']
-                new_headers['X-AUTH-TOKEN'] = self._auth_token
-                return new_headers
-            else:
-                raise RuntimeError('Authentication Failure')
+            # plan is to re-issue original request with new token
+            self._auth_token = self._token_manager.get_token(
+                refresh=response is None, rejected_token=rejected_token)
+            new_headers['X-AUTH-TOKEN'] = self._auth_token
+            return new_headers
     # end _authenticate
 
-    def _http_get(self, uri, headers=None, query_params=None):
+    @contextmanager
+    def _authn_deadline(self, deadline):
+        """Bound the keystone requests made by the thread within the
+        context by deadline.
+        """
+        local = self._request_context_local
+        previous = getattr(local, 'authn_deadline', None)
+        local.authn_deadline = deadline
+        try:
+            yield
+        finally:
+            local.authn_deadline = previous
+    # end _authn_deadline
+
+    def _refresh_auth_headers(self):
+        """Renew the keystone token about to expire before it is used."""
+        if (self._token_manager is None or self._auth_token_input or
+                not self._token_manager.has_token()):
+            return
+        self._use_auth_token(self._token_manager.get_token())
+    # end _refresh_auth_headers
+
+    def _use_auth_token(self, token):
+        self._auth_token = token
+        if self._headers.get('X-AUTH-TOKEN') != token:
+            self._headers = dict(self._headers, **{'X-AUTH-TOKEN': token})
+    # end _use_auth_token
+
+    def _response_content(self, response, stream=False):
+        # the body of a successful streamed response is handed over as an
+        # iterator of chunks, error bodies are always read
+        if stream and response.status_code == 200:
+            return response.iter_content(self.STREAM_CHUNK_SIZE)
+        if response.status_code in (502, 503):
+            # picked up by the retry of _request
+            self._request_context_local.retry_after = parse_retry_after(
+                response.headers.get('Retry-After'))
+        return response.content
+    # end _response_content
+
+    def _http_request(self, method, uri, headers=None, query_params=None,
+                      body=None, stream=False, timeout=None):
         url = "%s://%s:%s%s" % (self._api_connect_protocol,
                                 self._web_host, self._web_port, uri)
-        if self._apiinsecure:
-            response = self._api_server_session.get(
-                url, headers=headers, params=query_params, verify=False)
-        elif not self._apiinsecure and self._use_api_certs:
-            response = self._api_server_session.get(
-                url, headers=headers, params=query_params,
-                verify=self._apicertbundle)
-        else:
-            response = self._api_server_session.get(
-                url, headers=headers, params=query_params)
-        # print 'Sending Request URL: ' + pformat(url)
-        # print '                Headers: ' + pformat(headers)
-        # print '                QParams: ' + pformat(query_params)
-        # response = self._api_server_session.get(url, headers = headers,
-        #                                        params = query_params)
-        # print 'Received Response: ' + pformat(response.text)
-        return (response.status_code, response.text)
+        # certificate verification is applied by the transport
+        kwargs = {'headers': headers}
+        if query_params is not None:
+            kwargs['params'] = query_params
+        body_size = 0
+        if body is not None:
+            if isinstance(body, unicode):
+                body = body.encode('utf-8')
+            body_size = len(body)
+            if (self._request_compression_threshold and
+                    body_size > self._request_compression_threshold):
+                body = self._gzip(body)
+                kwargs['headers'] = dict(headers or {},
+                                         **{'Content-Encoding': 'gzip'})
+            kwargs['data'] = body
+        if stream:
+            kwargs['stream'] = True
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        with self.tracer.span('http', method=method, uri=uri) as span:
+            response = self._api_server_session.crud(method, url, **kwargs)
+            span.set_attribute('status', response.status_code)
+        content = self._response_content(response, stream)
+        self._count_transfer(body_size, len(body or ''), response, stream)
+        return (response.status_code, content)
+    # end _http_request
+
+    def _gzip(self, data):
+        compressor = zlib.compressobj(self._REQUEST_COMPRESSION_LEVEL,
+                                      zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    # end _gzip
+
+    def _count_transfer(self, request_bytes, request_wire_bytes, response,
+                        stream):
+        """Account the body sizes of a request and of its response, before
+        and after compression. Successful streamed responses are not
+        accounted.
+        """
+        transfer = {'request_bytes': request_bytes,
+                    'request_wire_bytes': request_wire_bytes,
+                    'response_bytes': 0, 'response_wire_bytes': 0}
+        counted = not stream or response.status_code != 200
+        if counted:
+            transfer['response_bytes'] = len(response.content)
+            try:
+                transfer['response_wire_bytes'] = response.raw.tell()
+            except AttributeError:
+                transfer['response_wire_bytes'] = transfer['response_bytes']
+        self._request_context_local.last_transfer = transfer
+        with self._transfer_stats_lock:
+            stats = self._transfer_stats
+            stats['requests'] += 1
+            if counted:
+                stats['responses'] += 1
+            for key, value in transfer.items():
+                stats[key] += value
+    # end _count_transfer
+
+    def _collect_metrics(self, metrics):
+        for key, value in self.transfer_stats().items():
+            metrics.set('%s_total' % key, value, MetricsRegistry.COUNTER)
+        self._api_server_session.collect_metrics(metrics)
+    # end _collect_metrics
+
+    def transfer_stats(self):
+        """Return the number of requests sent and of responses accounted
+        by the client, and the sizes in bytes of their bodies before
+        (*_bytes) and after (*_wire_bytes) compression.
+        """
+        with self._transfer_stats_lock:
+            return dict(self._transfer_stats)
+    # end transfer_stats
+
+    def last_transfer_stats(self):
+        """Return the body sizes in bytes of the last request sent by the
+        current thread and of its response, None if there is none.
+        """
+        return getattr(self._request_context_local, 'last_transfer', None)
+    # end last_transfer_stats
+
+    def _http_get(self, uri, headers=None, query_params=None, stream=False,
+                  timeout=None):
+        return self._http_request('get', uri, headers=headers,
+                                  query_params=query_params, stream=stream,
+                                  timeout=timeout)
     # end _http_get
 
-    def _http_post(self, uri, body, headers):
-        url = "%s://%s:%s%s" % (self._api_connect_protocol,
-                                self._web_host, self._web_port, uri)
-        if self._apiinsecure:
-            response = self._api_server_session.post(
-                url, data=body, headers=headers, verify=False)
-        elif not self._apiinsecure and self._use_api_certs:
-            response = self._api_server_session.post(
-                url, data=body, headers=headers,
-                verify=self._apicertbundle)
-        else:
-            response = self._api_server_session.post(
-                url, data=body, headers=headers)
-        return (response.status_code, response.text)
+    def _http_post(self, uri, body, headers, stream=False, timeout=None):
+        return self._http_request('post', uri, headers=headers, body=body,
+                                  stream=stream, timeout=timeout)
     # end _http_post
 
-    def _http_delete(self, uri, body, headers):
-        url = "%s://%s:%s%s" % (self._api_connect_protocol,
-                                self._web_host, self._web_port, uri)
-        if self._apiinsecure:
-            response = self._api_server_session.delete(
-                url, data=body, headers=headers, verify=False)
-        elif not self._apiinsecure and self._use_api_certs:
-            response = self._api_server_session.delete(
-                url, data=body, headers=headers,
-                verify=self._apicertbundle)
-        else:
-            response = self._api_server_session.delete(
-                url, data=body, headers=headers)
-        return (response.status_code, response.text)
+    def _http_delete(self, uri, body, headers, timeout=None):
+        return self._http_request('delete', uri, headers=headers, body=body,
+                                  timeout=timeout)
     # end _http_delete
 
-    def _http_put(self, uri, body, headers):
-        url = "%s://%s:%s%s" % (self._api_connect_protocol,
-                                self._web_host, self._web_port, uri)
-        if self._apiinsecure:
-            response = self._api_server_session.put(
-                url, data=body, headers=headers, verify=False)
-        elif not self._apiinsecure and self._use_api_certs:
-            response = self._api_server_session.put(
-                url, data=body, headers=headers,
-                verify=self._apicertbundle)
-        else:
-            response = self._api_server_session.put(
-                url, data=body, headers=headers)
-        return (response.status_code, response.text)
-    # end _http_delete
+    def _http_put(self, uri, body, headers, timeout=None):
+        return self._http_request('put', uri, headers=headers, body=body,
+                                  timeout=timeout)
+    # end _http_put
 
     def _parse_homepage(self, py_obj):
         srv_root_url = py_obj['href']
-        self._srv_root_url = srv_root_url
-
+        homepage = {'href': srv_root_url, 'collection': {},
+                    'resource-base': {}, 'action': {}}
         for link in py_obj['links']:
-            # strip base from *_url to get *_uri
-            uri = link['link']['href'].replace(srv_root_url, '')
-            if link['link']['rel'] == 'collection':
-                cls = obj_type_to_vnc_class(link['link']['name'],
-                                            __name__)
-                if not cls:
-                    continue
-                cls.create_uri = uri
-            elif link['link']['rel'] == 'resource-base':
-                cls = obj_type_to_vnc_class(link['link']['name'],
-                                            __name__)
-                if not cls:
-                    continue
-                resource_type = link['link']['name']
-                cls.resource_uri_base[resource_type] = uri
-            elif link['link']['rel'] == 'action':
-                act_type = link['link']['name']
-                self._action_uri[act_type] = uri
+            if link['link']['rel'] in homepage:
+                # strip base from *_url to get *_uri
+                uri = link['link']['href'].replace(srv_root_url, '')
+                homepage[link['link']['rel']][link['link']['name']] = uri
+        self._use_homepage(homepage)
+        self._cache_discovery('homepage', homepage)
     # end _parse_homepage
 
+    def _use_homepage(self, homepage):
+        """Set the URIs of a homepage parsed by _parse_homepage."""
+        _homepage_uris['collection'].update(homepage['collection'])
+        _homepage_uris['resource-base'].update(homepage['resource-base'])
+        # resource classes not imported yet get their URIs when they are
+        resource_types = (set(homepage['collection']) |
+                          set(homepage['resource-base']))
+        for resource_type in resource_types:
+            cls = globals().get(CamelCase(resource_type))
+            if cls:
+                _set_homepage_uris(cls)
+        self._action_uri.update(homepage['action'])
+        self._srv_root_url = homepage['href']
+    # end _use_homepage
+
+    def _load_cached_homepage(self):
+        homepage = self._cached_discovery('homepage')
+        if homepage is None:
+            return False
+        self._use_homepage(homepage)
+        return True
+    # end _load_cached_homepage
+
     def _find_url(self, json_body, resource_name):
         rname = unicode(resource_name)
-        py_obj = json.loads(json_body)
+        py_obj = self._json.loads(json_body)
         pprint.pprint(py_obj)
         for link in py_obj['links']:
             if link['link']['name'] == rname:
@@ -1034,49 +2335,165 @@ class VncApi(object):
     # end _read_args_to_id
 
     def _request_server(self, op, url, data=None, retry_on_error=True,
-                        retry_after_authn=False, retry_count=30):
+                        retry_after_authn=False, retry_count=30,
+                        headers=None, stream=False):
         if not self._srv_root_url:
             raise ConnectionError("Unable to retrive the api server root url.")
 
         return self._request(
             op, url, data=data, retry_on_error=retry_on_error,
-            retry_after_authn=retry_after_authn, retry_count=retry_count)
+            retry_after_authn=retry_after_authn, retry_count=retry_count,
+            headers=headers, stream=stream)
     # end _request_server
 
+    def _context_headers(self, headers=None):
+        """Merge headers of the current request context with the per-call
+        ones.
+        """
+        context_headers = {}
+        for ctx_headers in getattr(self._request_context_local,
+                                   'headers', []):
+            context_headers.update(ctx_headers)
+        if headers:
+            context_headers.update(headers)
+        return context_headers
+    # end _context_headers
+
+    def _context_deadline(self):
+        """Return the earliest of the deadlines of the current request
+        contexts and of the client request timeout, None if there is none.
+        """
+        deadlines = list(getattr(self._request_context_local,
+                                 'deadlines', []))
+        if self._request_timeout:
+            deadlines.append(time.time() + self._request_timeout)
+        return min(deadlines) if deadlines else None
+    # end _context_deadline
+
+    def _attempt_timeout(self, deadline):
+        """Return the (connect, read) socket timeouts of an attempt to
+        send a request which must complete before deadline.
+        """
+        if deadline is None:
+            return (self._connect_timeout, None)
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeOutError('Deadline exceeded')
+        return (min(self._connect_timeout or remaining, remaining),
+                remaining)
+    # end _attempt_timeout
+
+    def _retry_sleep(self, delay, deadline):
+        if deadline is not None and time.time() + delay >= deadline:
+            raise TimeOutError('Deadline exceeded')
+        time.sleep(delay)
+    # end _retry_sleep
+
     def _request(self, op, url, data=None, retry_on_error=True,
-                 retry_after_authn=False, retry_count=30):
+                 retry_after_authn=False, retry_count=30, headers=None,
+                 stream=False, deadline=None):
+        """Issue a request to the API server and return the decoded JSON
+        response of a GET or the raw response of other operations. With
+        stream, GET and POST responses are returned undecoded as an
+        iterator of chunks.
+
+        The request, including its retries and re-authentication, must
+        complete before deadline (epoch time), by default the deadline of
+        the request context or client request timeout, or TimeOutError is
+        raised.
+        """
+        if not self.metrics.enabled and not self.tracer.enabled:
+            return self._send_request(
+                op, url, data=data, retry_on_error=retry_on_error,
+                retry_after_authn=retry_after_authn, retry_count=retry_count,
+                headers=headers, stream=stream, deadline=deadline)
+        started_at = time.time()
+        outcome = 'ok'
+        labels = {'method': _OP_METHODS.get(op, op),
+                  'resource': _metrics_resource(url)}
+        try:
+            with self.tracer.span('request', **labels) as span:
+                if (span.request_id and 'X-Request-Id' not in
+                        self._context_headers(headers)):
+                    headers = dict(headers or {},
+                                   **{'X-Request-Id': span.request_id})
+                return self._send_request(
+                    op, url, data=data, retry_on_error=retry_on_error,
+                    retry_after_authn=retry_after_authn,
+                    retry_count=retry_count, headers=headers, stream=stream,
+                    deadline=deadline)
+        except Exception as e:
+            outcome = e.__class__.__name__
+            raise
+        finally:
+            self.metrics.observe('request_duration_seconds',
+                                 time.time() - started_at, **labels)
+            self.metrics.inc('requests_total', outcome=outcome, **labels)
+    # end _request
+
+    def _send_request(self, op, url, data=None, retry_on_error=True,
+                      retry_after_authn=False, retry_count=30, headers=None,
+                      stream=False, deadline=None):
+        context_headers = self._context_headers(headers)
+        if deadline is None:
+            deadline = self._context_deadline()
+        http_kwargs = {'stream': True} if stream else {}
+        if 'X-AUTH-TOKEN' in context_headers:
+            # forwarding a user token, do not replace it with ours
+            retry_after_authn = True
         retried = 0
+        started_at = time.time()
         while True:
-            headers = self._headers
-            user_token = headers.pop('X-USER-TOKEN', None)
-            if user_token:
-                headers = self._headers.copy()
-                headers['X-AUTH-TOKEN'] = user_token
-                retry_after_authn = True
+            with self._authn_deadline(deadline):
+                self._refresh_auth_headers()
+            request_headers = self._headers.copy()
+            request_headers.update(context_headers)
+            self._request_context_local.retry_after = None
+            if deadline is not None or self._connect_timeout:
+                http_kwargs['timeout'] = self._attempt_timeout(deadline)
             try:
                 if (op == OP_GET):
                     (status, content) = self._http_get(
-                        url, headers=headers, query_params=data)
-                    if status == 200:
-                        content = json.loads(content)
+                        url, headers=request_headers, query_params=data,
+                        **http_kwargs)
+                    if status == 200 and not stream:
+                        decode_started_at = time.time()
+                        with self.tracer.span('deserialize'):
+                            content = self._json.loads(content)
+                        self.metrics.observe(
+                            'json_decode_duration_seconds',
+                            time.time() - decode_started_at)
                 elif (op == OP_POST):
                     (status, content) = self._http_post(
-                        url, body=data, headers=headers)
+                        url, body=data, headers=request_headers,
+                        **http_kwargs)
                 elif (op == OP_DELETE):
                     (status, content) = self._http_delete(
-                        url, body=data, headers=headers)
+                        url, body=data, headers=request_headers,
+                        **http_kwargs)
                 elif (op == OP_PUT):
                     (status, content) = self._http_put(
-                        url, body=data, headers=headers)
+                        url, body=data, headers=request_headers,
+                        **http_kwargs)
                 else:
                     raise ValueError
+            except ReadTimeout:
+                # the request may have been processed, it is not retried
+                raise TimeOutError('No response from %s within %ss' %
+                                   (url, http_kwargs['timeout'][1]))
             except ConnectionError:
-                if (not retry_on_error or not retry_count):
+                if not retry_on_error or retried >= retry_count:
                     raise ConnectionError
 
-                time.sleep(1)
-                self._create_api_server_session()
-                retry_count -= 1
+                # the session already dropped the connections of the failed
+                # hosts, the others are kept
+                delay = self._retry_policy.next_delay(
+                    retried, time.time() - started_at)
+                if delay is None:
+                    raise ConnectionError
+                self.metrics.inc('retries_total', status='connection_error')
+                self._retry_sleep(delay, deadline)
+                retried += 1
                 continue
 
             if status in [200, 202]:
@@ -1085,10 +2502,19 @@ class VncApi(object):
             # Exception Response, see if it can be resolved
             if ((status == 401) and (not self._auth_token_input) and
                     (not retry_after_authn)):
-                self._headers = self._authenticate(content, self._headers)
+                if deadline is not None and time.time() >= deadline:
+                    raise TimeOutError('Deadline exceeded')
+                # concurrent requests rejected with the same token share
+                # a single renewal
+                with self._authn_deadline(deadline):
+                    self._headers = self._authenticate(
+                        content, self._headers.copy(),
+                        rejected_token=request_headers.get('X-AUTH-TOKEN'))
+                self.metrics.inc('reauthentications_total')
                 # Recursive call after authentication (max 1 level)
-                content = self._request(
-                    op, url, data=data, retry_after_authn=True)
+                content = self._send_request(
+                    op, url, data=data, retry_after_authn=True,
+                    headers=headers, stream=stream, deadline=deadline)
 
                 return content
             elif status == 404:
@@ -1109,11 +2535,17 @@ class VncApi(object):
                 # 502: API server died after accepting request, so retry
                 # 503: no API server available even before sending the request
                 retried += 1
-                if retried >= retry_count:
+                delay = None
+                if retried < retry_count:
+                    delay = self._retry_policy.next_delay(
+                        retried - 1, time.time() - started_at,
+                        self._request_context_local.retry_after)
+                if delay is None:
                     raise ServiceUnavailableError(
                         'Service Unavailable Timeout %d' % status)
 
-                time.sleep(1)
+                self.metrics.inc('retries_total', status=str(status))
+                self._retry_sleep(delay, deadline)
                 continue
             elif status == 400:
                 raise BadRequest(status, content)
@@ -1122,8 +2554,7 @@ class VncApi(object):
             else:  # Unknown Error
                 raise HttpError(status, content)
         # end while True
-
-    # end _request_server
+    # end _send_request
 
     def _prop_collection_post(self, obj_uuid, obj_field,
                               oper, value, position):
@@ -1139,8 +2570,11 @@ class VncApi(object):
         if position:
             oper_param['position'] = position
         dict_body = {'uuid': obj_uuid, 'updates': [oper_param]}
-        return self._request_server(
-            OP_POST, uri, data=json.dumps(dict_body))
+        try:
+            return self._request_server(
+                OP_POST, uri, data=self._json.dumps(dict_body))
+        finally:
+            self._invalidate_cached_objects(obj_uuid)
     # end _prop_collection_post
 
     def _prop_collection_get(self, obj_uuid, obj_field, position):
@@ -1225,10 +2659,10 @@ class VncApi(object):
         if device_list:
             body['params'] = { 'device_list': device_list }
 
-        json_body = json.dumps(body)
+        json_body = self._json.dumps(body)
         uri = self._action_uri['execute-job']
         content = self._request_server(OP_POST, uri, data=json_body)
-        return json.loads(content)
+        return self._json.loads(content)
     # end execute_job
 
     @check_homepage
@@ -1236,11 +2670,11 @@ class VncApi(object):
                    ref_fq_name, operation, attr=None):
         if ref_type.endswith(('_refs', '-refs')):
             ref_type = ref_type[:-5].replace('_', '-')
-        json_body = json.dumps({'type': obj_type, 'uuid': obj_uuid,
-                                'ref-type': ref_type, 'ref-uuid': ref_uuid,
-                                'ref-fq-name': ref_fq_name,
-                                'operation': operation, 'attr': attr},
-                               default=self._obj_serializer_diff)
+        json_body = self._json.dumps(
+            {'type': obj_type, 'uuid': obj_uuid, 'ref-type': ref_type,
+             'ref-uuid': ref_uuid, 'ref-fq-name': ref_fq_name,
+             'operation': operation, 'attr': attr},
+            default=self._obj_serializer_diff)
         uri = self._action_uri['ref-update']
         try:
             content = self._request_server(OP_POST, uri, data=json_body)
@@ -1248,15 +2682,18 @@ class VncApi(object):
             if he.status_code == 404:
                 return None
             raise he
+        finally:
+            # both ends of the reference changed
+            self._invalidate_cached_objects(obj_uuid, ref_uuid)
 
-        return json.loads(content)['uuid']
+        return self._json.loads(content)['uuid']
     # end ref_update
 
     @check_homepage
     def ref_relax_for_delete(self, obj_uuid, ref_uuid):
         # don't account for reference of <obj_uuid> in delete of
         # <ref_uuid> in future
-        json_body = json.dumps({'uuid': obj_uuid, 'ref-uuid': ref_uuid})
+        json_body = self._json.dumps({'uuid': obj_uuid, 'ref-uuid': ref_uuid})
         uri = self._action_uri['ref-relax-for-delete']
 
         try:
@@ -1266,7 +2703,7 @@ class VncApi(object):
                 return None
             raise he
 
-        return json.loads(content)['uuid']
+        return self._json.loads(content)['uuid']
     # end ref_relax_for_delete
 
     def obj_to_id(self, obj):
@@ -1275,28 +2712,151 @@ class VncApi(object):
 
     @check_homepage
     def fq_name_to_id(self, obj_type, fq_name):
-        json_body = json.dumps({'type': obj_type, 'fq_name': fq_name})
+        use_cache = self._name_cache is not None and self._caching_allowed()
+        if use_cache:
+            found, uuid = self._name_cache.lookup_uuid(obj_type, fq_name)
+            if found and uuid is None:
+                raise NoIdError('%s %s' % (obj_type, ':'.join(fq_name)))
+            elif found:
+                return uuid
+
+        json_body = self._json.dumps({'type': obj_type, 'fq_name': fq_name})
         uri = self._action_uri['name-to-id']
         try:
             content = self._request_server(OP_POST, uri, data=json_body)
+        except NoIdError:
+            if use_cache:
+                self._name_cache.set_unknown_fq_name(obj_type, fq_name)
+            raise
         except HttpError as he:
             if he.status_code == 404:
                 return None
             raise he
 
-        return json.loads(content)['uuid']
+        uuid = self._json.loads(content)['uuid']
+        if use_cache:
+            self._name_cache.set_name(obj_type, fq_name, uuid)
+        return uuid
     # end fq_name_to_id
 
+    @staticmethod
+    def _chunks(items, chunk_size):
+        for index in range(0, len(items), chunk_size):
+            yield items[index:index + chunk_size]
+    # end _chunks
+
+    @check_homepage
+    def fq_names_to_ids(self, obj_type, fq_names, chunk_size=None):
+        """Resolve many fq_names of a same type with a few list requests.
+
+        :param obj_type: resource type of the fq_names
+        :param fq_names: list of fq_names (list of strings)
+        :param chunk_size: maximum number of fq_names resolved per request,
+            defaults to BULK_RESOLVE_CHUNK_SIZE
+        :returns: list of uuids in the order of fq_names, None for unknown
+            names
+        """
+        obj_type = obj_type.replace('_', '-')
+        use_cache = self._name_cache is not None and self._caching_allowed()
+        resolved = {}
+        unresolved = []
+        for fq_name in set(tuple(fq_name) for fq_name in fq_names):
+            if use_cache:
+                found, uuid = self._name_cache.lookup_uuid(obj_type, fq_name)
+                if found:
+                    resolved[fq_name] = uuid
+                    continue
+            unresolved.append(list(fq_name))
+
+        for chunk in self._chunks(unresolved,
+                                  chunk_size or self.BULK_RESOLVE_CHUNK_SIZE):
+            response = self.resource_list(obj_type, fq_names=chunk)
+            for res in response['%ss' % obj_type]:
+                resolved[tuple(res['fq_name'])] = res['uuid']
+                if use_cache:
+                    self._name_cache.set_name(
+                        obj_type, res['fq_name'], res['uuid'])
+            if use_cache:
+                for fq_name in chunk:
+                    if tuple(fq_name) not in resolved:
+                        self._name_cache.set_unknown_fq_name(obj_type,
+                                                             fq_name)
+
+        return [resolved.get(tuple(fq_name)) for fq_name in fq_names]
+    # end fq_names_to_ids
+
+    @check_homepage
+    def ids_to_fq_names(self, ids, obj_type=None, chunk_size=None):
+        """Resolve many uuids to fq_names with a few list requests.
+
+        Without obj_type, the type of a uuid not resolved yet is found with
+        an id-to-name request, then the remaining uuids are looked for in
+        a list of that type. A list of uuids of a single type takes one
+        more request than when the type is given.
+
+        :param ids: list of uuids
+        :param obj_type: resource type of all the uuids, if known
+        :param chunk_size: maximum number of uuids resolved per request,
+            defaults to BULK_RESOLVE_CHUNK_SIZE
+        :returns: list of fq_names in the order of ids, None for unknown
+            uuids
+        """
+        use_cache = self._name_cache is not None and self._caching_allowed()
+        resolved = {}
+        unresolved = []
+        for id in OrderedDict.fromkeys(ids):
+            if use_cache:
+                found, fq_name_type = self._name_cache.lookup_fq_name_type(id)
+                if found:
+                    resolved[id] = fq_name_type and fq_name_type[0]
+                    continue
+            unresolved.append(id)
+        chunk_size = chunk_size or self.BULK_RESOLVE_CHUNK_SIZE
+
+        if obj_type is not None:
+            self._list_fq_names(obj_type.replace('_', '-'), unresolved,
+                                chunk_size, resolved, use_cache)
+            return [resolved.get(id) for id in ids]
+
+        while unresolved:
+            id = unresolved.pop(0)
+            try:
+                resolved[id], obj_type = self.id_to_fq_name_type(id)
+            except NoIdError:
+                continue
+            self._list_fq_names(obj_type, unresolved, chunk_size, resolved,
+                                use_cache)
+            unresolved = [id for id in unresolved if id not in resolved]
+        return [resolved.get(id) for id in ids]
+    # end ids_to_fq_names
+
+    def _list_fq_names(self, obj_type, ids, chunk_size, resolved,
+                       use_cache):
+        """Add to resolved the fq_names of the uuids of ids which are of
+        type obj_type, listed chunk_size at a time.
+        """
+        for chunk in self._chunks(ids, chunk_size):
+            response = self.resource_list(obj_type, obj_uuids=chunk)
+            for res in response['%ss' % obj_type]:
+                resolved[res['uuid']] = res['fq_name']
+                if use_cache:
+                    self._name_cache.set_name(
+                        obj_type, res['fq_name'], res['uuid'])
+            # a uuid not found here may still exist with another type, do
+            # not cache it as unknown
+    # end _list_fq_names
+
     @check_homepage
     def create_int_pool(self, pool_name, start, end):
-        json_body = json.dumps({'pool': pool_name, 'start': start, 'end': end})
+        json_body = self._json.dumps({'pool': pool_name, 'start': start,
+                                      'end': end})
         uri = self._action_uri['int-pools']
         self._request_server(OP_POST, uri, data=json_body)
     # end create_int_pool
 
     @check_homepage
     def delete_int_pool(self, pool_name):
-        json_body = json.dumps({'pool': pool_name})
+        json_body = self._json.dumps({'pool': pool_name})
         uri = self._action_uri['int-pools']
         self._request_server(OP_DELETE, uri, data=json_body)
     # end delete_int_pool
@@ -1311,42 +2871,55 @@ class VncApi(object):
 
     @check_homepage
     def allocate_int(self, pool_name, owner=""):
-        json_body = json.dumps({'pool': pool_name, "owner": owner})
+        json_body = self._json.dumps({'pool': pool_name, "owner": owner})
         uri = self._action_uri['int-pool']
         content = self._request_server(OP_POST, uri, data=json_body)
-        return json.loads(content)['value']
+        return self._json.loads(content)['value']
     # end allocate_int
 
     @check_homepage
     def set_int(self, pool_name, value, owner=""):
-        json_body = json.dumps({'pool': pool_name, 'owner': owner, 'value': value})
+        json_body = self._json.dumps({'pool': pool_name, 'owner': owner,
+                                      'value': value})
         uri = self._action_uri['int-pool']
         self._request_server(OP_POST, uri, data=json_body)
     # end set_int
 
     @check_homepage
     def deallocate_int(self, pool_name, index):
-        json_body = json.dumps({'pool': pool_name, 'value': index})
+        json_body = self._json.dumps({'pool': pool_name, 'value': index})
         uri = self._action_uri['int-pool']
         self._request_server(OP_DELETE, uri, data=json_body)
     # end deallocate_int
 
     @check_homepage
     def id_to_fq_name(self, id):
-        json_body = json.dumps({'uuid': id})
-        uri = self._action_uri['id-to-name']
-        content = self._request_server(OP_POST, uri, data=json_body)
-
-        return json.loads(content)['fq_name']
+        return self.id_to_fq_name_type(id)[0]
     # end id_to_fq_name
 
     @check_homepage
     def id_to_fq_name_type(self, id):
-        json_body = json.dumps({'uuid': id})
+        use_cache = self._name_cache is not None and self._caching_allowed()
+        if use_cache:
+            found, fq_name_type = self._name_cache.lookup_fq_name_type(id)
+            if found and fq_name_type is None:
+                raise NoIdError(id)
+            elif found:
+                return fq_name_type
+
+        json_body = self._json.dumps({'uuid': id})
         uri = self._action_uri['id-to-name']
-        content = self._request_server(OP_POST, uri, data=json_body)
-
-        json_rsp = json.loads(content)
+        try:
+            content = self._request_server(OP_POST, uri, data=json_body)
+        except NoIdError:
+            if use_cache:
+                self._name_cache.set_unknown_uuid(id)
+            raise
+
+        json_rsp = self._json.loads(content)
+        if use_cache:
+            self._name_cache.set_name(json_rsp['type'], json_rsp['fq_name'],
+                                      id)
         return (json_rsp['fq_name'], json_rsp['type'])
 
     # This is required only for helping ifmap-subscribers using rest publish
@@ -1356,20 +2929,28 @@ class VncApi(object):
     # end ifmap_to_id
 
     def obj_to_json(self, obj):
-        return json.dumps(obj, default=_obj_serializer_all)
+        return self._json.dumps(obj, default=_obj_serializer_all)
     # end obj_to_json
 
     def obj_to_dict(self, obj):
-        return json.loads(self.obj_to_json(obj))
+        return self._json.loads(self.obj_to_json(obj))
     # end obj_to_dict
 
     @check_homepage
-    def fetch_records(self):
-        json_body = json.dumps({'fetch_records': None})
+    def fetch_records(self, stream=False):
+        """Fetch all records of the API server database.
+
+        :param stream: parse the response incrementally and return an
+            iterator over the records instead of a list
+        """
+        json_body = self._json.dumps({'fetch_records': None})
         uri = self._action_uri['fetch-records']
-        content = self._request_server(OP_POST, uri, data=json_body)
+        content = self._request_server(OP_POST, uri, data=json_body,
+                                       stream=stream)
 
-        return json.loads(content)['results']
+        if stream:
+            return iter_json_array(content, 'results')
+        return self._json.loads(content)['results']
     # end fetch_records
 
     @check_homepage
@@ -1382,20 +2963,20 @@ class VncApi(object):
             uri = cls.create_uri
             content = self._request_server(OP_POST, uri, data=json_body)
         else:
-            obj_dict = json.loads(json_body)
+            obj_dict = self._json.loads(json_body)
             uri = cls.resource_uri_base[resource] + '/'
             uri += obj_dict[resource]['uuid']
             content = self._request_server(OP_PUT, uri, data=json_body)
 
-        return json.loads(content)
+        return self._json.loads(content)
     # end restore_config
 
     @check_homepage
     def kv_store(self, key, value):
         # TODO move oper value to common
-        json_body = json.dumps({'operation': 'STORE',
-                                'key': key,
-                                'value': value})
+        json_body = self._json.dumps({'operation': 'STORE',
+                                      'key': key,
+                                      'value': value})
         uri = self._action_uri['useragent-keyvalue']
         self._request_server(OP_POST, uri, data=json_body)
     # end kv_store
@@ -1404,19 +2985,19 @@ class VncApi(object):
     def kv_retrieve(self, key=None):
         # if key is None, entire collection is retrieved, use with caution!
         # TODO move oper value to common
-        json_body = json.dumps({'operation': 'RETRIEVE',
-                                'key': key})
+        json_body = self._json.dumps({'operation': 'RETRIEVE',
+                                      'key': key})
         uri = self._action_uri['useragent-keyvalue']
         content = self._request_server(OP_POST, uri, data=json_body)
 
-        return json.loads(content)['value']
+        return self._json.loads(content)['value']
     # end kv_retrieve
 
     @check_homepage
     def kv_delete(self, key):
         # TODO move oper value to common
-        json_body = json.dumps({'operation': 'DELETE',
-                                'key': key})
+        json_body = self._json.dumps({'operation': 'DELETE',
+                                      'key': key})
         uri = self._action_uri['useragent-keyvalue']
         self._request_server(OP_POST, uri, data=json_body)
     # end kv_delete
@@ -1426,19 +3007,19 @@ class VncApi(object):
     @check_homepage
     def virtual_network_ip_alloc(self, vnobj, count=1,
                                  subnet=None, family=None):
-        json_body = json.dumps({'count': count,
-                                'subnet': subnet,
-                                'family': family})
+        json_body = self._json.dumps({'count': count,
+                                      'subnet': subnet,
+                                      'family': family})
         uri = self._action_uri['virtual-network-ip-alloc'] % vnobj.uuid
         content = self._request_server(OP_POST, uri, data=json_body)
-        return json.loads(content)['ip_addr']
+        return self._json.loads(content)['ip_addr']
     # end virtual_network_ip_alloc
 
     # free previously reserved block of IP address from a VN
     # Expected format "ip_addr" : ["2.1.1.239", "2.1.1.238"]
     @check_homepage
     def virtual_network_ip_free(self, vnobj, ip_list):
-        json_body = json.dumps({'ip_addr': ip_list})
+        json_body = self._json.dumps({'ip_addr': ip_list})
         uri = self._action_uri['virtual-network-ip-free'] % vnobj.uuid
         rv = self._request_server(OP_POST, uri, data=json_body)
         return rv
@@ -1448,27 +3029,63 @@ class VncApi(object):
     # Expected format "subne_list" : ["subnet_uuid1", "subnet_uuid2"]
     @check_homepage
     def virtual_network_subnet_ip_count(self, vnobj, subnet_list):
-        json_body = json.dumps({'subnet_list': subnet_list})
+        json_body = self._json.dumps({'subnet_list': subnet_list})
         uri = self._action_uri['virtual-network-subnet-ip-count'] % vnobj.uuid
         rv = self._request_server(OP_POST, uri, data=json_body)
         return rv
     # end virtual_network_subnet_ip_count
 
+    def map(self, operations, pool_size=None):
+        """Execute CRUD operations concurrently on a gevent pool.
+
+        :param operations: list of (method, args[, kwargs]) tuples, method
+            being a VncApi method name or a callable, ie.
+            [('virtual_network_read', (), {'id': vn_uuid}),
+             ('project_delete', (), {'fq_name': project_fq_name})]
+        :param pool_size: maximum number of operations in flight, defaults
+            to the API server connection pool size
+        :returns: list of results or raised exceptions, in the order of
+            operations
+
+        Operations only overlap if the socket module is cooperative, i.e.
+        gevent.monkey.patch_all() has been called by the application.
+        """
+        from async_vnc_api import bulk_execute
+        return bulk_execute(self, operations, pool_size=pool_size)
+    # end map
+
     def get_auth_token(self):
-        self._headers = self._authenticate(headers=self._headers)
+        """Return the keystone token of the client, only fetching a new
+        one if there is none yet or if it is about to expire.
+        """
+        if self._token_manager is not None:
+            self._use_auth_token(self._token_manager.get_token())
         return self._auth_token
 
     # end get_auth_token
 
+    @traced('list')
     @check_homepage
     def resource_list(self, obj_type, parent_id=None, parent_fq_name=None,
                       back_ref_id=None, obj_uuids=None, fields=None,
                       detail=False, count=False, filters=None, shared=False,
-                      token=None, fq_names=None):
-        empty_result = [] if detail else {'%ss' % (obj_type): []}
+                      token=None, fq_names=None, stream=False):
+        """List resources of a type.
+
+        Returns a dict of resource references, the list of resource objects
+        if detail is set or the count of resources if count is set.
+
+        :param stream: parse the response incrementally as it is received
+            and return an iterator over the resource references (or objects
+            if detail is set) instead of a dict (or a list), so the objects
+            are available before the whole response is read and a large
+            response is never held in memory
+        """
+        stream = stream and not count
+        empty_result = [] if detail or stream else {'%ss' % (obj_type): []}
         if obj_uuids == [] or back_ref_id == []:
             return empty_result
-        self._headers['X-USER-TOKEN'] = token
+        headers = {'X-AUTH-TOKEN': token} if token else None
         if not obj_type:
             raise ResourceTypeUnknownError(obj_type)
 
@@ -1539,10 +3156,11 @@ class VncApi(object):
             for key, value in filters.items():
                 if isinstance(value, list):
                     query_params['filters'] += ','.join(
-                        '%s==%s' % (key, json.dumps(val)) for val in value)
+                        '%s==%s' % (key, self._json.dumps(val))
+                        for val in value)
                 else:
                     query_params['filters'] += ('%s==%s' %
-                                                (key, json.dumps(value)))
+                                                (key, self._json.dumps(value)))
                 query_params['filters'] += ','
             # Remove last trailing comma
             query_params['filters'] = query_params['filters'][:-1]
@@ -1557,23 +3175,40 @@ class VncApi(object):
 
             # use same keys as in GET with additional 'type'
             query_params['type'] = obj_type
-            json_body = json.dumps(query_params)
+            json_body = self._json.dumps(query_params)
             content = self._request_server(OP_POST,
-                                           uri, json_body)
-            response = json.loads(content)
+                                           uri, json_body, headers=headers,
+                                           stream=stream)
+            if stream:
+                response = content
+            else:
+                with self.tracer.span('deserialize'):
+                    response = self._json.loads(content)
         else:  # GET /<collection>
             try:
                 response = self._request_server(
-                    OP_GET, obj_class.create_uri, data=query_params)
+                    OP_GET, obj_class.create_uri, data=query_params,
+                    headers=headers, stream=stream)
             except NoIdError:
                 # dont allow NoIdError propagate to user
                 return empty_result
 
+        if stream:
+            resource_dicts = iter_json_array(response, '%ss' % (obj_type))
+            if not detail:
+                return resource_dicts
+            return self._resource_dicts_to_objs(
+                obj_type, obj_class, resource_dicts, fields)
+
         if not detail:
             return response
 
-        resource_dicts = response['%ss' % (obj_type)]
-        resource_objs = []
+        return list(self._resource_dicts_to_objs(
+            obj_type, obj_class, response['%ss' % (obj_type)], fields))
+    # end resource_list
+
+    def _resource_dicts_to_objs(self, obj_type, obj_class, resource_dicts,
+                                fields):
         for resource_dict in resource_dicts:
             obj_dict = resource_dict['%s' % (obj_type)]
             # if requested child/backref fields are not in the result, that
@@ -1582,19 +3217,54 @@ class VncApi(object):
             # uses the get child/backref method on that type in the
             # 'resource_client' file
             [obj_dict.setdefault(field, None) for field in fields]
-            resource_obj = obj_class.from_dict(**obj_dict)
+            started_at = time.time()
+            with self.tracer.span('from_dict'):
+                resource_obj = obj_class.from_dict(**obj_dict)
+            self.metrics.observe('from_dict_duration_seconds',
+                                 time.time() - started_at, resource=obj_type)
             resource_obj.clear_pending_updates()
             resource_obj.set_server_conn(self)
-            resource_objs.append(resource_obj)
-
-        if 'X-USER-TOKEN' in self._headers:
-            del self._headers['X-USER-TOKEN']
-        return resource_objs
-    # end resource_list
+            yield resource_obj
+    # end _resource_dicts_to_objs
+
+    def iter_resources(self, obj_type, chunk_size=None, fields=None,
+                       parent_id=None, parent_fq_name=None, back_ref_id=None,
+                       filters=None, shared=False, token=None):
+        """Iterate over the resources of a collection with bounded memory.
+
+        The uuids of the matching resources are listed first, then the
+        resources are read and yielded chunk by chunk (through
+        /list-bulk-collection for large chunks), so only one chunk of
+        objects is held in memory whatever the size of the collection.
+        Resources deleted while iterating are skipped.
+
+        :param obj_type: resource type to iterate over
+        :param chunk_size: number of resources read per request, defaults
+            to ITER_RESOURCES_CHUNK_SIZE
+        :param fields: list of children/back-ref fields to read, as for
+            resource_list(detail=True)
+
+        Other parameters filter the collection as for resource_list.
+        """
+        obj_type = obj_type.replace('_', '-')
+        response = self.resource_list(
+            obj_type, parent_id=parent_id, parent_fq_name=parent_fq_name,
+            back_ref_id=back_ref_id, filters=filters, shared=shared,
+            token=token)
+        uuids = [res['uuid'] for res in response['%ss' % obj_type]]
+        del response
+
+        for chunk in self._chunks(
+                uuids, chunk_size or self.ITER_RESOURCES_CHUNK_SIZE):
+            for obj in self.resource_list(obj_type, obj_uuids=chunk,
+                                          fields=fields, detail=True,
+                                          shared=shared, token=token):
+                yield obj
+    # end iter_resources
 
     def set_auth_token(self, token):
         """Park user token for forwarding to API server for RBAC."""
-        self._headers['X-AUTH-TOKEN'] = token
+        self._headers = dict(self._headers, **{'X-AUTH-TOKEN': token})
         self._auth_token_input = True
     # end set_auth_token
 
@@ -1603,9 +3273,52 @@ class VncApi(object):
 
         :param roles: list of roles
         """
-        self._headers['X-API-ROLE'] = (',').join(roles)
+        self._headers = dict(self._headers,
+                             **{'X-API-ROLE': (',').join(roles)})
     # end set_user_roles
 
+    @contextmanager
+    def request_context(self, token=None, roles=None, tenant=None,
+                        headers=None, timeout=None):
+        """Forward user token, roles and tenant with the requests issued by
+        the current thread (or greenlet) within the context, without
+        changing the client wide headers used by other threads. Contexts
+        can be nested, inner values take precedence.
+
+            with vnc_lib.request_context(token=user_token, roles=['member']):
+                vnc_lib.virtual_network_read(id=vn_uuid)
+
+        :param token: user token forwarded to API server for RBAC
+        :param roles: list of user roles forwarded to API server for RBAC
+        :param tenant: tenant name
+        :param headers: dict of any other headers to add to the requests
+        :param timeout: seconds after which requests issued within the
+            context, retries included, fail with TimeOutError. The earliest
+            deadline of nested contexts applies
+        """
+        context_headers = dict(headers or {})
+        if token:
+            context_headers['X-AUTH-TOKEN'] = token
+        if roles:
+            context_headers['X-API-ROLE'] = (',').join(roles)
+        if tenant:
+            context_headers[hdr_client_tenant()] = tenant
+
+        local = self._request_context_local
+        if not hasattr(local, 'headers'):
+            local.headers = []
+            local.deadlines = []
+        local.headers.append(context_headers)
+        if timeout is not None:
+            local.deadlines.append(time.time() + timeout)
+        try:
+            yield
+        finally:
+            local.headers.pop()
+            if timeout is not None:
+                local.deadlines.pop()
+    # end request_context
+
     def set_exclude_hrefs(self):
         self._exclude_hrefs = True
     # end set_exclude_hrefs
@@ -1617,17 +3330,14 @@ class VncApi(object):
         for an object.
         rv {'token_info': <token-info>, 'permissions': 'RWX'}
         """
-        if token is not None:
-            self._headers['X-USER-TOKEN'] = token
+        headers = {'X-AUTH-TOKEN': token} if token else None
         query = 'uuid=%s' % obj_uuid if obj_uuid else ''
         try:
-            rv = self._request_server(OP_GET, "/obj-perms", data=query)
+            rv = self._request_server(OP_GET, "/obj-perms", data=query,
+                                      headers=headers)
             return rv
         except PermissionDenied:
             rv = None
-        finally:
-            if 'X-USER-TOKEN' in self._headers:
-                del self._headers['X-USER-TOKEN']
         return rv
 
     @check_homepage
@@ -1646,7 +3356,7 @@ class VncApi(object):
             body['headers'] = headers
 
         uri = self._action_uri['amqp-publish']
-        json_body = json.dumps(body)
+        json_body = self._json.dumps(body)
         self._request_server(OP_POST, uri, data=json_body)
     # end amqp_publish
 
@@ -1668,9 +3378,9 @@ class VncApi(object):
             body['headers'] = headers
 
         uri = self._action_uri['amqp-request']
-        json_body = json.dumps(body)
+        json_body = self._json.dumps(body)
         content = self._request_server(OP_POST, uri, data=json_body)
-        return json.loads(content)
+        return self._json.loads(content)
     # end amqp_request
 
     def is_cloud_admin_role(self):
@@ -1684,9 +3394,12 @@ class VncApi(object):
     # change object ownsership
     def chown(self, obj_uuid, owner):
         payload = {'uuid': obj_uuid, 'owner': owner}
-        content = self._request_server(
-            OP_POST, self._action_uri['chown'],
-            data=json.dumps(payload))
+        try:
+            content = self._request_server(
+                OP_POST, self._action_uri['chown'],
+                data=self._json.dumps(payload))
+        finally:
+            self._invalidate_cached_objects(obj_uuid)
         return content
     # end chown
 
@@ -1709,9 +3422,12 @@ class VncApi(object):
                                 for item in share]
         if global_access is not None:
             payload['global_access'] = global_access
-        content = self._request_server(
-            OP_POST, self._action_uri['chmod'],
-            data=json.dumps(payload))
+        try:
+            content = self._request_server(
+                OP_POST, self._action_uri['chmod'],
+                data=self._json.dumps(payload))
+        finally:
+            self._invalidate_cached_objects(obj_uuid)
         return content
 
     def set_aaa_mode(self, mode):
@@ -1719,8 +3435,8 @@ class VncApi(object):
             raise HttpError(400, 'Invalid AAA mode')
         url = self._action_uri['aaa-mode']
         data = {'aaa-mode': mode}
-        content = self._request_server(OP_PUT, url, json.dumps(data))
-        return json.loads(content)
+        content = self._request_server(OP_PUT, url, self._json.dumps(data))
+        return self._json.loads(content)
 
     def get_aaa_mode(self):
         url = self._action_uri['aaa-mode']
@@ -1760,8 +3476,12 @@ class VncApi(object):
             'obj_uuid': obj.get_uuid(),
         }
         data.update(tags_dict)
-        content = self._request_server(OP_POST, url, json.dumps(data))
-        return json.loads(content)
+        try:
+            content = self._request_server(OP_POST, url,
+                                           self._json.dumps(data))
+        finally:
+            self._invalidate_cached_objects(obj.get_uuid())
+        return self._json.loads(content)
 
     def set_tag(self, obj, type, value, is_global=False):
         """Associate a defined tag to a resource
@@ -1806,8 +3526,8 @@ class VncApi(object):
             'scope_uuid': scope.uuid,
             'action': action,
         }
-        content = self._request_server(OP_POST, url, json.dumps(data))
-        return json.loads(content)
+        content = self._request_server(OP_POST, url, self._json.dumps(data))
+        return self._json.loads(content)
 
     def commit_security(self, scope):
         """Commit pending resources on a given scope
@@ -1825,3 +3545,63 @@ class VncApi(object):
         """
         self._security_policy_draft('discard', scope)
 # end class VncApi
+
+
+def _resource_method(name, oper_str, resource_type):
+    generic_name = '_object%s' % oper_str
+
+    def method(self, *args, **kwargs):
+        return getattr(self, generic_name)(resource_type, *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(VncApi, generic_name).__doc__
+    return method
+# end _resource_method
+
+
+def _add_resource_methods(cls):
+    """Define the <type>_create/_read/_update/_delete/s_list,
+    get_default_<type>_id and, for security types, <type>_read_draft
+    methods of every resource type on the class, once for all instances.
+    """
+    for object_type, resource_type in all_resource_type_tuples:
+        for oper_str in ('_create', '_read', '_update', '_delete',
+                         's_list', '_get_default_id', '_read_draft'):
+            if (oper_str == '_read_draft' and
+                    object_type not in cls._SECURITY_OBJECT_TYPES):
+                continue
+            if oper_str == '_get_default_id':
+                name = 'get_default_%s_id' % object_type
+            else:
+                name = '%s%s' % (object_type, oper_str)
+            if name not in cls.__dict__:
+                setattr(cls, name,
+                        _resource_method(name, oper_str, resource_type))
+# end _add_resource_methods
+
+
+_add_resource_methods(VncApi)
+
+
+# Collection and resource base URIs of the homepages used, per resource type
+_homepage_uris = {'collection': {}, 'resource-base': {}}
+
+
+def _set_homepage_uris(cls):
+    resource_type = cls.resource_type
+    if resource_type in _homepage_uris['collection']:
+        cls.create_uri = _homepage_uris['collection'][resource_type]
+    if resource_type in _homepage_uris['resource-base']:
+        cls.resource_uri_base[resource_type] = (
+            _homepage_uris['resource-base'][resource_type])
+# end _set_homepage_uris
+
+
+def _on_type_load(name, value):
+    if name in _client_types:
+        _set_homepage_uris(value)
+# end _on_type_load
+
+
+if _client_types is not None:
+    lazy_module(__name__, dict(_xsd_types, **_client_types),
+                sys.modules[__name__], _on_type_load)
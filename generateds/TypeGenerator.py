@@ -93,15 +93,21 @@ class TypeGenerator(object):
         # to isolate important classes from internal ones. This way one
         # can do a reasonably safe "from parser import *"
         if outfileName: 
-            exportableClassList = ['"%s"' % self._PGenr.mapName(self._PGenr.cleanupName(name)) 
-                for name in self._PGenr.AlreadyGenerated]
-            exportableClassList.sort()
+            exportableClassList = ['"%s"' % name
+                for name in self.getExportableClassNames()]
             exportableClassNames = ',\n    '.join(exportableClassList)
             exportLine = "\n__all__ = [\n    %s\n    ]\n" % exportableClassNames
             outfile = open(outfileName, "a")
             outfile.write(exportLine)
             outfile.close()
 
+    def getExportableClassNames(self):
+        # Sorted names of the generated classes, as listed in __all__
+        exportableClassNames = [self._PGenr.mapName(self._PGenr.cleanupName(name))
+            for name in self._PGenr.AlreadyGenerated]
+        exportableClassNames.sort()
+        return exportableClassNames
+
     def _generateMain(self, outfile, prefix, root):
         name = self._PGenr.RootElement or root.getChildren()[0].getName()
         elType = self._PGenr.cleanupName(root.getChildren()[0].getType())
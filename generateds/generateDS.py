@@ -70,6 +70,10 @@ Options:
                              create session file in generateds_gui.py.  Or,
                              copy and edit sample.session from the
                              distribution.
+    --lazy-modules           With the ifmap-frontend generator, define each
+                             resource class in its own module and make
+                             resource_common and resource_client import
+                             them on first use.
     --version                Print version and exit.
 
 """
@@ -158,6 +162,7 @@ class XsdParserGenerator(object):
         self.ElementDict = {}
         self.Force = False
         self.NoQuestions = False
+        self.LazyModules = False
         self.Dirpath = []
         self.ExternalEncoding = sys.getdefaultencoding()
         self.genCategory = None
@@ -661,7 +666,7 @@ if __name__ == '__main__':
                 'namespacedef=', 'external-encoding=',
                 'member-specs=', 'no-dates', 'no-versions',
                 'no-questions', 'session=', 'generator-category=',
-                'generated-language=', 'version',
+                'generated-language=', 'version', 'lazy-modules',
                 ])
         except getopt.GetoptError, exp:
             usage()
@@ -784,6 +789,8 @@ if __name__ == '__main__':
                 self.NoQuestions = True
             elif option[0] == '--version':
                 showVersion = True
+            elif option[0] == '--lazy-modules':
+                self.LazyModules = True
             elif option[0] == '--member-specs':
                 MemberSpecs = option[1]
                 if MemberSpecs not in ('list', 'dict', ):
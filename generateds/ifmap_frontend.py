@@ -50,9 +50,14 @@ class IFMapApiGenerator(object):
         self._generate_package(gendir)
         # These produce classes/files per type
         self._generate_common_classes(gen_filepath_pfx)
-        self._generate_client_classes(gen_filepath_pfx, gen_filename_pfx)
+        if not self._xsd_parser.LazyModules:
+            self._generate_client_classes(gen_filepath_pfx, gen_filename_pfx)
         self._generate_test_classes(gen_filepath_pfx, gen_filename_pfx)
         self._generate_heat_resources(gen_filepath_pfx, gen_filename_pfx)
+        if self._xsd_parser.LazyModules:
+            # after heat, which loads the common classes from their single
+            # module
+            self._generate_lazy_modules(gendir, gen_filename_pfx)
         #self._generate_docs_classes(gen_filepath_pfx, gen_filename_pfx)
 
         # These produce class/file common to all types
@@ -92,12 +97,21 @@ class IFMapApiGenerator(object):
     def _generate_common_classes(self, gen_filepath_pfx):
         # XSD types to python classes
         gen_file = self._xsd_parser.makeFile(gen_filepath_pfx + "_common.py")
+        self._write_common_header(gen_file,
+            "This module defines the classes for every configuration element managed by the system")
+
+        for ident in self._non_exclude_idents():
+            self._generate_common_class(gen_file, ident)
+
+    # end _generate_common_classes
+
+    def _write_common_header(self, gen_file, module_doc):
         write(gen_file, "")
         write(gen_file, "# AUTO-GENERATED file from %s. Do Not Edit!" \
               %(self.__class__.__name__))
         write(gen_file, "")
         write(gen_file, '"""')
-        write(gen_file, "This module defines the classes for every configuration element managed by the system")
+        write(gen_file, module_doc)
         write(gen_file, '"""')
         write(gen_file, "")
         write(gen_file, "try:")
@@ -108,690 +122,690 @@ class IFMapApiGenerator(object):
         write(gen_file, "    except ImportError:")
         write(gen_file, "        pass")
         write(gen_file, "")
+    # end _write_common_header
 
-        for ident in self._non_exclude_idents():
-            class_name = CamelCase(ident.getName())
-            ident_name = ident.getName()
-            method_name = ident_name.replace('-', '_')
-            my_name_default = 'default-%s' %(ident.getName())
-            parents = ident.getParents()
+    def _generate_common_class(self, gen_file, ident):
+        class_name = CamelCase(ident.getName())
+        ident_name = ident.getName()
+        method_name = ident_name.replace('-', '_')
+        my_name_default = 'default-%s' %(ident.getName())
+        parents = ident.getParents()
 
-            write(gen_file, "class %s(object):" %(class_name))
-            write(gen_file, '    """')
+        write(gen_file, "class %s(object):" %(class_name))
+        write(gen_file, '    """')
 
-            # Document description for object
-            description = ident.getElement().attrs.get('description')
-            if not description:
-                description = ''
-                for parent_ident, parent_link, _ in ident.getParents() or []:
-                    if len(ident.getParents()) > 1:
-                        indent = ' '*8
-                        description += ' '*4 + 'When parent is %s:\n%s' %(parent_ident.getName(), indent)
-                        description += ('\n'+indent).join(parent_link.getDescription(width=100))
-                        description += '\n'
-                    else:
-                        indent = ' '*4
-                        description += indent
-                        description += ('\n'+indent).join(parent_link.getDescription(width=100))
+        # Document description for object
+        description = ident.getElement().attrs.get('description')
+        if not description:
+            description = ''
+            for parent_ident, parent_link, _ in ident.getParents() or []:
+                if len(ident.getParents()) > 1:
+                    indent = ' '*8
+                    description += ' '*4 + 'When parent is %s:\n%s' %(parent_ident.getName(), indent)
+                    description += ('\n'+indent).join(parent_link.getDescription(width=100))
+                    description += '\n'
+                else:
+                    indent = ' '*4
+                    description += indent
+                    description += ('\n'+indent).join(parent_link.getDescription(width=100))
 
-            write(gen_file, description)
-            write(gen_file, "")
+        write(gen_file, description)
+        write(gen_file, "")
 
-            # Document created-by for object
-            created_by = ident.getElement().attrs.get('created-by')
-            write(gen_file, "    Created By:")
-            if created_by:
-                write(gen_file, "        %s" %(created_by))
-            elif parents and len(parents) == 1:
-                (parent_ident, meta, _) = parents[0]
-                if (parent_ident.getName().lower() == 'config-root' or
-                    meta.getPresence().lower() != 'system-only'):
+        # Document created-by for object
+        created_by = ident.getElement().attrs.get('created-by')
+        write(gen_file, "    Created By:")
+        if created_by:
+            write(gen_file, "        %s" %(created_by))
+        elif parents and len(parents) == 1:
+            (parent_ident, meta, _) = parents[0]
+            if (parent_ident.getName().lower() == 'config-root' or
+                meta.getPresence().lower() != 'system-only'):
+                created_by = 'User'
+            else:
+                created_by = 'System'
+            write(gen_file, "        %s" %(created_by))
+        else:
+            for i in range(len(parents or [])):
+                (parent_ident, meta, _) = parents[i]
+                if meta.getPresence().lower() != 'system-only':
                     created_by = 'User'
                 else:
                     created_by = 'System'
-                write(gen_file, "        %s" %(created_by))
-            else:
-                for i in range(len(parents or [])):
-                    (parent_ident, meta, _) = parents[i]
-                    if meta.getPresence().lower() != 'system-only':
-                        created_by = 'User'
-                    else:
-                        created_by = 'System'
-                    parent_class_name = CamelCase(parent_ident.getName())
-                    write(gen_file, "        %s when parent is :class:`.%s`" %(
-                        created_by, parent_class_name))
-            write(gen_file, "")
-
-            # Document parents for object
-            if parents:
-                write(gen_file, "    Child of:")
-                for i in range(len(parents)):
-                    (parent_ident, meta, _) = parents[i]
-                    parent_class_name = CamelCase(parent_ident.getName())
-                    if i == len(parents)-1:
-                        write(gen_file, "        :class:`.%s` object" %(parent_class_name))
-                    else:
-                        write(gen_file, "        :class:`.%s` object OR" %(parent_class_name))
-                write(gen_file, "")
+                parent_class_name = CamelCase(parent_ident.getName())
+                write(gen_file, "        %s when parent is :class:`.%s`" %(
+                    created_by, parent_class_name))
+        write(gen_file, "")
 
-            write(gen_file, "    Properties:")
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                prop_xml_elem = prop.getElement()
-                complex_type = prop.getCType()
-                xsd_type = prop.getXsdType()
-                presence = prop.getPresence()
-                if presence.lower() != 'system-only':
-                    # optional or required
-                    created_by = 'User (%s)' %(presence)
+        # Document parents for object
+        if parents:
+            write(gen_file, "    Child of:")
+            for i in range(len(parents)):
+                (parent_ident, meta, _) = parents[i]
+                parent_class_name = CamelCase(parent_ident.getName())
+                if i == len(parents)-1:
+                    write(gen_file, "        :class:`.%s` object" %(parent_class_name))
                 else:
-                    created_by = 'System'
-                if complex_type and xsd_type:
-                    write(gen_file, "        * %s" %(prop_name))
-                    write(gen_file, "            Type: :class:`.%s`\n" %(prop.getXsdType()))
-                    write(gen_file, "            Created By: %s\n" %(created_by))
-                    write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
-                    write(gen_file, "            Description:\n")
-                    for desc_line in prop.getDescription(width=100):
-                        write(gen_file, "              %s\n" %(desc_line))
-                elif prop_xml_elem.getSchemaType() in self._xsd_parser.SimpleTypeDict:
-                    # handle simple restriction
-                    r_base = self._xsd_parser.SimpleTypeDict[prop_xml_elem.getSchemaType()]
-                    if r_base.values and isinstance(r_base.values[0], dict): # range
-                        restriction_type = '*within*'
-                        restriction_values = [r_base.values[0]['minimum'],
-                                              r_base.values[1]['maximum']]
-                    else: # enum
-                        restriction_type = '*one-of*'
-                        if r_base.values:
-                            restriction_values = r_base.values
-                        else:
-                            restriction_values = r_base.base
-                    python_type = self._xsd_parser.SchemaToPythonTypeMap[r_base.base]
-                    write(gen_file, "        * %s" %(prop_name))
-                    write(gen_file, "            Type: %s, %s %s\n" %(
-                              python_type, restriction_type, restriction_values))
-                    write(gen_file, "            Created By: %s\n" %(created_by))
-                    write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
-                    write(gen_file, "            Description:\n")
-                    for desc_line in prop.getDescription(width=100):
-                        write(gen_file, "              %s\n" %(desc_line))
-                else:
-                    python_type = self._xsd_parser.SchemaToPythonTypeMap[prop.getXsdType().lower()]
-                    write(gen_file, "        * %s" %(prop_name))
-                    write(gen_file, "            Type: %s\n" %(python_type))
-                    write(gen_file, "            Created By: %s\n" %(created_by))
-                    write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
-                    write(gen_file, "            Description:\n")
-                    for desc_line in prop.getDescription(width=100):
-                        write(gen_file, "              %s\n" %(desc_line))
+                    write(gen_file, "        :class:`.%s` object OR" %(parent_class_name))
             write(gen_file, "")
-            write(gen_file, "    Children:")
-            for link_info in ident.getLinksInfo():
-                is_has = ident.isLinkHas(link_info)
-                if not is_has:
-                    continue
-                link = ident.getLink(link_info)
-                presence = link.getPresence()
-                if presence.lower() != 'system-only':
-                    # optional or required
-                    created_by = 'User (%s)' %(presence)
-                else:
-                    created_by = 'System'
-                child_ident = ident.getLinkTo(link_info)
-                child_class_name = CamelCase(child_ident.getName())
-                write(gen_file, "        * list of :class:`.%s` objects" %(child_class_name))
+
+        write(gen_file, "    Properties:")
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            prop_xml_elem = prop.getElement()
+            complex_type = prop.getCType()
+            xsd_type = prop.getXsdType()
+            presence = prop.getPresence()
+            if presence.lower() != 'system-only':
+                # optional or required
+                created_by = 'User (%s)' %(presence)
+            else:
+                created_by = 'System'
+            if complex_type and xsd_type:
+                write(gen_file, "        * %s" %(prop_name))
+                write(gen_file, "            Type: :class:`.%s`\n" %(prop.getXsdType()))
                 write(gen_file, "            Created By: %s\n" %(created_by))
-                write(gen_file, "            Operations Allowed: %s\n" %(link.getOperations()))
+                write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
                 write(gen_file, "            Description:\n")
-                for desc_line in link.getDescription(width=100):
+                for desc_line in prop.getDescription(width=100):
                     write(gen_file, "              %s\n" %(desc_line))
-            write(gen_file, "")
-            write(gen_file, "    References to:")
-            for link_info in ident.getLinksInfo():
-                link = ident.getLink(link_info)
-                to_ident = ident.getLinkTo(link_info)
-                to_class_name = CamelCase(to_ident.getName())
-                is_ref = ident.isLinkRef(link_info)
-                if not is_ref:
-                    continue
-                presence = link.getPresence()
-                if presence.lower() != 'system-only':
-                    # optional or required
-                    created_by = 'User (%s)' %(presence)
-                else:
-                    created_by = 'System'
-                link_attr_type = link.getXsdType()
-                if link_attr_type: # link with attr
-                    write(gen_file, "        * list of (:class:`.%s` object, :class:`.%s` attribute)" %(to_class_name, link_attr_type))
-                else:
-                    write(gen_file, "        * list of :class:`.%s` objects" %(to_class_name))
+            elif prop_xml_elem.getSchemaType() in self._xsd_parser.SimpleTypeDict:
+                # handle simple restriction
+                r_base = self._xsd_parser.SimpleTypeDict[prop_xml_elem.getSchemaType()]
+                if r_base.values and isinstance(r_base.values[0], dict): # range
+                    restriction_type = '*within*'
+                    restriction_values = [r_base.values[0]['minimum'],
+                                          r_base.values[1]['maximum']]
+                else: # enum
+                    restriction_type = '*one-of*'
+                    if r_base.values:
+                        restriction_values = r_base.values
+                    else:
+                        restriction_values = r_base.base
+                python_type = self._xsd_parser.SchemaToPythonTypeMap[r_base.base]
+                write(gen_file, "        * %s" %(prop_name))
+                write(gen_file, "            Type: %s, %s %s\n" %(
+                          python_type, restriction_type, restriction_values))
                 write(gen_file, "            Created By: %s\n" %(created_by))
-                write(gen_file, "            Operations Allowed: %s\n" %(link.getOperations()))
+                write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
                 write(gen_file, "            Description:\n")
-                for desc_line in link.getDescription(width=100):
+                for desc_line in prop.getDescription(width=100):
                     write(gen_file, "              %s\n" %(desc_line))
-            write(gen_file, "")
-            write(gen_file, "    Referred by:")
-            for back_link_info in ident.getBackLinksInfo():
-                if not ident.isLinkRef(back_link_info):
-                    continue
-                from_ident = ident.getBackLinkFrom(back_link_info)
-                from_class_name = CamelCase(from_ident.getName())
-                write(gen_file, "        * list of :class:`.%s` objects" %(from_class_name))
-            write(gen_file, '    """')
-            write(gen_file, "")
+            else:
+                python_type = self._xsd_parser.SchemaToPythonTypeMap[prop.getXsdType().lower()]
+                write(gen_file, "        * %s" %(prop_name))
+                write(gen_file, "            Type: %s\n" %(python_type))
+                write(gen_file, "            Created By: %s\n" %(created_by))
+                write(gen_file, "            Operations Allowed: %s\n" %(prop.getOperations()))
+                write(gen_file, "            Description:\n")
+                for desc_line in prop.getDescription(width=100):
+                    write(gen_file, "              %s\n" %(desc_line))
+        write(gen_file, "")
+        write(gen_file, "    Children:")
+        for link_info in ident.getLinksInfo():
+            is_has = ident.isLinkHas(link_info)
+            if not is_has:
+                continue
+            link = ident.getLink(link_info)
+            presence = link.getPresence()
+            if presence.lower() != 'system-only':
+                # optional or required
+                created_by = 'User (%s)' %(presence)
+            else:
+                created_by = 'System'
+            child_ident = ident.getLinkTo(link_info)
+            child_class_name = CamelCase(child_ident.getName())
+            write(gen_file, "        * list of :class:`.%s` objects" %(child_class_name))
+            write(gen_file, "            Created By: %s\n" %(created_by))
+            write(gen_file, "            Operations Allowed: %s\n" %(link.getOperations()))
+            write(gen_file, "            Description:\n")
+            for desc_line in link.getDescription(width=100):
+                write(gen_file, "              %s\n" %(desc_line))
+        write(gen_file, "")
+        write(gen_file, "    References to:")
+        for link_info in ident.getLinksInfo():
+            link = ident.getLink(link_info)
+            to_ident = ident.getLinkTo(link_info)
+            to_class_name = CamelCase(to_ident.getName())
+            is_ref = ident.isLinkRef(link_info)
+            if not is_ref:
+                continue
+            presence = link.getPresence()
+            if presence.lower() != 'system-only':
+                # optional or required
+                created_by = 'User (%s)' %(presence)
+            else:
+                created_by = 'System'
+            link_attr_type = link.getXsdType()
+            if link_attr_type: # link with attr
+                write(gen_file, "        * list of (:class:`.%s` object, :class:`.%s` attribute)" %(to_class_name, link_attr_type))
+            else:
+                write(gen_file, "        * list of :class:`.%s` objects" %(to_class_name))
+            write(gen_file, "            Created By: %s\n" %(created_by))
+            write(gen_file, "            Operations Allowed: %s\n" %(link.getOperations()))
+            write(gen_file, "            Description:\n")
+            for desc_line in link.getDescription(width=100):
+                write(gen_file, "              %s\n" %(desc_line))
+        write(gen_file, "")
+        write(gen_file, "    Referred by:")
+        for back_link_info in ident.getBackLinksInfo():
+            if not ident.isLinkRef(back_link_info):
+                continue
+            from_ident = ident.getBackLinkFrom(back_link_info)
+            from_class_name = CamelCase(from_ident.getName())
+            write(gen_file, "        * list of :class:`.%s` objects" %(from_class_name))
+        write(gen_file, '    """')
+        write(gen_file, "")
 
-            write(gen_file, "    resource_type = '%s'" %(ident_name))
-            write(gen_file, "    object_type = '%s'" %(ident_name.replace('-', '_')))
-            write(gen_file, "")
+        write(gen_file, "    resource_type = '%s'" %(ident_name))
+        write(gen_file, "    object_type = '%s'" %(ident_name.replace('-', '_')))
+        write(gen_file, "")
 
-            prop_fields = [prop.getName().replace('-', '_') for prop in ident.getProperties()]
-            ref_fields = ['%s_refs' %(ref_ident.getName().replace('-', '_')) for ref_ident in ident.getReferences()]
-            back_ref_fields = ['%s_back_refs' %(back_ref_ident.getName().replace('-', '_')) for back_ref_ident in ident.getBackReferences()]
-            children_fields = ['%ss' %(child_ident.getName().replace('-', '_')) for child_ident in ident.getChildren()]
-            write(gen_file, "    prop_fields = set(%s)" %(prop_fields))
-            write(gen_file, "    ref_fields = set(%s)" %(ref_fields))
-            write(gen_file, "    backref_fields = set(%s)" %(back_ref_fields))
-            write(gen_file, "    children_fields = set(%s)" %(children_fields))
-            write(gen_file, "")
-            prop_field_types = []
-            for prop in ident.getProperties():
-                name = prop.getName().replace('-', '_')
-                is_complex = prop.getCType() is not None
-                simple_type = prop.getElement().getSimpleType()
-                prop_type = prop.getElement().getType()
-                xsd_type = prop_type.replace('xsd:', '')
-                restrictions = None
-                restriction_type = None
-                if simple_type:
-                    restrict_values = self._xsd_parser.SimpleTypeDict[simple_type].values
-                    if restrict_values and isinstance(restrict_values[0], dict):
-                        restrictions = [restrict_values[0]['minimum'],
-                                        restrict_values[1]['maximum']]
-                        restriction_type = 'range'
-                    else:
-                        restrictions = restrict_values
-                        restriction_type = 'enum'
-                description = prop.getDescription(width=100)
-                presence = prop.getPresence()
-                operations = prop.getOperations()
-                default = prop.getElement().getDefault()
-                mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
-                prop_field_types.append("'%s': %s" %(name,
-                                        {'is_complex': is_complex,
-                                         'restrictions': restrictions,
-                                         'restriction_type': restriction_type,
-                                         'description': description,
-                                         'required': presence,
-                                         'operations': operations,
-                                         'simple_type': simple_type,
-                                         'xsd_type': xsd_type,
-                                         'default' : eval(mapped_default)}))
-            write(gen_file, '    prop_field_types = {\n        %s\n    }\n' %(
-                  ',\n        '.join(prop_field_types)))
-            write(gen_file, "")
-            ref_field_type_vals = [('%s_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
-                                    (ident.getLinkTo(li).getName(),
-                                     ident.getLink(li).getXsdType(),
-                                     ident.isLinkDerived(li),
-                                     ident.getLink(li).getDescription(width=100)),
-                                   ) for li in ident.getLinksInfo()
-                                     if ident.isLinkRef(li)]
-            write(gen_file, "    ref_field_types = {}")
-            for ref_field, (ref_type, ref_link_type, is_weakref, ref_desc) in ref_field_type_vals:
-                write(gen_file, "    ref_field_types['%s'] = ('%s', '%s', %s, %s)"
-                      %(ref_field, ref_type, ref_link_type, is_weakref, ref_desc))
+        prop_fields = [prop.getName().replace('-', '_') for prop in ident.getProperties()]
+        ref_fields = ['%s_refs' %(ref_ident.getName().replace('-', '_')) for ref_ident in ident.getReferences()]
+        back_ref_fields = ['%s_back_refs' %(back_ref_ident.getName().replace('-', '_')) for back_ref_ident in ident.getBackReferences()]
+        children_fields = ['%ss' %(child_ident.getName().replace('-', '_')) for child_ident in ident.getChildren()]
+        write(gen_file, "    prop_fields = set(%s)" %(prop_fields))
+        write(gen_file, "    ref_fields = set(%s)" %(ref_fields))
+        write(gen_file, "    backref_fields = set(%s)" %(back_ref_fields))
+        write(gen_file, "    children_fields = set(%s)" %(children_fields))
+        write(gen_file, "")
+        prop_field_types = []
+        for prop in ident.getProperties():
+            name = prop.getName().replace('-', '_')
+            is_complex = prop.getCType() is not None
+            simple_type = prop.getElement().getSimpleType()
+            prop_type = prop.getElement().getType()
+            xsd_type = prop_type.replace('xsd:', '')
+            restrictions = None
+            restriction_type = None
+            if simple_type:
+                restrict_values = self._xsd_parser.SimpleTypeDict[simple_type].values
+                if restrict_values and isinstance(restrict_values[0], dict):
+                    restrictions = [restrict_values[0]['minimum'],
+                                    restrict_values[1]['maximum']]
+                    restriction_type = 'range'
+                else:
+                    restrictions = restrict_values
+                    restriction_type = 'enum'
+            description = prop.getDescription(width=100)
+            presence = prop.getPresence()
+            operations = prop.getOperations()
+            default = prop.getElement().getDefault()
+            mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
+            prop_field_types.append("'%s': %s" %(name,
+                                    {'is_complex': is_complex,
+                                     'restrictions': restrictions,
+                                     'restriction_type': restriction_type,
+                                     'description': description,
+                                     'required': presence,
+                                     'operations': operations,
+                                     'simple_type': simple_type,
+                                     'xsd_type': xsd_type,
+                                     'default' : eval(mapped_default)}))
+        write(gen_file, '    prop_field_types = {\n        %s\n    }\n' %(
+              ',\n        '.join(prop_field_types)))
+        write(gen_file, "")
+        ref_field_type_vals = [('%s_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
+                                (ident.getLinkTo(li).getName(),
+                                 ident.getLink(li).getXsdType(),
+                                 ident.isLinkDerived(li),
+                                 ident.getLink(li).getDescription(width=100)),
+                               ) for li in ident.getLinksInfo()
+                                 if ident.isLinkRef(li)]
+        write(gen_file, "    ref_field_types = {}")
+        for ref_field, (ref_type, ref_link_type, is_weakref, ref_desc) in ref_field_type_vals:
+            write(gen_file, "    ref_field_types['%s'] = ('%s', '%s', %s, %s)"
+                  %(ref_field, ref_type, ref_link_type, is_weakref, ref_desc))
+        write(gen_file, "")
+        backref_field_type_vals = [('%s_back_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
+                                (ident.getBackLinkFrom(li).getName(),
+                                 ident.getBackLink(li).getXsdType(),
+                                 ident.isLinkDerived(li))
+                               ) for li in ident.getBackLinksInfo()
+                                 if ident.isLinkRef(li)]
+        write(gen_file, "    backref_field_types = {}")
+        for backref_field, (backref_type, backref_link_type, is_weakref) in backref_field_type_vals:
+            write(gen_file, "    backref_field_types['%s'] = ('%s', '%s', %s)"
+                  %(backref_field, backref_type, backref_link_type, is_weakref))
+        write(gen_file, "")
+        children_field_type_vals = [('%ss' %(child_ident.getName().replace('-', '_')),
+                                     (child_ident.getName(),
+                                      child_ident.isDerived(ident)))
+                                    for child_ident in ident.getChildren()]
+        write(gen_file, "    children_field_types = {}")
+        for child_field, (child_type, is_derived) in children_field_type_vals:
+            write(gen_file, "    children_field_types['%s'] = ('%s', %s)"
+                %(child_field, child_type, is_derived))
+        write(gen_file, "")
+        if parents:
+            p_class_names = [p_ident.getName() for p_ident, _, _ in parents]
+            write(gen_file, "    parent_types = %s" %(p_class_names))
+        else:
+            write(gen_file, "    parent_types = ['config-root']")
+        write(gen_file, "")
+        prop_field_meta_vals = [('%s' %(prop.getName().replace('-', '_')),
+                                 '%s' %(prop.getName())) for prop in ident.getProperties()]
+        write(gen_file, "    prop_field_metas = {}")
+        for k,v in prop_field_meta_vals:
+            write(gen_file, "    prop_field_metas['%s'] = '%s'" %(k,v))
+        write(gen_file, "")
+        ref_field_meta_vals = [('%s_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
+                                '%s' %(ident.getLink(li).getName()))
+                               for li in ident.getLinksInfo()
+                               if ident.isLinkRef(li)]
+        write(gen_file, "    ref_field_metas = {}")
+        for ref_field, ref_meta in ref_field_meta_vals:
+            write(gen_file, "    ref_field_metas['%s'] = '%s'"
+                  %(ref_field, ref_meta))
+        write(gen_file, "")
+        children_field_meta_vals = [('%ss' %(ident.getLinkTo(li).getName().replace('-', '_')),
+                                     '%s' %(ident.getLink(li).getName()))
+                                    for li in ident.getLinksInfo()
+                                    if ident.isLinkHas(li)]
+        write(gen_file, "    children_field_metas = {}")
+        for k,v in children_field_meta_vals:
+            write(gen_file, "    children_field_metas['%s'] = '%s'" %(k,v))
+        write(gen_file, "")
+        prop_list_fields = [prop.getName().replace('-', '_')
+            for prop in ident.getProperties() if prop.isList()]
+        write(gen_file, "    prop_list_fields = set(%s)" %(prop_list_fields))
+        write(gen_file, "")
+        prop_list_field_has_wrapper_vals = [
+            ('%s' %(prop.getName().replace('-', '_')),
+             prop.isListUsingWrapper()) for prop in ident.getProperties() if prop.isList()]
+        write(gen_file, "    prop_list_field_has_wrappers = {}")
+        for k,v in prop_list_field_has_wrapper_vals:
+            write(gen_file, "    prop_list_field_has_wrappers['%s'] = %s" %(k,v))
+        write(gen_file, "")
+
+        prop_map_fields = [prop.getName().replace('-', '_')
+            for prop in ident.getProperties() if prop.isMap()]
+        write(gen_file, "    prop_map_fields = set(%s)" %(prop_map_fields))
+        write(gen_file, "")
+        prop_map_field_has_wrapper_vals = [
+            ('%s' %(prop.getName().replace('-', '_')),
+             prop.isMapUsingWrapper()) for prop in ident.getProperties() if prop.isMap()]
+        write(gen_file, "    prop_map_field_has_wrappers = {}")
+        for k,v in prop_map_field_has_wrapper_vals:
+            write(gen_file, "    prop_map_field_has_wrappers['%s'] = %s" %(k,v))
+        write(gen_file, "")
+        prop_map_field_key_name_vals = [
+            ('%s' %(prop.getName().replace('-', '_')),
+             prop.getMapKeyName()) for prop in ident.getProperties() if prop.isMap()]
+        write(gen_file, "    prop_map_field_key_names = {}")
+        for k,v in prop_map_field_key_name_vals:
+            write(gen_file, "    prop_map_field_key_names['%s'] = '%s'" %(k,v))
+        write(gen_file, "")
+
+        # init args are name, parent_obj(if there is one), props
+        init_args = "self, name = None"
+        if parents:
+            init_args = init_args + ", parent_obj = None"
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            prop_type = prop.getElement().getType()
+            default = prop.getElement().getDefault()
+            mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
+            init_args = init_args + ", %s=%s" %(prop_name, mapped_default)
+
+        write(gen_file, "    def __init__(%s, *args, **kwargs):" %(init_args))
+        write(gen_file, "        # type-independent fields")
+        write(gen_file, "        self._type = '%s'" %(ident_name))
+        write(gen_file, "        if not name:")
+        write(gen_file, "            name = u'%s'" %(my_name_default))
+        write(gen_file, "        self.name = name")
+        write(gen_file, "        self._uuid = None")
+        if parents:
+            write(gen_file, "        # Determine parent type and fq_name")
+            write(gen_file, "        kwargs_parent_type = kwargs.get('parent_type', None)")
+            write(gen_file, "        kwargs_fq_name = kwargs.get('fq_name', None)")
+            write(gen_file, "        if parent_obj:")
+            write(gen_file, "            self.parent_type = parent_obj._type")
+            write(gen_file, "            # copy parent's fq_name")
+            write(gen_file, "            self.fq_name = list(parent_obj.fq_name)")
+            write(gen_file, "            self.fq_name.append(name)")
+            write(gen_file, "        elif kwargs_parent_type and kwargs_fq_name:")
+            write(gen_file, "            self.parent_type = kwargs_parent_type")
+            write(gen_file, "            self.fq_name = kwargs_fq_name")
+            write(gen_file, "        else: # No parent obj specified")
+            if len(parents) > 1:
+                # use config-root if it is one of the possible parents
+                if 'config-root' in [parent_ident.getName() for (parent_ident, meta, _) in parents]:
+                    write(gen_file, "            self.fq_name = [name]")
+                else:
+                    write(gen_file, "            # if obj constructed from within server, ignore if parent not specified")
+                    write(gen_file, "            if not kwargs['parent_type']:")
+                    parent_types = [parent_ident.getName() for parent_ident, _, _ in parents]
+                    write(gen_file, "                raise AmbiguousParentError(\"%s\")" % parent_types)
+            else: # only one possible parent
+                (parent_ident, meta, _) = parents[0]
+                if parent_ident.getName() == _BASE_PARENT:
+                    write(gen_file, "            self.fq_name = [name]")
+                else: # parent is not config-root, but parent might have >1 parents
+                    parent_name = parent_ident.getName()
+                    try:
+                        parent_default_fq_name = parent_ident.getDefaultFQName()
+                        write(gen_file, "            self.parent_type = '%s'" %(parent_name))
+                        write(gen_file, "            self.fq_name = %s" %(parent_default_fq_name))
+                        write(gen_file, "            self.fq_name.append(name)")
+                    except AmbiguousParentType as e:
+                        write(gen_file, "            raise AmbiguousParentError(\"%s\")" %(e))
+                    write(gen_file, "")
+                # end parent is config-root check
+            # end num possible parents check
+        else: # no parent in schema
+            write(gen_file, "        self.fq_name = [name]")
+        # end parents exist in schema check
+
+        write(gen_file, "")
+
+        write(gen_file, "        # property fields")
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            write(gen_file, "        if %s is not None:" %(prop_name))
+            write(gen_file, "            self._%s = %s" %(prop_name, prop_name))
+
+        write(gen_file, "    # end __init__")
+        write(gen_file, "")
+
+        # Getters for type independent fields
+        write(gen_file, "    def get_type(self):")
+        write(gen_file, '        """Return object type (%s)."""' %(ident_name))
+        write(gen_file, "        return self._type")
+        write(gen_file, "    # end get_type")
+        write(gen_file, "")
+        write(gen_file, "    def get_fq_name(self):")
+        write(gen_file, '        """Return FQN of %s in list form."""' %(ident_name))
+        write(gen_file, "        return self.fq_name")
+        write(gen_file, "    # end get_fq_name")
+        write(gen_file, "")
+        write(gen_file, "    def get_fq_name_str(self):")
+        write(gen_file, '        """Return FQN of %s as colon delimited string."""' %(ident_name))
+        write(gen_file, "        return ':'.join(self.fq_name)")
+        write(gen_file, "    # end get_fq_name_str")
+        write(gen_file, "")
+        if parents:
+            write(gen_file, "    @property")
+            write(gen_file, "    def parent_name(self):")
+            write(gen_file, "        return self.fq_name[:-1][-1]")
+            write(gen_file, "    # end parent_name")
             write(gen_file, "")
-            backref_field_type_vals = [('%s_back_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
-                                    (ident.getBackLinkFrom(li).getName(),
-                                     ident.getBackLink(li).getXsdType(),
-                                     ident.isLinkDerived(li))
-                                   ) for li in ident.getBackLinksInfo()
-                                     if ident.isLinkRef(li)]
-            write(gen_file, "    backref_field_types = {}")
-            for backref_field, (backref_type, backref_link_type, is_weakref) in backref_field_type_vals:
-                write(gen_file, "    backref_field_types['%s'] = ('%s', '%s', %s)"
-                      %(backref_field, backref_type, backref_link_type, is_weakref))
+            write(gen_file, "    def get_parent_fq_name(self):")
+            write(gen_file, '        """Return FQN of %s\'s parent in list form."""' %(ident_name))
+            write(gen_file, "        if not hasattr(self, 'parent_type'):")
+            write(gen_file, "            # child of config-root")
+            write(gen_file, "            return None")
             write(gen_file, "")
-            children_field_type_vals = [('%ss' %(child_ident.getName().replace('-', '_')),
-                                         (child_ident.getName(),
-                                          child_ident.isDerived(ident)))
-                                        for child_ident in ident.getChildren()]
-            write(gen_file, "    children_field_types = {}")
-            for child_field, (child_type, is_derived) in children_field_type_vals:
-                write(gen_file, "    children_field_types['%s'] = ('%s', %s)"
-                    %(child_field, child_type, is_derived))
+            write(gen_file, "        return self.fq_name[:-1]")
+            write(gen_file, "    # end get_parent_fq_name")
             write(gen_file, "")
-            if parents:
-                p_class_names = [p_ident.getName() for p_ident, _, _ in parents]
-                write(gen_file, "    parent_types = %s" %(p_class_names))
-            else:
-                write(gen_file, "    parent_types = ['config-root']")
+            write(gen_file, "    def get_parent_fq_name_str(self):")
+            write(gen_file, '        """Return FQN of %s\'s parent as colon delimted string."""' %(ident_name))
+            write(gen_file, "        if not hasattr(self, 'parent_type'):")
+            write(gen_file, "            # child of config-root")
+            write(gen_file, "            return None")
             write(gen_file, "")
-            prop_field_meta_vals = [('%s' %(prop.getName().replace('-', '_')),
-                                     '%s' %(prop.getName())) for prop in ident.getProperties()]
-            write(gen_file, "    prop_field_metas = {}")
-            for k,v in prop_field_meta_vals:
-                write(gen_file, "    prop_field_metas['%s'] = '%s'" %(k,v))
+            write(gen_file, "        return ':'.join(self.fq_name[:-1])")
+            write(gen_file, "    # end get_parent_fq_name_str")
             write(gen_file, "")
-            ref_field_meta_vals = [('%s_refs' %(ident.getLinkTo(li).getName().replace('-', '_')),
-                                    '%s' %(ident.getLink(li).getName()))
-                                   for li in ident.getLinksInfo()
-                                   if ident.isLinkRef(li)]
-            write(gen_file, "    ref_field_metas = {}")
-            for ref_field, ref_meta in ref_field_meta_vals:
-                write(gen_file, "    ref_field_metas['%s'] = '%s'"
-                      %(ref_field, ref_meta))
+
+        # Getters and Setters for common fields
+        write(gen_file, "    @property")
+        write(gen_file, "    def uuid(self):")
+        write(gen_file, "        return getattr(self, '_uuid', None)")
+        write(gen_file, "    # end uuid")
+        write(gen_file, "")
+        write(gen_file, "    @uuid.setter")
+        write(gen_file, "    def uuid(self, uuid_val):")
+        write(gen_file, "        self._uuid = uuid_val")
+        write(gen_file, "    # end uuid")
+        write(gen_file, "")
+        write(gen_file, "    def set_uuid(self, uuid_val):")
+        write(gen_file, "        self.uuid = uuid_val")
+        write(gen_file, "    # end set_uuid")
+        write(gen_file, "")
+        write(gen_file, "    def get_uuid(self):")
+        write(gen_file, "        return self.uuid")
+        write(gen_file, "    # end get_uuid")
+        write(gen_file, "")
+
+        # Getters and Setters for properties
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            prop_type = prop.getXsdType()
+            write(gen_file, "    @property")
+            write(gen_file, "    def %s(self):" %(prop_name))
+            write(gen_file, '        """Get %s for %s.' %(prop.getName(), ident_name))
+            write(gen_file, '        ')
+            write(gen_file, '        :returns: %s object' % (prop_type))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        return getattr(self, '_%s', None)" %(prop_name))
+            write(gen_file, "    # end %s" %(prop_name))
             write(gen_file, "")
-            children_field_meta_vals = [('%ss' %(ident.getLinkTo(li).getName().replace('-', '_')),
-                                         '%s' %(ident.getLink(li).getName()))
-                                        for li in ident.getLinksInfo()
-                                        if ident.isLinkHas(li)]
-            write(gen_file, "    children_field_metas = {}")
-            for k,v in children_field_meta_vals:
-                write(gen_file, "    children_field_metas['%s'] = '%s'" %(k,v))
+            write(gen_file, "    @%s.setter" %(prop_name))
+            write(gen_file, "    def %s(self, %s):" %(prop_name, prop_name))
+            write(gen_file, '        """Set %s for %s.' %(prop.getName(), ident_name))
+            write(gen_file, '        ')
+            write(gen_file, '        :param %s: %s object' % (prop_name, prop_type))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        self._%s = %s" %(prop_name, prop_name))
+            write(gen_file, "    # end %s" %(prop_name))
             write(gen_file, "")
-            prop_list_fields = [prop.getName().replace('-', '_')
-                for prop in ident.getProperties() if prop.isList()]
-            write(gen_file, "    prop_list_fields = set(%s)" %(prop_list_fields))
+            write(gen_file, "    def set_%s(self, value):" %(prop_name))
+            write(gen_file, "        self.%s = value" %(prop_name))
+            write(gen_file, "    # end set_%s" %(prop_name))
             write(gen_file, "")
-            prop_list_field_has_wrapper_vals = [
-                ('%s' %(prop.getName().replace('-', '_')),
-                 prop.isListUsingWrapper()) for prop in ident.getProperties() if prop.isList()]
-            write(gen_file, "    prop_list_field_has_wrappers = {}")
-            for k,v in prop_list_field_has_wrapper_vals:
-                write(gen_file, "    prop_list_field_has_wrappers['%s'] = %s" %(k,v))
+            write(gen_file, "    def get_%s(self):" %(prop_name))
+            write(gen_file, "        return self.%s" %(prop_name))
+            write(gen_file, "    # end get_%s" %(prop_name))
             write(gen_file, "")
 
-            prop_map_fields = [prop.getName().replace('-', '_')
-                for prop in ident.getProperties() if prop.isMap()]
-            write(gen_file, "    prop_map_fields = set(%s)" %(prop_map_fields))
-            write(gen_file, "")
-            prop_map_field_has_wrapper_vals = [
-                ('%s' %(prop.getName().replace('-', '_')),
-                 prop.isMapUsingWrapper()) for prop in ident.getProperties() if prop.isMap()]
-            write(gen_file, "    prop_map_field_has_wrappers = {}")
-            for k,v in prop_map_field_has_wrapper_vals:
-                write(gen_file, "    prop_map_field_has_wrappers['%s'] = %s" %(k,v))
-            write(gen_file, "")
-            prop_map_field_key_name_vals = [
-                ('%s' %(prop.getName().replace('-', '_')),
-                 prop.getMapKeyName()) for prop in ident.getProperties() if prop.isMap()]
-            write(gen_file, "    prop_map_field_key_names = {}")
-            for k,v in prop_map_field_key_name_vals:
-                write(gen_file, "    prop_map_field_key_names['%s'] = '%s'" %(k,v))
-            write(gen_file, "")
+        write(gen_file, "    def _serialize_field_to_json(self, serialized, fields_to_serialize, field_name):")
+        write(gen_file, "        if fields_to_serialize is None: # all fields are serialized")
+        write(gen_file, "            serialized[field_name] = getattr(self, field_name)")
+        write(gen_file, "        elif field_name in fields_to_serialize:")
+        write(gen_file, "            serialized[field_name] = getattr(self, field_name)")
+        write(gen_file, "    # end _serialize_field_to_json")
+        write(gen_file, "")
+        write(gen_file, "    def serialize_to_json(self, field_names = None):")
+        write(gen_file, "        serialized = {}")
+        write(gen_file, "")
+        write(gen_file, "        # serialize common fields")
+        write(gen_file, "        self._serialize_field_to_json(serialized, ['uuid'], 'uuid')")
+        write(gen_file, "        self._serialize_field_to_json(serialized, field_names, 'fq_name')")
+        write(gen_file, "        if hasattr(self, 'parent_type'):")
+        write(gen_file, "            self._serialize_field_to_json(serialized, field_names, 'parent_type')")
+        write(gen_file, "        if hasattr(self, 'parent_uuid'):")
+        write(gen_file, "            self._serialize_field_to_json(serialized, field_names, 'parent_uuid')")
+        write(gen_file, "")
 
-            # init args are name, parent_obj(if there is one), props
-            init_args = "self, name = None"
-            if parents:
-                init_args = init_args + ", parent_obj = None"
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                prop_type = prop.getElement().getType()
-                default = prop.getElement().getDefault()
-                mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
-                init_args = init_args + ", %s=%s" %(prop_name, mapped_default)
-
-            write(gen_file, "    def __init__(%s, *args, **kwargs):" %(init_args))
-            write(gen_file, "        # type-independent fields")
-            write(gen_file, "        self._type = '%s'" %(ident_name))
-            write(gen_file, "        if not name:")
-            write(gen_file, "            name = u'%s'" %(my_name_default))
-            write(gen_file, "        self.name = name")
-            write(gen_file, "        self._uuid = None")
-            if parents:
-                write(gen_file, "        # Determine parent type and fq_name")
-                write(gen_file, "        kwargs_parent_type = kwargs.get('parent_type', None)")
-                write(gen_file, "        kwargs_fq_name = kwargs.get('fq_name', None)")
-                write(gen_file, "        if parent_obj:")
-                write(gen_file, "            self.parent_type = parent_obj._type")
-                write(gen_file, "            # copy parent's fq_name")
-                write(gen_file, "            self.fq_name = list(parent_obj.fq_name)")
-                write(gen_file, "            self.fq_name.append(name)")
-                write(gen_file, "        elif kwargs_parent_type and kwargs_fq_name:")
-                write(gen_file, "            self.parent_type = kwargs_parent_type")
-                write(gen_file, "            self.fq_name = kwargs_fq_name")
-                write(gen_file, "        else: # No parent obj specified")
-                if len(parents) > 1:
-                    # use config-root if it is one of the possible parents
-                    if 'config-root' in [parent_ident.getName() for (parent_ident, meta, _) in parents]:
-                        write(gen_file, "            self.fq_name = [name]")
-                    else:
-                        write(gen_file, "            # if obj constructed from within server, ignore if parent not specified")
-                        write(gen_file, "            if not kwargs['parent_type']:")
-                        parent_types = [parent_ident.getName() for parent_ident, _, _ in parents]
-                        write(gen_file, "                raise AmbiguousParentError(\"%s\")" % parent_types)
-                else: # only one possible parent
-                    (parent_ident, meta, _) = parents[0]
-                    if parent_ident.getName() == _BASE_PARENT:
-                        write(gen_file, "            self.fq_name = [name]")
-                    else: # parent is not config-root, but parent might have >1 parents
-                        parent_name = parent_ident.getName()
-                        try:
-                            parent_default_fq_name = parent_ident.getDefaultFQName()
-                            write(gen_file, "            self.parent_type = '%s'" %(parent_name))
-                            write(gen_file, "            self.fq_name = %s" %(parent_default_fq_name))
-                            write(gen_file, "            self.fq_name.append(name)")
-                        except AmbiguousParentType as e:
-                            write(gen_file, "            raise AmbiguousParentError(\"%s\")" %(e))
-                        write(gen_file, "")
-                    # end parent is config-root check
-                # end num possible parents check
-            else: # no parent in schema
-                write(gen_file, "        self.fq_name = [name]")
-            # end parents exist in schema check
+        write(gen_file, "        # serialize property fields")
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            write(gen_file, "        if hasattr(self, '_%s'):" %(prop_name))
+            write(gen_file, "            self._serialize_field_to_json(serialized, field_names, '%s')" %(prop_name))
+        write(gen_file, "")
 
-            write(gen_file, "")
+        write(gen_file, "        # serialize reference fields")
+        for link_info in ident.getLinksInfo():
+            link = ident.getLink(link_info)
+            to_ident = ident.getLinkTo(link_info)
+            to_name = to_ident.getName().replace('-', '_')
+            is_ref = ident.isLinkRef(link_info)
+            if not is_ref:
+                continue
+            write(gen_file, "        if hasattr(self, '%s_refs'):" %(to_name))
+            write(gen_file, "            self._serialize_field_to_json(serialized, field_names, '%s_refs')" %(to_name))
 
-            write(gen_file, "        # property fields")
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                write(gen_file, "        if %s is not None:" %(prop_name))
-                write(gen_file, "            self._%s = %s" %(prop_name, prop_name))
+        write(gen_file, "        return serialized")
+        write(gen_file, "    # end serialize_to_json")
 
-            write(gen_file, "    # end __init__")
-            write(gen_file, "")
+        write(gen_file, "")
 
-            # Getters for type independent fields
-            write(gen_file, "    def get_type(self):")
-            write(gen_file, '        """Return object type (%s)."""' %(ident_name))
-            write(gen_file, "        return self._type")
-            write(gen_file, "    # end get_type")
-            write(gen_file, "")
-            write(gen_file, "    def get_fq_name(self):")
-            write(gen_file, '        """Return FQN of %s in list form."""' %(ident_name))
-            write(gen_file, "        return self.fq_name")
-            write(gen_file, "    # end get_fq_name")
-            write(gen_file, "")
-            write(gen_file, "    def get_fq_name_str(self):")
-            write(gen_file, '        """Return FQN of %s as colon delimited string."""' %(ident_name))
-            write(gen_file, "        return ':'.join(self.fq_name)")
-            write(gen_file, "    # end get_fq_name_str")
+        # Getters and Setters for all types of links
+        # TODO use one loop of getLinksInfo for 'has', 'ref' and implicit backref
+        for link_info in ident.getLinksInfo():
+            link = ident.getLink(link_info)
+            child_ident = ident.getLinkTo(link_info)
+            child_name = child_ident.getName().replace('-', '_')
+            is_has = ident.isLinkHas(link_info)
+            if not is_has:
+                continue
+            # only getter from parent to children
+            write(gen_file, "    def get_%ss(self):" %(child_name))
+            write(gen_file, "        return getattr(self, '%ss', None)" %(child_name))
+            write(gen_file, "    # end get_%ss" %(child_name))
             write(gen_file, "")
-            if parents:
-                write(gen_file, "    @property")
-                write(gen_file, "    def parent_name(self):")
-                write(gen_file, "        return self.fq_name[:-1][-1]")
-                write(gen_file, "    # end parent_name")
-                write(gen_file, "")
-                write(gen_file, "    def get_parent_fq_name(self):")
-                write(gen_file, '        """Return FQN of %s\'s parent in list form."""' %(ident_name))
-                write(gen_file, "        if not hasattr(self, 'parent_type'):")
-                write(gen_file, "            # child of config-root")
-                write(gen_file, "            return None")
-                write(gen_file, "")
-                write(gen_file, "        return self.fq_name[:-1]")
-                write(gen_file, "    # end get_parent_fq_name")
-                write(gen_file, "")
-                write(gen_file, "    def get_parent_fq_name_str(self):")
-                write(gen_file, '        """Return FQN of %s\'s parent as colon delimted string."""' %(ident_name))
-                write(gen_file, "        if not hasattr(self, 'parent_type'):")
-                write(gen_file, "            # child of config-root")
-                write(gen_file, "            return None")
-                write(gen_file, "")
-                write(gen_file, "        return ':'.join(self.fq_name[:-1])")
-                write(gen_file, "    # end get_parent_fq_name_str")
-                write(gen_file, "")
 
-            # Getters and Setters for common fields
-            write(gen_file, "    @property")
-            write(gen_file, "    def uuid(self):")
-            write(gen_file, "        return getattr(self, '_uuid', None)")
-            write(gen_file, "    # end uuid")
+        for link_info in ident.getLinksInfo():
+            link = ident.getLink(link_info)
+            to_ident = ident.getLinkTo(link_info)
+            to_name = to_ident.getName().replace('-', '_')
+            is_ref = ident.isLinkRef(link_info)
+            if not is_ref:
+                continue
+            set_one_args = "self, ref_obj"
+            add_one_args = "self, ref_obj"
+            del_one_args = "self, ref_obj"
+            set_list_args = "self, ref_obj_list"
+            if link.getXsdType(): # link with attr
+               set_one_args = set_one_args + ", ref_data=None"
+               add_one_args = set_one_args
+               set_list_args = set_list_args + ", ref_data_list=None"
+
+               set_one_val = "[{'to':ref_obj.get_fq_name(), 'attr':ref_data}]"
+               add_one_val = "{'to':ref_obj.get_fq_name(), 'attr':ref_data}"
+               set_list_val = "[{'to':ref_obj_list[i], 'attr':ref_data_list[i]} for i in range(len(ref_obj_list))]"
+            else: # link with no attr
+               # TODO always put attr with None?
+               set_one_val = "[{'to':ref_obj.get_fq_name()}]"
+               add_one_val = "{'to':ref_obj.get_fq_name()}"
+               set_list_val = "ref_obj_list"
+            write(gen_file, "    def set_%s(%s):" %(to_name, set_one_args))
+            write(gen_file, '        """Set %s for %s.' %(to_ident.getName(), ident_name))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        self.%s_refs = %s" %(to_name, set_one_val))
+            write(gen_file, "        if ref_obj.uuid:")
+            write(gen_file, "            self.%s_refs[0]['uuid'] = ref_obj.uuid" %(to_name))
             write(gen_file, "")
-            write(gen_file, "    @uuid.setter")
-            write(gen_file, "    def uuid(self, uuid_val):")
-            write(gen_file, "        self._uuid = uuid_val")
-            write(gen_file, "    # end uuid")
+            write(gen_file, "    # end set_%s" %(to_name))
             write(gen_file, "")
-            write(gen_file, "    def set_uuid(self, uuid_val):")
-            write(gen_file, "        self.uuid = uuid_val")
-            write(gen_file, "    # end set_uuid")
+            write(gen_file, "    def add_%s(%s):" %(to_name, add_one_args))
+            write(gen_file, '        """Add %s to %s.' %(to_ident.getName(), ident_name))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        refs = getattr(self, '%s_refs', [])" %(to_name))
+            write(gen_file, "        if not refs:")
+            write(gen_file, "            self.%s_refs = []" %(to_name))
             write(gen_file, "")
-            write(gen_file, "    def get_uuid(self):")
-            write(gen_file, "        return self.uuid")
-            write(gen_file, "    # end get_uuid")
+            write(gen_file, "        # check if ref already exists")
+            if link.getXsdType(): # link with attr
+                write(gen_file, "        # update any attr with it")
+            write(gen_file, "        for ref in refs:")
+            write(gen_file, "            if ref['to'] == ref_obj.get_fq_name():")
+            if link.getXsdType(): # link with attr
+                write(gen_file, "                if ref_data:")
+                write(gen_file, "                    ref['attr'] = ref_data")
+            write(gen_file, "                return")
             write(gen_file, "")
-
-            # Getters and Setters for properties
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                prop_type = prop.getXsdType()
-                write(gen_file, "    @property")
-                write(gen_file, "    def %s(self):" %(prop_name))
-                write(gen_file, '        """Get %s for %s.' %(prop.getName(), ident_name))
-                write(gen_file, '        ')
-                write(gen_file, '        :returns: %s object' % (prop_type))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        return getattr(self, '_%s', None)" %(prop_name))
-                write(gen_file, "    # end %s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    @%s.setter" %(prop_name))
-                write(gen_file, "    def %s(self, %s):" %(prop_name, prop_name))
-                write(gen_file, '        """Set %s for %s.' %(prop.getName(), ident_name))
-                write(gen_file, '        ')
-                write(gen_file, '        :param %s: %s object' % (prop_name, prop_type))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        self._%s = %s" %(prop_name, prop_name))
-                write(gen_file, "    # end %s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    def set_%s(self, value):" %(prop_name))
-                write(gen_file, "        self.%s = value" %(prop_name))
-                write(gen_file, "    # end set_%s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    def get_%s(self):" %(prop_name))
-                write(gen_file, "        return self.%s" %(prop_name))
-                write(gen_file, "    # end get_%s" %(prop_name))
-                write(gen_file, "")
-
-            write(gen_file, "    def _serialize_field_to_json(self, serialized, fields_to_serialize, field_name):")
-            write(gen_file, "        if fields_to_serialize is None: # all fields are serialized")
-            write(gen_file, "            serialized[field_name] = getattr(self, field_name)")
-            write(gen_file, "        elif field_name in fields_to_serialize:")
-            write(gen_file, "            serialized[field_name] = getattr(self, field_name)")
-            write(gen_file, "    # end _serialize_field_to_json")
+            write(gen_file, "        # ref didn't exist before")
+            write(gen_file, "        ref_info = %s" %(add_one_val))
+            write(gen_file, "        if ref_obj.uuid:")
+            write(gen_file, "            ref_info['uuid'] = ref_obj.uuid")
             write(gen_file, "")
-            write(gen_file, "    def serialize_to_json(self, field_names = None):")
-            write(gen_file, "        serialized = {}")
+            write(gen_file, "        self.%s_refs.append(ref_info)" %(to_name))
+            write(gen_file, "    # end add_%s" %(to_name))
             write(gen_file, "")
-            write(gen_file, "        # serialize common fields")
-            write(gen_file, "        self._serialize_field_to_json(serialized, ['uuid'], 'uuid')")
-            write(gen_file, "        self._serialize_field_to_json(serialized, field_names, 'fq_name')")
-            write(gen_file, "        if hasattr(self, 'parent_type'):")
-            write(gen_file, "            self._serialize_field_to_json(serialized, field_names, 'parent_type')")
-            write(gen_file, "        if hasattr(self, 'parent_uuid'):")
-            write(gen_file, "            self._serialize_field_to_json(serialized, field_names, 'parent_uuid')")
+            write(gen_file, "    def del_%s(%s):" %(to_name, del_one_args))
+            write(gen_file, "        refs = self.get_%s_refs()" %(to_name))
+            write(gen_file, "        if not refs:")
+            write(gen_file, "            return")
             write(gen_file, "")
-
-            write(gen_file, "        # serialize property fields")
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                write(gen_file, "        if hasattr(self, '_%s'):" %(prop_name))
-                write(gen_file, "            self._serialize_field_to_json(serialized, field_names, '%s')" %(prop_name))
+            write(gen_file, "        for ref in refs:")
+            write(gen_file, "            if ref['to'] == ref_obj.get_fq_name():")
+            write(gen_file, "                self.%s_refs.remove(ref)" %(to_name))
+            write(gen_file, "                return")
+            write(gen_file, "    # end del_%s" %(to_name))
             write(gen_file, "")
-
-            write(gen_file, "        # serialize reference fields")
-            for link_info in ident.getLinksInfo():
-                link = ident.getLink(link_info)
-                to_ident = ident.getLinkTo(link_info)
-                to_name = to_ident.getName().replace('-', '_')
-                is_ref = ident.isLinkRef(link_info)
-                if not is_ref:
-                    continue
-                write(gen_file, "        if hasattr(self, '%s_refs'):" %(to_name))
-                write(gen_file, "            self._serialize_field_to_json(serialized, field_names, '%s_refs')" %(to_name))
-
-            write(gen_file, "        return serialized")
-            write(gen_file, "    # end serialize_to_json")
-
+            write(gen_file, "    def set_%s_list(%s):" %(to_name, set_list_args))
+            write(gen_file, '        """Set %s list for %s.' %(to_ident.getName(), ident_name))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj_list: list of %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data_list: list of %s object' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        self.%s_refs = %s" %(to_name, set_list_val))
+            write(gen_file, "    # end set_%s_list" %(to_name))
             write(gen_file, "")
-
-            # Getters and Setters for all types of links
-            # TODO use one loop of getLinksInfo for 'has', 'ref' and implicit backref
-            for link_info in ident.getLinksInfo():
-                link = ident.getLink(link_info)
-                child_ident = ident.getLinkTo(link_info)
-                child_name = child_ident.getName().replace('-', '_')
-                is_has = ident.isLinkHas(link_info)
-                if not is_has:
-                    continue
-                # only getter from parent to children
-                write(gen_file, "    def get_%ss(self):" %(child_name))
-                write(gen_file, "        return getattr(self, '%ss', None)" %(child_name))
-                write(gen_file, "    # end get_%ss" %(child_name))
-                write(gen_file, "")
-
-            for link_info in ident.getLinksInfo():
-                link = ident.getLink(link_info)
-                to_ident = ident.getLinkTo(link_info)
-                to_name = to_ident.getName().replace('-', '_')
-                is_ref = ident.isLinkRef(link_info)
-                if not is_ref:
-                    continue
-                set_one_args = "self, ref_obj"
-                add_one_args = "self, ref_obj"
-                del_one_args = "self, ref_obj"
-                set_list_args = "self, ref_obj_list"
-                if link.getXsdType(): # link with attr
-                   set_one_args = set_one_args + ", ref_data=None"
-                   add_one_args = set_one_args
-                   set_list_args = set_list_args + ", ref_data_list=None"
-
-                   set_one_val = "[{'to':ref_obj.get_fq_name(), 'attr':ref_data}]"
-                   add_one_val = "{'to':ref_obj.get_fq_name(), 'attr':ref_data}"
-                   set_list_val = "[{'to':ref_obj_list[i], 'attr':ref_data_list[i]} for i in range(len(ref_obj_list))]"
-                else: # link with no attr
-                   # TODO always put attr with None?
-                   set_one_val = "[{'to':ref_obj.get_fq_name()}]"
-                   add_one_val = "{'to':ref_obj.get_fq_name()}"
-                   set_list_val = "ref_obj_list"
-                write(gen_file, "    def set_%s(%s):" %(to_name, set_one_args))
-                write(gen_file, '        """Set %s for %s.' %(to_ident.getName(), ident_name))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        self.%s_refs = %s" %(to_name, set_one_val))
-                write(gen_file, "        if ref_obj.uuid:")
-                write(gen_file, "            self.%s_refs[0]['uuid'] = ref_obj.uuid" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    # end set_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def add_%s(%s):" %(to_name, add_one_args))
-                write(gen_file, '        """Add %s to %s.' %(to_ident.getName(), ident_name))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        refs = getattr(self, '%s_refs', [])" %(to_name))
-                write(gen_file, "        if not refs:")
-                write(gen_file, "            self.%s_refs = []" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "        # check if ref already exists")
-                if link.getXsdType(): # link with attr
-                    write(gen_file, "        # update any attr with it")
-                write(gen_file, "        for ref in refs:")
-                write(gen_file, "            if ref['to'] == ref_obj.get_fq_name():")
-                if link.getXsdType(): # link with attr
-                    write(gen_file, "                if ref_data:")
-                    write(gen_file, "                    ref['attr'] = ref_data")
-                write(gen_file, "                return")
-                write(gen_file, "")
-                write(gen_file, "        # ref didn't exist before")
-                write(gen_file, "        ref_info = %s" %(add_one_val))
-                write(gen_file, "        if ref_obj.uuid:")
-                write(gen_file, "            ref_info['uuid'] = ref_obj.uuid")
-                write(gen_file, "")
-                write(gen_file, "        self.%s_refs.append(ref_info)" %(to_name))
-                write(gen_file, "    # end add_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def del_%s(%s):" %(to_name, del_one_args))
-                write(gen_file, "        refs = self.get_%s_refs()" %(to_name))
-                write(gen_file, "        if not refs:")
-                write(gen_file, "            return")
-                write(gen_file, "")
-                write(gen_file, "        for ref in refs:")
-                write(gen_file, "            if ref['to'] == ref_obj.get_fq_name():")
-                write(gen_file, "                self.%s_refs.remove(ref)" %(to_name))
-                write(gen_file, "                return")
-                write(gen_file, "    # end del_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def set_%s_list(%s):" %(to_name, set_list_args))
-                write(gen_file, '        """Set %s list for %s.' %(to_ident.getName(), ident_name))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj_list: list of %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data_list: list of %s object' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        self.%s_refs = %s" %(to_name, set_list_val))
-                write(gen_file, "    # end set_%s_list" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def get_%s_refs(self):" %(to_name))
-                write(gen_file, '        """Return %s list for %s.' %(to_ident.getName(), ident_name))
-                write(gen_file, '        ')
-                if link.getXsdType():
-                    write(gen_file, '        :returns: list of tuple <%s, %s>' % (CamelCase(to_ident.getName()),
-                                                link.getXsdType()))
-                else:
-                    write(gen_file, '        :returns: list of <%s>' % (CamelCase(to_ident.getName())))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        return getattr(self, '%s_refs', None)" %(to_name))
-                write(gen_file, "    # end get_%s_refs" %(to_name))
-                write(gen_file, "")
-
-            # Getters for back reference links
-            for back_link_info in ident.getBackLinksInfo():
-                from_ident = ident.getBackLinkFrom(back_link_info)
-                from_name = from_ident.getName().replace('-', '_')
-                write(gen_file, "    def get_%s_back_refs(self):" %(from_name))
-                write(gen_file, '        """Return list of all %ss using this %s"""' % (from_ident.getName(),ident_name))
-                write(gen_file, "        return getattr(self, '%s_back_refs', None)" %(from_name))
-                write(gen_file, "    # end get_%s_back_refs" %(from_name))
-                write(gen_file, "")
-
-            # dump method
-            write(gen_file, "    def dump(self):")
-            write(gen_file, '        """Display %s object in compact form."""' %(ident_name))
-            write(gen_file, "        print '------------ %s ------------'" % (ident_name))
-            write(gen_file, "        print 'Name = ', self.get_fq_name()")
-            write(gen_file, "        print 'Uuid = ', self.uuid")
-            if parents:
-                write(gen_file, "        if hasattr(self, 'parent_type'): # non config-root children")
-                write(gen_file, "            print 'Parent Type = ', self.parent_type")
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                write(gen_file, "        print 'P %s = ', self.get_%s()" %(prop_name, prop_name))
-            for link_info in ident.getLinksInfo():
-                to_ident = ident.getLinkTo(link_info)
-                to_ident_name = to_ident.getName().replace('-', '_')
-                is_ref = ident.isLinkRef(link_info)
-                if is_ref:
-                    write(gen_file, "        print 'REF %s = ', self.get_%s_refs()" %(to_ident_name, to_ident_name))
-                else:
-                    write(gen_file, "        print 'HAS %s = ', self.get_%ss()" %(to_ident_name, to_ident_name))
-            for back_link_info in ident.getBackLinksInfo():
-                if not ident.isLinkRef(back_link_info):
-                    continue
-                from_ident = ident.getBackLinkFrom(back_link_info)
-                from_ident_name = from_ident.getName().replace('-', '_')
-                write(gen_file, "        print 'BCK %s = ', self.get_%s_back_refs()" %(from_ident_name, from_ident_name))
-            write(gen_file, "    # end dump")
+            write(gen_file, "    def get_%s_refs(self):" %(to_name))
+            write(gen_file, '        """Return %s list for %s.' %(to_ident.getName(), ident_name))
+            write(gen_file, '        ')
+            if link.getXsdType():
+                write(gen_file, '        :returns: list of tuple <%s, %s>' % (CamelCase(to_ident.getName()),
+                                            link.getXsdType()))
+            else:
+                write(gen_file, '        :returns: list of <%s>' % (CamelCase(to_ident.getName())))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        return getattr(self, '%s_refs', None)" %(to_name))
+            write(gen_file, "    # end get_%s_refs" %(to_name))
             write(gen_file, "")
 
-            write(gen_file, "# end class %s" %(class_name))
+        # Getters for back reference links
+        for back_link_info in ident.getBackLinksInfo():
+            from_ident = ident.getBackLinkFrom(back_link_info)
+            from_name = from_ident.getName().replace('-', '_')
+            write(gen_file, "    def get_%s_back_refs(self):" %(from_name))
+            write(gen_file, '        """Return list of all %ss using this %s"""' % (from_ident.getName(),ident_name))
+            write(gen_file, "        return getattr(self, '%s_back_refs', None)" %(from_name))
+            write(gen_file, "    # end get_%s_back_refs" %(from_name))
             write(gen_file, "")
 
-    # end _generate_common_classes
+        # dump method
+        write(gen_file, "    def dump(self):")
+        write(gen_file, '        """Display %s object in compact form."""' %(ident_name))
+        write(gen_file, "        print '------------ %s ------------'" % (ident_name))
+        write(gen_file, "        print 'Name = ', self.get_fq_name()")
+        write(gen_file, "        print 'Uuid = ', self.uuid")
+        if parents:
+            write(gen_file, "        if hasattr(self, 'parent_type'): # non config-root children")
+            write(gen_file, "            print 'Parent Type = ', self.parent_type")
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            write(gen_file, "        print 'P %s = ', self.get_%s()" %(prop_name, prop_name))
+        for link_info in ident.getLinksInfo():
+            to_ident = ident.getLinkTo(link_info)
+            to_ident_name = to_ident.getName().replace('-', '_')
+            is_ref = ident.isLinkRef(link_info)
+            if is_ref:
+                write(gen_file, "        print 'REF %s = ', self.get_%s_refs()" %(to_ident_name, to_ident_name))
+            else:
+                write(gen_file, "        print 'HAS %s = ', self.get_%ss()" %(to_ident_name, to_ident_name))
+        for back_link_info in ident.getBackLinksInfo():
+            if not ident.isLinkRef(back_link_info):
+                continue
+            from_ident = ident.getBackLinkFrom(back_link_info)
+            from_ident_name = from_ident.getName().replace('-', '_')
+            write(gen_file, "        print 'BCK %s = ', self.get_%s_back_refs()" %(from_ident_name, from_ident_name))
+        write(gen_file, "    # end dump")
+        write(gen_file, "")
+
+        write(gen_file, "# end class %s" %(class_name))
+        write(gen_file, "")
+    # end _generate_common_class
 
     def _generate_client_classes(self, gen_filepath_pfx, gen_filename_pfx):
         gen_file = self._xsd_parser.makeFile(gen_filepath_pfx + "_client.py")
@@ -810,394 +824,500 @@ class IFMapApiGenerator(object):
 
         write(gen_file, "")
         for ident in self._non_exclude_idents():
-            parents = ident.getParents()
-            class_name = CamelCase(ident.getName())
-            method_name = ident.getName().replace('-', '_')
-            write(gen_file, "class %s(vnc_api.gen.%s_common.%s):" \
-                                   %(class_name, gen_filename_pfx, class_name))
-            write(gen_file, "    create_uri = ''")
-            write(gen_file, "    resource_uri_base = {}")
-
-            # init args are name, parent_obj(if there is one), props
-            init_args = "self, name=None"
-            super_args = "name"
-            if parents:
-                init_args = init_args + ", parent_obj=None"
-                super_args = super_args + ", parent_obj"
+            self._generate_client_class(gen_file, ident, gen_filename_pfx,
+                "vnc_api.gen.%s_xsd" %(gen_filename_pfx))
+    # end _generate_client_classes
 
-            write(gen_file, "    def __init__(%s, *args, **kwargs):" %(init_args))
-            if parents:
-                write(gen_file, "        pending_fields = ['fq_name', 'parent_type']")
+    def _generate_client_class(self, gen_file, ident, gen_filename_pfx,
+                               xsd_module):
+        parents = ident.getParents()
+        class_name = CamelCase(ident.getName())
+        method_name = ident.getName().replace('-', '_')
+        write(gen_file, "class %s(vnc_api.gen.%s_common.%s):" \
+                               %(class_name, gen_filename_pfx, class_name))
+        write(gen_file, "    create_uri = ''")
+        write(gen_file, "    resource_uri_base = {}")
+
+        # init args are name, parent_obj(if there is one), props
+        init_args = "self, name=None"
+        super_args = "name"
+        if parents:
+            init_args = init_args + ", parent_obj=None"
+            super_args = super_args + ", parent_obj"
+
+        write(gen_file, "    def __init__(%s, *args, **kwargs):" %(init_args))
+        if parents:
+            write(gen_file, "        pending_fields = ['fq_name', 'parent_type']")
+        else:
+            write(gen_file, "        pending_fields = ['fq_name']")
+        write(gen_file, "")
+        write(gen_file, "        self._server_conn = None")
+        write(gen_file, "")
+        for prop_index, prop in enumerate(ident.getProperties()):
+            prop_name = prop.getName().replace('-', '_')
+            prop_type = prop.getElement().getType()
+            default = prop.getElement().getDefault()
+            mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
+            write(gen_file, "        if len(args) > %d or '%s' in kwargs:" % (prop_index, prop_name))
+            write(gen_file, "            pending_fields.append('%s')" %(prop_name))
+
+        write(gen_file, "")
+        write(gen_file, "        self._pending_field_updates = set(pending_fields)")
+        write(gen_file, "        # dict of prop-list-fields with list of opers")
+        write(gen_file, "        self._pending_field_list_updates = {}")
+        write(gen_file, "        # dict of prop-map-fields with list of opers")
+        write(gen_file, "        self._pending_field_map_updates = {}")
+        write(gen_file, "        self._pending_ref_updates = set([])")
+        write(gen_file, "")
+        write(gen_file, "        super(%s, self).__init__(%s, *args, **kwargs)" %(class_name, super_args))
+        write(gen_file, "    # end __init__")
+        write(gen_file, "")
+        write(gen_file, "    def get_pending_updates(self):")
+        write(gen_file, "        return self._pending_field_updates")
+        write(gen_file, "    # end get_pending_updates")
+        write(gen_file, "")
+        write(gen_file, "    def get_ref_updates(self):")
+        write(gen_file, "        return self._pending_ref_updates")
+        write(gen_file, "    # end get_ref_updates")
+        write(gen_file, "")
+        write(gen_file, "    def clear_pending_updates(self):")
+        write(gen_file, "        self._pending_field_updates = set([])")
+        write(gen_file, "        self._pending_field_list_updates = {}")
+        write(gen_file, "        self._pending_field_map_updates = {}")
+        write(gen_file, "        self._pending_ref_updates = set([])")
+        write(gen_file, "    # end clear_pending_updates")
+        write(gen_file, "")
+        write(gen_file, "    def set_server_conn(self, vnc_api_handle):")
+        write(gen_file, "        self._server_conn = vnc_api_handle")
+        write(gen_file, "    # end set_server_conn")
+        write(gen_file, "")
+        write(gen_file, "    @classmethod")
+        write(gen_file, "    def from_dict(cls, **kwargs):")
+        write(gen_file, "        props_dict = {}")
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            complex_type = prop.getCType()
+            xsd_type = prop.getXsdType()
+            write(gen_file, "        try:")
+            if complex_type and xsd_type:
+                write(gen_file, "            if kwargs['%s'] is None:" % prop_name)
+                write(gen_file, "                props_dict['%s'] = None" % prop_name)
+                write(gen_file, "            else:")
+                if ((prop.isList() and not prop.isListUsingWrapper()) or
+                    (prop.isMap() and not prop.isMapUsingWrapper())):
+                    write(gen_file, "                props_dict['%s'] = []" %(prop_name))
+                    write(gen_file, "                for elem in kwargs['%s']:" %(prop_name))
+                    write(gen_file, "                    props_dict['%s'].append(" %(prop_name))
+                    write(gen_file, "                        %s.%s(**elem))" \
+                                                             %(xsd_module, xsd_type))
+                else:
+                    write(gen_file, "                props_dict['%s'] = %s.%s(params_dict=kwargs[u'%s'])" \
+                                                             %(prop_name, xsd_module, xsd_type, prop_name))
             else:
-                write(gen_file, "        pending_fields = ['fq_name']")
-            write(gen_file, "")
-            write(gen_file, "        self._server_conn = None")
+                write(gen_file, "            props_dict['%s'] = kwargs[u'%s']" %(prop_name, prop_name))
+            write(gen_file, "        except KeyError:")
+            write(gen_file, "            pass")
             write(gen_file, "")
-            for prop_index, prop in enumerate(ident.getProperties()):
-                prop_name = prop.getName().replace('-', '_')
-                prop_type = prop.getElement().getType()
-                default = prop.getElement().getDefault()
-                mapped_default = self._type_genr._LangGenr.getMappedDefault(prop_type, default)
-                write(gen_file, "        if len(args) > %d or '%s' in kwargs:" % (prop_index, prop_name))
-                write(gen_file, "            pending_fields.append('%s')" %(prop_name))
 
-            write(gen_file, "")
-            write(gen_file, "        self._pending_field_updates = set(pending_fields)")
-            write(gen_file, "        # dict of prop-list-fields with list of opers")
-            write(gen_file, "        self._pending_field_list_updates = {}")
-            write(gen_file, "        # dict of prop-map-fields with list of opers")
-            write(gen_file, "        self._pending_field_map_updates = {}")
-            write(gen_file, "        self._pending_ref_updates = set([])")
-            write(gen_file, "")
-            write(gen_file, "        super(%s, self).__init__(%s, *args, **kwargs)" %(class_name, super_args))
-            write(gen_file, "    # end __init__")
-            write(gen_file, "")
-            write(gen_file, "    def get_pending_updates(self):")
-            write(gen_file, "        return self._pending_field_updates")
-            write(gen_file, "    # end get_pending_updates")
-            write(gen_file, "")
-            write(gen_file, "    def get_ref_updates(self):")
-            write(gen_file, "        return self._pending_ref_updates")
-            write(gen_file, "    # end get_ref_updates")
-            write(gen_file, "")
-            write(gen_file, "    def clear_pending_updates(self):")
-            write(gen_file, "        self._pending_field_updates = set([])")
-            write(gen_file, "        self._pending_field_list_updates = {}")
-            write(gen_file, "        self._pending_field_map_updates = {}")
-            write(gen_file, "        self._pending_ref_updates = set([])")
-            write(gen_file, "    # end clear_pending_updates")
-            write(gen_file, "")
-            write(gen_file, "    def set_server_conn(self, vnc_api_handle):")
-            write(gen_file, "        self._server_conn = vnc_api_handle")
-            write(gen_file, "    # end set_server_conn")
-            write(gen_file, "")
-            write(gen_file, "    @classmethod")
-            write(gen_file, "    def from_dict(cls, **kwargs):")
-            write(gen_file, "        props_dict = {}")
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                complex_type = prop.getCType()
-                xsd_type = prop.getXsdType()
+        write(gen_file, "")
+        write(gen_file, "        # obj constructor takes only props")
+        write(gen_file, "        parent_type = kwargs.get(u'parent_type', None)")
+        write(gen_file, "        fq_name = kwargs.get(u'fq_name')")
+        write(gen_file, "        props_dict.update({'parent_type': parent_type, 'fq_name': fq_name})")
+        write(gen_file, "        if fq_name == None:")
+        write(gen_file, "            obj = %s(**props_dict)" %(class_name))
+        write(gen_file, "        else:")
+        write(gen_file, "            obj = %s(fq_name[-1], **props_dict)" %(class_name))
+        write(gen_file, "        obj.uuid = kwargs.get(u'uuid')")
+        write(gen_file, "        try:")
+        write(gen_file, "            obj.parent_uuid = kwargs[u'parent_uuid']")
+        write(gen_file, "        except KeyError:")
+        write(gen_file, "            pass")
+        write(gen_file, "")
+        write(gen_file, "        # add summary of any children...")
+        children_idents = ident.getChildren()
+        if children_idents:
+            for child_ident in children_idents:
+                child_name = child_ident.getName()
+                child_method_name = child_name.replace('-', '_')
                 write(gen_file, "        try:")
-                if complex_type and xsd_type:
-                    write(gen_file, "            if kwargs['%s'] is None:" % prop_name)
-                    write(gen_file, "                props_dict['%s'] = None" % prop_name)
-                    write(gen_file, "            else:")
-                    if ((prop.isList() and not prop.isListUsingWrapper()) or
-                        (prop.isMap() and not prop.isMapUsingWrapper())):
-                        write(gen_file, "                props_dict['%s'] = []" %(prop_name))
-                        write(gen_file, "                for elem in kwargs['%s']:" %(prop_name))
-                        write(gen_file, "                    props_dict['%s'].append(" %(prop_name))
-                        write(gen_file, "                        vnc_api.gen.%s_xsd.%s(**elem))" \
-                                                                 %(gen_filename_pfx, xsd_type))
-                    else:
-                        write(gen_file, "                props_dict['%s'] = vnc_api.gen.%s_xsd.%s(params_dict=kwargs[u'%s'])" \
-                                                                 %(prop_name, gen_filename_pfx, xsd_type, prop_name))
-                else:
-                    write(gen_file, "            props_dict['%s'] = kwargs[u'%s']" %(prop_name, prop_name))
+                write(gen_file, "            obj.%ss = kwargs[u'%ss']" %(child_method_name, child_method_name))
                 write(gen_file, "        except KeyError:")
                 write(gen_file, "            pass")
-                write(gen_file, "")
+        write(gen_file, "")
 
-            write(gen_file, "")
-            write(gen_file, "        # obj constructor takes only props")
-            write(gen_file, "        parent_type = kwargs.get(u'parent_type', None)")
-            write(gen_file, "        fq_name = kwargs.get(u'fq_name')")
-            write(gen_file, "        props_dict.update({'parent_type': parent_type, 'fq_name': fq_name})")
-            write(gen_file, "        if fq_name == None:")
-            write(gen_file, "            obj = %s(**props_dict)" %(class_name))
-            write(gen_file, "        else:")
-            write(gen_file, "            obj = %s(fq_name[-1], **props_dict)" %(class_name))
-            write(gen_file, "        obj.uuid = kwargs.get(u'uuid')")
+        write(gen_file, "        # add any specified references...")
+        for link_info in ident.getLinksInfo():
+            if not ident.isLinkRef(link_info):
+                continue
+            link = ident.getLink(link_info)
+            link_name = link.getName()
+            link_type = ident.getLink(link_info).getXsdType()
+            to_ident = ident.getLinkTo(link_info)
+            to_name = to_ident.getName().replace('-', '_')
+            write(gen_file, "        try:")
+            write(gen_file, "            obj.%s_refs = kwargs[u'%s_refs']" %(to_name, to_name))
+            if link_type: # link with attributes
+                write(gen_file, "            for ref in obj.%s_refs:" %(to_name))
+                write(gen_file, "                ref['attr'] = %s.%s(params_dict=ref[u'attr'])" %(xsd_module, link_type))
+            write(gen_file, "        except KeyError:")
+            write(gen_file, "            pass")
+
+        write(gen_file, "")
+        write(gen_file, "        # and back references but no obj api for it...")
+        for back_link_info in ident.getBackLinksInfo():
+            if not ident.isLinkRef(back_link_info):
+                continue
+            back_link = ident.getLink(back_link_info)
+            back_link_name = back_link.getName()
+            back_link_type = ident.getLink(back_link_info).getXsdType()
+            from_ident = ident.getBackLinkFrom(back_link_info)
+            from_name = from_ident.getName().replace('-', '_')
             write(gen_file, "        try:")
-            write(gen_file, "            obj.parent_uuid = kwargs[u'parent_uuid']")
+            write(gen_file, "            obj.%s_back_refs = kwargs[u'%s_back_refs']" %(from_name, from_name))
             write(gen_file, "        except KeyError:")
             write(gen_file, "            pass")
+
+        write(gen_file, "")
+        write(gen_file, "        return obj")
+        write(gen_file, "    # end from_dict")
+        write(gen_file, "")
+
+        # Setters for common fields
+        write(gen_file, "    @vnc_api.gen.%s_common.%s.uuid.setter" %(gen_filename_pfx, class_name))
+        write(gen_file, "    def uuid(self, uuid_val):")
+        write(gen_file, "        self._uuid = uuid_val")
+        write(gen_file, "        if 'uuid' not in self._pending_field_updates:")
+        write(gen_file, "            self._pending_field_updates.add('uuid')")
+        write(gen_file, "    # end uuid")
+        write(gen_file, "")
+        write(gen_file, "    def set_uuid(self, uuid_val):")
+        write(gen_file, "        self.uuid = uuid_val")
+        write(gen_file, "    # end set_uuid")
+        write(gen_file, "")
+
+        # Setters for properties
+        for prop in ident.getProperties():
+            prop_name = prop.getName().replace('-', '_')
+            prop_type = prop.getXsdType()
+            write(gen_file, "    @vnc_api.gen.%s_common.%s.%s.setter" %(gen_filename_pfx, class_name, prop_name))
+            write(gen_file, "    def %s(self, %s):" %(prop_name, prop_name))
+            write(gen_file, '        """Set %s for %s.' %(prop.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param %s: %s object' % (prop_name, prop_type))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        if '%s' not in self._pending_field_updates:" %(prop_name))
+            write(gen_file, "            self._pending_field_updates.add('%s')" %(prop_name))
             write(gen_file, "")
-            write(gen_file, "        # add summary of any children...")
-            children_idents = ident.getChildren()
-            if children_idents:
-                for child_ident in children_idents:
-                    child_name = child_ident.getName()
-                    child_method_name = child_name.replace('-', '_')
-                    write(gen_file, "        try:")
-                    write(gen_file, "            obj.%ss = kwargs[u'%ss']" %(child_method_name, child_method_name))
-                    write(gen_file, "        except KeyError:")
-                    write(gen_file, "            pass")
+            if prop.isList():
+                write(gen_file, "        if '%s' in self._pending_field_list_updates:" %(prop_name))
+                write(gen_file, "            # set clobbers earlier add/del on prop list elements")
+                write(gen_file, "            del self._pending_field_list_updates['%s']" %(prop_name))
+                write(gen_file, "")
+            if prop.isMap():
+                write(gen_file, "        if '%s' in self._pending_field_map_updates:" %(prop_name))
+                write(gen_file, "            # set clobbers earlier add/del on prop map elements")
+                write(gen_file, "            del self._pending_field_map_updates['%s']" %(prop_name))
+                write(gen_file, "")
+            write(gen_file, "        self._%s = %s" %(prop_name, prop_name))
+            write(gen_file, "    # end %s" %(prop_name))
+            write(gen_file, "")
+            write(gen_file, "    def set_%s(self, value):" %(prop_name))
+            write(gen_file, "        self.%s = value" %(prop_name))
+            write(gen_file, "    # end set_%s" %(prop_name))
             write(gen_file, "")
 
-            write(gen_file, "        # add any specified references...")
-            for link_info in ident.getLinksInfo():
-                if not ident.isLinkRef(link_info):
-                    continue
-                link = ident.getLink(link_info)
-                link_name = link.getName()
-                link_type = ident.getLink(link_info).getXsdType()
-                to_ident = ident.getLinkTo(link_info)
-                to_name = to_ident.getName().replace('-', '_')
-                write(gen_file, "        try:")
-                write(gen_file, "            obj.%s_refs = kwargs[u'%s_refs']" %(to_name, to_name))
-                if link_type: # link with attributes
-                    write(gen_file, "            for ref in obj.%s_refs:" %(to_name))
-                    write(gen_file, "                ref['attr'] = vnc_api.gen.%s_xsd.%s(params_dict=ref[u'attr'])" %(gen_filename_pfx, link_type))
-                write(gen_file, "        except KeyError:")
-                write(gen_file, "            pass")
-
+        # Atomic Setters for properties that are lists
+        for prop in ident.getProperties():
+            if not prop.isList():
+                continue
+            prop_name = prop.getName().replace('-', '_')
+            write(gen_file, "    def add_%s(self, elem_value, elem_position=None):" %(prop_name))
+            write(gen_file, '        """Add element to %s for %s.' %(prop.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param elem_value: %s object' % (prop_type))
+            write(gen_file, '        :param elem_position: optional string order-key')
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        if '%s' not in self._pending_field_list_updates:" %(prop_name))
+            write(gen_file, "            self._pending_field_list_updates['%s'] = [" %(prop_name))
+            write(gen_file, "                ('add', elem_value, elem_position)]")
+            write(gen_file, "        else:")
+            write(gen_file, "            self._pending_field_list_updates['%s'].append(" %(prop_name))
+            write(gen_file, "                ('add', elem_value, elem_position))")
+            write(gen_file, "    # end add_%s" %(prop_name))
             write(gen_file, "")
-            write(gen_file, "        # and back references but no obj api for it...")
-            for back_link_info in ident.getBackLinksInfo():
-                if not ident.isLinkRef(back_link_info):
-                    continue
-                back_link = ident.getLink(back_link_info)
-                back_link_name = back_link.getName()
-                back_link_type = ident.getLink(back_link_info).getXsdType()
-                from_ident = ident.getBackLinkFrom(back_link_info)
-                from_name = from_ident.getName().replace('-', '_')
-                write(gen_file, "        try:")
-                write(gen_file, "            obj.%s_back_refs = kwargs[u'%s_back_refs']" %(from_name, from_name))
-                write(gen_file, "        except KeyError:")
-                write(gen_file, "            pass")
+            write(gen_file, "    def del_%s(self, elem_position):" %(prop_name))
+            write(gen_file, '        """Delete element from %s for %s.' %(prop.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param elem_position: string indicating order-key')
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        if '%s' not in self._pending_field_list_updates:" %(prop_name))
+            write(gen_file, "            self._pending_field_list_updates['%s'] = [" %(prop_name))
+            write(gen_file, "                ('delete', None, elem_position)]")
+            write(gen_file, "        else:")
+            write(gen_file, "            self._pending_field_list_updates['%s'].append(" %(prop_name))
+            write(gen_file, "                ('delete', None, elem_position))")
+            write(gen_file, "    # end del_%s" %(prop_name))
 
+        # Atomic Setters for properties that are maps
+        for prop in ident.getProperties():
+            if not prop.isMap():
+                continue
+            prop_name = prop.getName().replace('-', '_')
+            write(gen_file, "    def add_%s(self, elem):" %(prop_name))
+            write(gen_file, '        """Add element to %s for %s.' %(prop.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param elem: %s object' % (prop_type))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        elem_position = getattr(elem, '%s')" %(prop.getMapKeyName()))
+            write(gen_file, "        if '%s' not in self._pending_field_map_updates:" %(prop_name))
+            write(gen_file, "            self._pending_field_map_updates['%s'] = [" %(prop_name))
+            write(gen_file, "                ('set', elem, elem_position)]")
+            write(gen_file, "        else:")
+            write(gen_file, "            self._pending_field_map_updates['%s'].append(" %(prop_name))
+            write(gen_file, "                ('set', elem, elem_position))")
+            write(gen_file, "    # end set_%s" %(prop_name))
+            write(gen_file, "")
+            write(gen_file, "    def del_%s(self, elem_position):" %(prop_name))
+            write(gen_file, '        """Delete element from %s for %s.' %(prop.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param elem_position: string indicating map-key')
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        if '%s' not in self._pending_field_map_updates:" %(prop_name))
+            write(gen_file, "            self._pending_field_map_updates['%s'] = [" %(prop_name))
+            write(gen_file, "                ('delete', None, elem_position)]")
+            write(gen_file, "        else:")
+            write(gen_file, "            self._pending_field_map_updates['%s'].append(" %(prop_name))
+            write(gen_file, "                ('delete', None, elem_position))")
+            write(gen_file, "    # end del_%s" %(prop_name))
+
+        # Setters for references
+        for link_info in ident.getLinksInfo():
+            link = ident.getLink(link_info)
+            to_ident = ident.getLinkTo(link_info)
+            to_name = to_ident.getName().replace('-', '_')
+            is_ref = ident.isLinkRef(link_info)
+            if not is_ref:
+                continue
+            write(gen_file, "    def set_%s(self, *args, **kwargs):" %(to_name))
+            write(gen_file, '        """Set %s for %s.' %(to_ident.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        self._pending_field_updates.add('%s_refs')" %(to_name))
+            write(gen_file, "        self._pending_ref_updates.discard('%s_refs')" %(to_name))
+            write(gen_file, "        super(%s, self).set_%s(*args, **kwargs)" %(class_name, to_name))
             write(gen_file, "")
-            write(gen_file, "        return obj")
-            write(gen_file, "    # end from_dict")
+            write(gen_file, "    # end set_%s" %(to_name))
+            write(gen_file, "")
+            write(gen_file, "    def add_%s(self, *args, **kwargs):" %(to_name))
+            write(gen_file, '        """Add %s to %s.' %(to_ident.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        if '%s_refs' not in self._pending_ref_updates|self._pending_field_updates:" %(to_name))
+            write(gen_file, "            self._pending_ref_updates.add('%s_refs')" %(to_name))
+            write(gen_file, "            self._original_%s_refs = copy.deepcopy(self.get_%s_refs() or [])" %(to_name, to_name))
+            write(gen_file, "        super(%s, self).add_%s(*args, **kwargs)" %(class_name, to_name))
+            write(gen_file, "    # end add_%s" %(to_name))
+            write(gen_file, "")
+            write(gen_file, "    def del_%s(self, *args, **kwargs):" %(to_name))
+            write(gen_file, "        if '%s_refs' not in self._pending_ref_updates:" %(to_name))
+            write(gen_file, "            self._pending_ref_updates.add('%s_refs')" %(to_name))
+            write(gen_file, "            self._original_%s_refs = copy.deepcopy(self.get_%s_refs() or [])" %(to_name, to_name))
+            write(gen_file, "        super(%s, self).del_%s(*args, **kwargs)" %(class_name, to_name))
+            write(gen_file, "    # end del_%s" %(to_name))
+            write(gen_file, "")
+            write(gen_file, "    def set_%s_list(self, *args, **kwargs):" %(to_name))
+            write(gen_file, '        """Set %s list for %s.' %(to_ident.getName(), ident.getName()))
+            write(gen_file, '        ')
+            write(gen_file, '        :param ref_obj_list: list of %s object' %(CamelCase(to_ident.getName())))
+            if link.getXsdType():
+                write(gen_file, '        :param ref_data_list: list of %s summary' %(link.getXsdType()))
+            write(gen_file, '        ')
+            write(gen_file, '        """')
+            write(gen_file, "        self._pending_field_updates.add('%s_refs')" %(to_name))
+            write(gen_file, "        self._pending_ref_updates.discard('%s_refs')" %(to_name))
+            write(gen_file, "        super(%s, self).set_%s_list(*args, **kwargs)" %(class_name, to_name))
+            write(gen_file, "    # end set_%s_list" %(to_name))
             write(gen_file, "")
 
-            # Setters for common fields
-            write(gen_file, "    @vnc_api.gen.%s_common.%s.uuid.setter" %(gen_filename_pfx, class_name))
-            write(gen_file, "    def uuid(self, uuid_val):")
-            write(gen_file, "        self._uuid = uuid_val")
-            write(gen_file, "        if 'uuid' not in self._pending_field_updates:")
-            write(gen_file, "            self._pending_field_updates.add('uuid')")
-            write(gen_file, "    # end uuid")
+        # Getters for children links
+        for child_ident in ident.getChildren():
+            child_name = child_ident.getName()
+            child_method_name = child_name.replace('-', '_')
+            write(gen_file, "    def get_%ss(self):" %(child_method_name))
+            write(gen_file, "        if hasattr(self, '%ss'):" % child_method_name)
+            write(gen_file, "            return self.%ss" % child_method_name)
             write(gen_file, "")
-            write(gen_file, "    def set_uuid(self, uuid_val):")
-            write(gen_file, "        self.uuid = uuid_val")
-            write(gen_file, "    # end set_uuid")
+            write(gen_file, "        if hasattr(super(%s, self), '%ss'):" % (class_name, child_method_name))
+            write(gen_file, "            return super(%s, self).get_%ss()" % (class_name, child_method_name))
             write(gen_file, "")
+            write(gen_file, "        # read it for first time")
+            write(gen_file, "        # if object not created/read from lib can't service")
+            write(gen_file, "        svr_conn = self._server_conn")
+            write(gen_file, "        if not svr_conn:")
+            write(gen_file, "            return None")
+            write(gen_file, "")
+            write(gen_file, "        try:")
+            write(gen_file, "            obj = svr_conn.%s_read(id = self.uuid, fields = ['%ss'])" % (method_name, child_method_name))
+            write(gen_file, "        except NoIdError:")
+            write(gen_file, "            return None")
+            write(gen_file, "        children = getattr(obj, '%ss', None)" % (child_method_name))
+            write(gen_file, "        if not children:")
+            write(gen_file, "            return None")
+            write(gen_file, "        self.%ss = children" % (child_method_name))
+            write(gen_file, "")
+            write(gen_file, "        return children")
+            write(gen_file, "    # end get_%ss" % (child_method_name))
+            write(gen_file, "")
+        write(gen_file, "")
 
-            # Setters for properties
-            for prop in ident.getProperties():
-                prop_name = prop.getName().replace('-', '_')
-                prop_type = prop.getXsdType()
-                write(gen_file, "    @vnc_api.gen.%s_common.%s.%s.setter" %(gen_filename_pfx, class_name, prop_name))
-                write(gen_file, "    def %s(self, %s):" %(prop_name, prop_name))
-                write(gen_file, '        """Set %s for %s.' %(prop.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param %s: %s object' % (prop_name, prop_type))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        if '%s' not in self._pending_field_updates:" %(prop_name))
-                write(gen_file, "            self._pending_field_updates.add('%s')" %(prop_name))
-                write(gen_file, "")
-                if prop.isList():
-                    write(gen_file, "        if '%s' in self._pending_field_list_updates:" %(prop_name))
-                    write(gen_file, "            # set clobbers earlier add/del on prop list elements")
-                    write(gen_file, "            del self._pending_field_list_updates['%s']" %(prop_name))
-                    write(gen_file, "")
-                if prop.isMap():
-                    write(gen_file, "        if '%s' in self._pending_field_map_updates:" %(prop_name))
-                    write(gen_file, "            # set clobbers earlier add/del on prop map elements")
-                    write(gen_file, "            del self._pending_field_map_updates['%s']" %(prop_name))
-                    write(gen_file, "")
-                write(gen_file, "        self._%s = %s" %(prop_name, prop_name))
-                write(gen_file, "    # end %s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    def set_%s(self, value):" %(prop_name))
-                write(gen_file, "        self.%s = value" %(prop_name))
-                write(gen_file, "    # end set_%s" %(prop_name))
-                write(gen_file, "")
+        # Getters for back reference links
+        for back_link_info in ident.getBackLinksInfo():
+            if not ident.isLinkRef(back_link_info):
+                continue
+            from_ident = ident.getBackLinkFrom(back_link_info)
+            from_name = from_ident.getName().replace('-', '_')
+            write(gen_file, "    def get_%s_back_refs(self):" %(from_name))
+            write(gen_file, '        """Return list of all %ss using this %s"""' % (from_ident.getName(), ident.getName()))
+            write(gen_file, "        if hasattr(self, '%s_back_refs'):" % from_name)
+            write(gen_file, "            return self.%s_back_refs" % from_name)
+            write(gen_file, "")
+            write(gen_file, "        if hasattr(super(%s, self), '%s_back_refs'):" % (class_name, from_name))
+            write(gen_file, "            return super(%s, self).get_%s_back_refs()" % (class_name, from_name))
+            write(gen_file, "        # if object not created/read from lib can't service")
+            write(gen_file, "        svr_conn = self._server_conn")
+            write(gen_file, "        if not svr_conn:")
+            write(gen_file, "            return None")
+            write(gen_file, "")
+            write(gen_file, "        try:")
+            write(gen_file, "            obj = svr_conn.%s_read(id = self.uuid, fields = ['%s_back_refs'])" %(method_name, from_name))
+            write(gen_file, "        except NoIdError:")
+            write(gen_file, "            return None")
+            write(gen_file, "        back_refs = getattr(obj, '%s_back_refs', None)" %(from_name))
+            write(gen_file, "        if not back_refs:")
+            write(gen_file, "            return None")
+            write(gen_file, "        self.%s_back_refs = back_refs" %(from_name))
+            write(gen_file, "")
+            write(gen_file, "        return back_refs")
+            write(gen_file, "    # end get_%s_back_refs" %(from_name))
+            write(gen_file, "")
 
-            # Atomic Setters for properties that are lists
-            for prop in ident.getProperties():
-                if not prop.isList():
-                    continue
-                prop_name = prop.getName().replace('-', '_')
-                write(gen_file, "    def add_%s(self, elem_value, elem_position=None):" %(prop_name))
-                write(gen_file, '        """Add element to %s for %s.' %(prop.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param elem_value: %s object' % (prop_type))
-                write(gen_file, '        :param elem_position: optional string order-key')
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        if '%s' not in self._pending_field_list_updates:" %(prop_name))
-                write(gen_file, "            self._pending_field_list_updates['%s'] = [" %(prop_name))
-                write(gen_file, "                ('add', elem_value, elem_position)]")
-                write(gen_file, "        else:")
-                write(gen_file, "            self._pending_field_list_updates['%s'].append(" %(prop_name))
-                write(gen_file, "                ('add', elem_value, elem_position))")
-                write(gen_file, "    # end add_%s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    def del_%s(self, elem_position):" %(prop_name))
-                write(gen_file, '        """Delete element from %s for %s.' %(prop.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param elem_position: string indicating order-key')
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        if '%s' not in self._pending_field_list_updates:" %(prop_name))
-                write(gen_file, "            self._pending_field_list_updates['%s'] = [" %(prop_name))
-                write(gen_file, "                ('delete', None, elem_position)]")
-                write(gen_file, "        else:")
-                write(gen_file, "            self._pending_field_list_updates['%s'].append(" %(prop_name))
-                write(gen_file, "                ('delete', None, elem_position))")
-                write(gen_file, "    # end del_%s" %(prop_name))
-
-            # Atomic Setters for properties that are maps
-            for prop in ident.getProperties():
-                if not prop.isMap():
-                    continue
-                prop_name = prop.getName().replace('-', '_')
-                write(gen_file, "    def add_%s(self, elem):" %(prop_name))
-                write(gen_file, '        """Add element to %s for %s.' %(prop.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param elem: %s object' % (prop_type))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        elem_position = getattr(elem, '%s')" %(prop.getMapKeyName()))
-                write(gen_file, "        if '%s' not in self._pending_field_map_updates:" %(prop_name))
-                write(gen_file, "            self._pending_field_map_updates['%s'] = [" %(prop_name))
-                write(gen_file, "                ('set', elem, elem_position)]")
-                write(gen_file, "        else:")
-                write(gen_file, "            self._pending_field_map_updates['%s'].append(" %(prop_name))
-                write(gen_file, "                ('set', elem, elem_position))")
-                write(gen_file, "    # end set_%s" %(prop_name))
-                write(gen_file, "")
-                write(gen_file, "    def del_%s(self, elem_position):" %(prop_name))
-                write(gen_file, '        """Delete element from %s for %s.' %(prop.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param elem_position: string indicating map-key')
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        if '%s' not in self._pending_field_map_updates:" %(prop_name))
-                write(gen_file, "            self._pending_field_map_updates['%s'] = [" %(prop_name))
-                write(gen_file, "                ('delete', None, elem_position)]")
-                write(gen_file, "        else:")
-                write(gen_file, "            self._pending_field_map_updates['%s'].append(" %(prop_name))
-                write(gen_file, "                ('delete', None, elem_position))")
-                write(gen_file, "    # end del_%s" %(prop_name))
-
-            # Setters for references
-            for link_info in ident.getLinksInfo():
-                link = ident.getLink(link_info)
-                to_ident = ident.getLinkTo(link_info)
-                to_name = to_ident.getName().replace('-', '_')
-                is_ref = ident.isLinkRef(link_info)
-                if not is_ref:
-                    continue
-                write(gen_file, "    def set_%s(self, *args, **kwargs):" %(to_name))
-                write(gen_file, '        """Set %s for %s.' %(to_ident.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        self._pending_field_updates.add('%s_refs')" %(to_name))
-                write(gen_file, "        self._pending_ref_updates.discard('%s_refs')" %(to_name))
-                write(gen_file, "        super(%s, self).set_%s(*args, **kwargs)" %(class_name, to_name))
-                write(gen_file, "")
-                write(gen_file, "    # end set_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def add_%s(self, *args, **kwargs):" %(to_name))
-                write(gen_file, '        """Add %s to %s.' %(to_ident.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj: %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data: %s object' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        if '%s_refs' not in self._pending_ref_updates|self._pending_field_updates:" %(to_name))
-                write(gen_file, "            self._pending_ref_updates.add('%s_refs')" %(to_name))
-                write(gen_file, "            self._original_%s_refs = copy.deepcopy(self.get_%s_refs() or [])" %(to_name, to_name))
-                write(gen_file, "        super(%s, self).add_%s(*args, **kwargs)" %(class_name, to_name))
-                write(gen_file, "    # end add_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def del_%s(self, *args, **kwargs):" %(to_name))
-                write(gen_file, "        if '%s_refs' not in self._pending_ref_updates:" %(to_name))
-                write(gen_file, "            self._pending_ref_updates.add('%s_refs')" %(to_name))
-                write(gen_file, "            self._original_%s_refs = copy.deepcopy(self.get_%s_refs() or [])" %(to_name, to_name))
-                write(gen_file, "        super(%s, self).del_%s(*args, **kwargs)" %(class_name, to_name))
-                write(gen_file, "    # end del_%s" %(to_name))
-                write(gen_file, "")
-                write(gen_file, "    def set_%s_list(self, *args, **kwargs):" %(to_name))
-                write(gen_file, '        """Set %s list for %s.' %(to_ident.getName(), ident.getName()))
-                write(gen_file, '        ')
-                write(gen_file, '        :param ref_obj_list: list of %s object' %(CamelCase(to_ident.getName())))
-                if link.getXsdType():
-                    write(gen_file, '        :param ref_data_list: list of %s summary' %(link.getXsdType()))
-                write(gen_file, '        ')
-                write(gen_file, '        """')
-                write(gen_file, "        self._pending_field_updates.add('%s_refs')" %(to_name))
-                write(gen_file, "        self._pending_ref_updates.discard('%s_refs')" %(to_name))
-                write(gen_file, "        super(%s, self).set_%s_list(*args, **kwargs)" %(class_name, to_name))
-                write(gen_file, "    # end set_%s_list" %(to_name))
-                write(gen_file, "")
+        write(gen_file, "# end class %s" %(class_name))
+        write(gen_file, "")
+    # end _generate_client_class
+
+    def _generate_lazy_modules(self, gendir, gen_filename_pfx):
+        # Each resource class in its own module, imported on first access to
+        # its name in the common and client modules. XSD types refer to each
+        # other by their bare names and stay in a single module.
+        common_types = []
+        client_types = []
+        for pkg in ('common', 'client'):
+            if not os.path.isdir(gendir + pkg):
+                os.makedirs(gendir + pkg)
+            self._generate_package(gendir + pkg + '/')
 
-            # Getters for children links
-            for child_ident in ident.getChildren():
-                child_name = child_ident.getName()
-                child_method_name = child_name.replace('-', '_')
-                write(gen_file, "    def get_%ss(self):" %(child_method_name))
-                write(gen_file, "        if hasattr(self, '%ss'):" % child_method_name)
-                write(gen_file, "            return self.%ss" % child_method_name)
-                write(gen_file, "")
-                write(gen_file, "        if hasattr(super(%s, self), '%ss'):" % (class_name, child_method_name))
-                write(gen_file, "            return super(%s, self).get_%ss()" % (class_name, child_method_name))
-                write(gen_file, "")
-                write(gen_file, "        # read it for first time")
-                write(gen_file, "        # if object not created/read from lib can't service")
-                write(gen_file, "        svr_conn = self._server_conn")
-                write(gen_file, "        if not svr_conn:")
-                write(gen_file, "            return None")
-                write(gen_file, "")
-                write(gen_file, "        try:")
-                write(gen_file, "            obj = svr_conn.%s_read(id = self.uuid, fields = ['%ss'])" % (method_name, child_method_name))
-                write(gen_file, "        except NoIdError:")
-                write(gen_file, "            return None")
-                write(gen_file, "        children = getattr(obj, '%ss', None)" % (child_method_name))
-                write(gen_file, "        if not children:")
-                write(gen_file, "            return None")
-                write(gen_file, "        self.%ss = children" % (child_method_name))
-                write(gen_file, "")
-                write(gen_file, "        return children")
-                write(gen_file, "    # end get_%ss" % (child_method_name))
-                write(gen_file, "")
+        for ident in self._non_exclude_idents():
+            class_name = CamelCase(ident.getName())
+            module_name = ident.getName().replace('-', '_')
+
+            gen_file = self._xsd_parser.makeFile(
+                "%scommon/%s.py" %(gendir, module_name))
+            self._write_common_header(gen_file,
+                "This module defines the class of the %s configuration element" \
+                %(ident.getName()))
+            self._generate_common_class(gen_file, ident)
+            common_types.append((class_name, "vnc_api.gen.common.%s" %(module_name)))
+
+            gen_file = self._xsd_parser.makeFile(
+                "%sclient/%s.py" %(gendir, module_name))
+            write(gen_file, "")
+            write(gen_file, "# AUTO-GENERATED file from %s. Do Not Edit!" \
+                  %(self.__class__.__name__))
+            write(gen_file, "")
+            write(gen_file, "import copy")
+            write(gen_file, "import vnc_api.gen.%s_common" %(gen_filename_pfx))
+            write(gen_file, "from vnc_api.lazy_loader import lazy_import")
+            write(gen_file, "try:")
+            write(gen_file, "    from cfgm_common.exceptions import NoIdError")
+            write(gen_file, "except ImportError:")
+            write(gen_file, "    from vnc_api.exceptions import NoIdError")
             write(gen_file, "")
+            write(gen_file, "%s_xsd = lazy_import('vnc_api.gen.%s_xsd')" \
+                  %(gen_filename_pfx, gen_filename_pfx))
+            write(gen_file, "")
+            write(gen_file, "")
+            self._generate_client_class(gen_file, ident, gen_filename_pfx,
+                "%s_xsd" %(gen_filename_pfx))
+            client_types.append((class_name, "vnc_api.gen.client.%s" %(module_name)))
 
-            # Getters for back reference links
-            for back_link_info in ident.getBackLinksInfo():
-                if not ident.isLinkRef(back_link_info):
-                    continue
-                from_ident = ident.getBackLinkFrom(back_link_info)
-                from_name = from_ident.getName().replace('-', '_')
-                write(gen_file, "    def get_%s_back_refs(self):" %(from_name))
-                write(gen_file, '        """Return list of all %ss using this %s"""' % (from_ident.getName(), ident.getName()))
-                write(gen_file, "        if hasattr(self, '%s_back_refs'):" % from_name)
-                write(gen_file, "            return self.%s_back_refs" % from_name)
-                write(gen_file, "")
-                write(gen_file, "        if hasattr(super(%s, self), '%s_back_refs'):" % (class_name, from_name))
-                write(gen_file, "            return super(%s, self).get_%s_back_refs()" % (class_name, from_name))
-                write(gen_file, "        # if object not created/read from lib can't service")
-                write(gen_file, "        svr_conn = self._server_conn")
-                write(gen_file, "        if not svr_conn:")
-                write(gen_file, "            return None")
-                write(gen_file, "")
-                write(gen_file, "        try:")
-                write(gen_file, "            obj = svr_conn.%s_read(id = self.uuid, fields = ['%s_back_refs'])" %(method_name, from_name))
-                write(gen_file, "        except NoIdError:")
-                write(gen_file, "            return None")
-                write(gen_file, "        back_refs = getattr(obj, '%s_back_refs', None)" %(from_name))
-                write(gen_file, "        if not back_refs:")
-                write(gen_file, "            return None")
-                write(gen_file, "        self.%s_back_refs = back_refs" %(from_name))
-                write(gen_file, "")
-                write(gen_file, "        return back_refs")
-                write(gen_file, "    # end get_%s_back_refs" %(from_name))
+        gen_file = self._xsd_parser.makeFile(
+            "%s%s_types.py" %(gendir, gen_filename_pfx))
+        write(gen_file, "")
+        write(gen_file, "# AUTO-GENERATED file from %s. Do Not Edit!" \
+              %(self.__class__.__name__))
+        write(gen_file, "")
+        write(gen_file, '"""')
+        write(gen_file, "This module maps the name of every generated class to the module defining it")
+        write(gen_file, '"""')
+        write(gen_file, "")
+        write(gen_file, "xsd_types = dict.fromkeys([")
+        for class_name in self._type_genr.getExportableClassNames():
+            write(gen_file, "    '%s'," %(class_name))
+        write(gen_file, "    ], 'vnc_api.gen.%s_xsd')" %(gen_filename_pfx))
+        for var_name, types in (('common_types', common_types),
+                                ('client_types', client_types)):
+            write(gen_file, "")
+            write(gen_file, "%s = {" %(var_name))
+            for class_name, module_name in sorted(types):
+                write(gen_file, "    '%s': '%s'," %(class_name, module_name))
+            write(gen_file, "}")
+
+        for var_name, module_sfx in (('common_types', 'common'),
+                                     ('client_types', 'client')):
+            gen_file = self._xsd_parser.makeFile(
+                "%s%s_%s.py" %(gendir, gen_filename_pfx, module_sfx))
+            write(gen_file, "")
+            write(gen_file, "# AUTO-GENERATED file from %s. Do Not Edit!" \
+                  %(self.__class__.__name__))
+            write(gen_file, "")
+            if module_sfx == 'client':
+                # names the single client module also exports, the ones
+                # of the lazy module implementation are private
+                write(gen_file, "import copy")
+                write(gen_file, "import vnc_api.gen.%s_common" \
+                      %(gen_filename_pfx))
+                write(gen_file, "try:")
+                write(gen_file, "    from cfgm_common.exceptions import NoIdError")
+                write(gen_file, "except ImportError:")
+                write(gen_file, "    from vnc_api.exceptions import NoIdError")
+                write(gen_file, "import sys as _sys")
+                write(gen_file, "from vnc_api.gen.%s_types import %s as _%s" \
+                      %(gen_filename_pfx, var_name, var_name))
+                write(gen_file, "from vnc_api.lazy_loader import lazy_module as _lazy_module")
                 write(gen_file, "")
-
-            write(gen_file, "# end class %s" %(class_name))
+                write(gen_file, "_lazy_module(__name__, _%s, _sys.modules[__name__])" \
+                      %(var_name))
+                continue
+            write(gen_file, "from vnc_api.gen.%s_types import %s" \
+                  %(gen_filename_pfx, var_name))
+            write(gen_file, "from vnc_api.lazy_loader import lazy_module")
             write(gen_file, "")
-    # end _generate_client_classes
+            write(gen_file, "lazy_module(__name__, %s)" %(var_name))
+    # end _generate_lazy_modules
 
     def _create_heat_template_params(self, prop_list):
         # print parameters
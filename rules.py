@@ -1172,6 +1172,10 @@ def SetupBuildEnvironment(conf):
     AddOption('--pytest', dest = 'pytest', action='store')
     AddOption('--without-dpdk', dest = 'without-dpdk',
               action='store_true', default=False)
+    AddOption('--lazy-modules', dest = 'lazy_modules',
+              action='store_true', default=False,
+              help='generate the API client classes in per type modules '
+                   'imported on first use')
 
     env = CheckBuildConfiguration(conf)
 
@@ -1190,6 +1194,7 @@ def SetupBuildEnvironment(conf):
             env['NUM_JOBS'] = nj
 
     env['OPT'] = GetOption('opt')
+    env['LAZY_MODULES'] = GetOption('lazy_modules')
     env['TARGET_MACHINE'] = GetOption('target')
     env['INSTALL_PREFIX'] = GetOption('install_prefix')
     env['INSTALL_BIN'] = ''